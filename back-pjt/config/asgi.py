@@ -5,6 +5,9 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+챗봇 답변 스트리밍(articles/<id>/chatbot/stream/) 전용으로 uvicorn이 띄운다.
+나머지 API(동기 DRF 뷰)는 ASGI에서는 프로세스마다 한 스레드에서 차례로 실행되므로 WSGI(gunicorn, config/wsgi.py)에서 처리한다.
 """
 
 import os
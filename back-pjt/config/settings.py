@@ -133,6 +133,126 @@ DATABASES = {
 }
 
 
+# 연관 기사/추천용 메모리 벡터 인덱스가 DB 변경분을 다시 읽어오는 주기(초)
+VECTOR_INDEX_REFRESH_SECONDS = int(os.getenv("VECTOR_INDEX_REFRESH_SECONDS", 60))
+
+# 기사별로 저장하는 연관 기사 수 (news_related_article)
+RELATED_ARTICLES_TOP_K = int(os.getenv("RELATED_ARTICLES_TOP_K", 5))
+
+# 엔드포인트별 벡터 인덱스 엔진 (exact: 전수 비교, ivf: IVF-flat 근사 검색)
+# ivf의 nprobe는 리콜 조절값. 클수록 정확하지만 느려진다
+VECTOR_INDEXES = {
+    'related': {'ENGINE': os.getenv("RELATED_VECTOR_ENGINE", "exact")},
+    'recommend': {
+        'ENGINE': os.getenv("RECOMMEND_VECTOR_ENGINE", "ivf"),
+        'OPTIONS': {'nprobe': int(os.getenv("RECOMMEND_IVF_NPROBE", 8))},
+    },
+    # 하이브리드 검색의 kNN 후보
+    'search': {
+        'ENGINE': os.getenv("SEARCH_VECTOR_ENGINE", "ivf"),
+        'OPTIONS': {'nprobe': int(os.getenv("SEARCH_IVF_NPROBE", 16))},
+    },
+}
+VECTOR_IVF_NLIST = int(os.getenv("VECTOR_IVF_NLIST", 0)) or None  # 없으면 sqrt(N)
+VECTOR_IVF_NPROBE = int(os.getenv("VECTOR_IVF_NPROBE", 8))
+
+# build_vector_index 명령어로 저장한 인덱스 파일 위치 (있으면 서버 시작 시 DB 전체를 읽지 않음)
+VECTOR_INDEX_DIR = Path(os.getenv("VECTOR_INDEX_DIR", BASE_DIR / "vector_index"))
+
+# 조회수 버퍼(news.view_counts) flush 주기(초)와, 이 수만큼 기사가 쌓이면 주기 전에 바로 flush
+VIEW_COUNT_FLUSH_SECONDS = float(os.getenv("VIEW_COUNT_FLUSH_SECONDS", 5))
+VIEW_COUNT_FLUSH_MAX_ARTICLES = int(os.getenv("VIEW_COUNT_FLUSH_MAX_ARTICLES", 500))
+
+# 조회 기록(ArticleRead) 쓰기 지연 (news.read_events). False면 요청마다 바로 INSERT
+ARTICLE_READ_WRITE_BEHIND = os.getenv("ARTICLE_READ_WRITE_BEHIND", "True") == "True"
+ARTICLE_READ_FLUSH_SECONDS = float(os.getenv("ARTICLE_READ_FLUSH_SECONDS", 2))
+ARTICLE_READ_FLUSH_SIZE = int(os.getenv("ARTICLE_READ_FLUSH_SIZE", 200))
+# 버퍼 최대 크기와, 가득 찼을 때 자리가 나기를 기다리는 시간(초). 그래도 가득 차 있으면 바로 INSERT
+ARTICLE_READ_MAX_PENDING = int(os.getenv("ARTICLE_READ_MAX_PENDING", 5000))
+ARTICLE_READ_BLOCK_SECONDS = float(os.getenv("ARTICLE_READ_BLOCK_SECONDS", 0.5))
+
+# 캐시 (news.cache). CACHE_BACKEND=locmem(기본, 프로세스별) | file(같은 서버의 워커끼리 공유) | redis
+# locmem은 시그널로 올린 캐시 세대가 다른 워커에 전달되지 않으므로 워커가 여럿이면 file/redis 권장
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL", "redis://redis:6379/1"),
+            "KEY_PREFIX": "news",
+        }
+    }
+elif CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_DIR", str(BASE_DIR / "cache")),
+            "KEY_PREFIX": "news",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "news",
+            "KEY_PREFIX": "news",
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    }
+
+# 캐시 종류별 유효 시간(초)
+CACHE_TTL = {
+    "articles": int(os.getenv("ARTICLES_CACHE_SECONDS", 30)),     # 기사 목록 페이지
+    "article": int(os.getenv("ARTICLE_CACHE_SECONDS", 600)),      # 기사 상세 (updated_at이 키에 포함)
+    "related": int(os.getenv("RELATED_CACHE_SECONDS", 300)),      # 연관 기사
+    "search": int(os.getenv("SEARCH_CACHE_SECONDS", 600)),        # 검색 결과 (검색 인덱스 세대 번호가 키에 포함)
+    "recommend": int(os.getenv("RECOMMEND_CACHE_SECONDS", 300)),  # 맞춤 추천
+    "query_embedding": int(os.getenv("QUERY_EMBEDDING_CACHE_SECONDS", 60 * 60 * 24 * 7)),  # 검색어 임베딩
+}
+
+# 조회 기록 보관 기간(개월). 이전 달 파티션은 manage_article_read_partitions가 삭제한다 (날짜별 집계는 대시보드 롤업에 남음)
+ARTICLE_READ_RETENTION_MONTHS = int(os.getenv("ARTICLE_READ_RETENTION_MONTHS", 6))
+
+# Elasticsearch 클라이언트 (워커 프로세스마다 하나를 만들어 커넥션 풀을 재사용)
+ES_HOSTS = [f"http://{os.getenv('ES_HOST', 'elasticsearch')}:{os.getenv('ES_PORT', '9200')}"]
+ES_CONNECTIONS_PER_NODE = int(os.getenv("ES_CONNECTIONS_PER_NODE", 10))  # 노드당 최대 커넥션 수
+ES_REQUEST_TIMEOUT = float(os.getenv("ES_REQUEST_TIMEOUT", 10))          # 요청 타임아웃(초)
+ES_MAX_RETRIES = int(os.getenv("ES_MAX_RETRIES", 2))                     # 연결 오류/타임아웃 시 재시도 횟수
+ES_RETRY_ON_TIMEOUT = os.getenv("ES_RETRY_ON_TIMEOUT", "True") == "True"
+ES_SNIFF = os.getenv("ES_SNIFF", "False") == "True"                      # 클러스터 노드 목록 자동 갱신 (다중 노드일 때)
+ES_SNIFF_INTERVAL = float(os.getenv("ES_SNIFF_INTERVAL", 60))            # 스니핑 최소 간격(초)
+ES_INDEX_REPLICAS = int(os.getenv("ES_INDEX_REPLICAS", 1))               # 재인덱싱 완료 후 복원할 레플리카 수
+ES_KEEP_OLD_INDICES = int(os.getenv("ES_KEEP_OLD_INDICES", 1))           # 별칭 교체 후 남겨둘 이전 버전 인덱스 수 (롤백용)
+SEARCH_PIT_KEEP_ALIVE = os.getenv("SEARCH_PIT_KEEP_ALIVE", "2m")             # 검색 페이지 넘김용 point-in-time 유지 시간 (두 번째 페이지에서 열고 마지막 페이지에서 닫음)
+
+# 하이브리드 검색 (search/?mode=hybrid): BM25/kNN 각각 후보 수, RRF 상수, 워커별 검색어 임베딩 LRU 크기
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", 50))
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", 60))
+QUERY_EMBEDDING_LRU_SIZE = int(os.getenv("QUERY_EMBEDDING_LRU_SIZE", 1000))
+
+# 검색 결과 캐시: 검색 인덱스 세대 번호를 DB에서 다시 읽는 주기(초), 검색어 로그 flush 주기/크기, 보관 일수
+SEARCH_GENERATION_CHECK_SECONDS = float(os.getenv("SEARCH_GENERATION_CHECK_SECONDS", 1))
+SEARCH_QUERY_LOG_FLUSH_SECONDS = float(os.getenv("SEARCH_QUERY_LOG_FLUSH_SECONDS", 10))
+SEARCH_QUERY_LOG_FLUSH_SIZE = int(os.getenv("SEARCH_QUERY_LOG_FLUSH_SIZE", 1000))
+SEARCH_QUERY_LOG_DAYS = int(os.getenv("SEARCH_QUERY_LOG_DAYS", 30))
+# 서빙 워커가 많이 검색된 검색어(최근 SEARCH_PREWARM_DAYS일 상위 SEARCH_PREWARM_TOP개) 결과를 미리 채우는 주기(초), 0이면 끔
+SEARCH_PREWARM_SECONDS = float(os.getenv("SEARCH_PREWARM_SECONDS", 60))
+SEARCH_PREWARM_TOP = int(os.getenv("SEARCH_PREWARM_TOP", 100))
+SEARCH_PREWARM_DAYS = int(os.getenv("SEARCH_PREWARM_DAYS", 1))
+
+# 검색어 자동완성 (search/autocomplete/): 워커별 접두어 LRU 크기/유효 시간(초), ES 요청 타임아웃(초)
+AUTOCOMPLETE_LRU_SIZE = int(os.getenv("AUTOCOMPLETE_LRU_SIZE", 5000))
+AUTOCOMPLETE_LRU_SECONDS = int(os.getenv("AUTOCOMPLETE_LRU_SECONDS", 60))
+AUTOCOMPLETE_TIMEOUT = float(os.getenv("AUTOCOMPLETE_TIMEOUT", 0.5))
+
+# 기사 저장 → ES 반영 쓰기 지연 (post_save는 버퍼에 넣고 bulk로 모아서 전송)
+SEARCH_SYNC_FLUSH_SECONDS = float(os.getenv("SEARCH_SYNC_FLUSH_SECONDS", 2))
+SEARCH_SYNC_FLUSH_SIZE = int(os.getenv("SEARCH_SYNC_FLUSH_SIZE", 200))          # 이만큼 쌓이면 바로 flush
+SEARCH_SYNC_MAX_PENDING = int(os.getenv("SEARCH_SYNC_MAX_PENDING", 10000))      # 버퍼 최대 크기 (넘으면 바로 전송)
+SEARCH_SYNC_BLOCK_SECONDS = float(os.getenv("SEARCH_SYNC_BLOCK_SECONDS", 0.1))  # 버퍼가 가득 찼을 때 자리가 나길 기다리는 시간
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,230 @@
+"""
+IVF-flat 근사 최근접 이웃(ANN) 인덱스 (순수 NumPy)
+
+- 구축: 구면 k-means로 nlist개 중심 벡터를 학습하고 각 벡터를 가장 가까운 리스트에 배정
+- 검색: 질의와 가까운 nprobe개 리스트만 exact 계산 (nprobe가 클수록 리콜↑, 지연↑)
+- 증분 추가: 가장 가까운 중심의 리스트에 바로 추가. 학습 당시보다 크게 늘면 새로 학습한 인덱스로 교체(rebuilt)
+- 학습 기준(리스트당 MIN_PER_LIST개)보다 적으면 학습하지 않고 리스트 하나를 전수 비교(exact)로 검색
+"""
+import math
+
+import numpy as np
+from django.conf import settings
+
+from .vector_index import EMBEDDING_DIM, FlatStore, VectorIndex, normalize, top_k
+
+ASSIGN_CHUNK = 4096
+# 리스트 하나에 들어갈 최소 벡터 수 (학습 기준)
+MIN_PER_LIST = 39
+
+
+def assign_to_centroids(vectors, centroids):
+    """각 벡터에 가장 가까운(내적 최대) 중심 번호 배정. 메모리 사용을 막기 위해 청크 단위로 계산"""
+    assignments = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], ASSIGN_CHUNK):
+        chunk = vectors[start:start + ASSIGN_CHUNK]
+        assignments[start:start + ASSIGN_CHUNK] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(vectors, nlist, n_iter=10, sample_per_list=64, seed=0):
+    """정규화된 벡터로 구면 k-means 학습 (학습 표본은 nlist * sample_per_list개로 제한)"""
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    sample_size = min(n, nlist * sample_per_list)
+    sample = vectors[rng.choice(n, sample_size, replace=False)] if sample_size < n else vectors
+    centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignments = assign_to_centroids(sample, centroids)
+        order = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=nlist)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        non_empty = counts > 0
+        sums = np.add.reduceat(sample[order], starts[non_empty], axis=0)
+        centroids[non_empty] = sums
+
+        # 빈 리스트는 임의의 표본으로 다시 시작
+        empty = np.flatnonzero(~non_empty)
+        if empty.size:
+            centroids[empty] = sample[rng.choice(sample.shape[0], empty.size, replace=False)]
+
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        centroids /= np.maximum(norms, 1e-12)
+
+    return centroids.astype(np.float32)
+
+
+def default_nlist(n):
+    """리스트 수 기본값: sqrt(N), 리스트당 최소 MIN_PER_LIST개가 되도록 제한"""
+    return max(1, min(int(math.sqrt(n)), n // MIN_PER_LIST))
+
+
+class IVFFlatIndex(VectorIndex):
+    """IVF-flat 엔진. 인터페이스는 exact 엔진(EmbeddingIndex)과 같다"""
+
+    engine = 'ivf'
+
+    def __init__(self, dim=EMBEDDING_DIM, nlist=None, nprobe=None, retrain_factor=4.0):
+        super().__init__(dim)
+        self.nlist = nlist or getattr(settings, 'VECTOR_IVF_NLIST', None)
+        self.nprobe = nprobe or getattr(settings, 'VECTOR_IVF_NPROBE', 8)
+        self.retrain_factor = retrain_factor
+        self._centroids = None  # 학습 전에는 리스트 하나(= exact)로 동작
+        self._lists = [FlatStore(dim)]
+        self._list_of = {}  # article id -> 리스트 번호
+        self._trained_size = 0
+
+    def __len__(self):
+        return len(self._list_of)
+
+    def __contains__(self, article_id):
+        return article_id in self._list_of
+
+    @property
+    def is_trained(self):
+        return self._centroids is not None
+
+    # ------------------------------------------------------------------
+    # 구축
+
+    def can_train(self, n):
+        """n개로 리스트를 2개 이상 학습할 수 있는지 (아니면 리스트 하나 = exact 검색)"""
+        nlist = self.nlist or default_nlist(n)
+        return 1 < nlist <= n
+
+    def build(self, ids, vectors, nlist=None):
+        """(ids, 벡터) 전체로 중심을 학습하고 리스트를 새로 채운다"""
+        ids = np.asarray(ids, dtype=np.int64)
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.maximum(norms, 1e-12)
+
+        nlist = nlist or self.nlist or default_nlist(len(ids))
+        with self._lock:
+            if len(ids) < nlist or nlist <= 1:
+                centroids = None
+                assignments = np.zeros(len(ids), dtype=np.int64)
+                nlist = 1
+            else:
+                centroids = train_centroids(matrix, nlist)
+                assignments = assign_to_centroids(matrix, centroids)
+
+            self._centroids = centroids
+            self._lists = [FlatStore(self.dim) for _ in range(nlist)]
+            self._list_of = {}
+            for article_id, vec, list_no in zip(ids, matrix, assignments):
+                self._lists[list_no].upsert(int(article_id), vec)
+                self._list_of[int(article_id)] = int(list_no)
+            self._trained_size = len(ids)
+
+    def rebuild(self):
+        """메모리에 있는 벡터로 재학습 (아직 공유하지 않는 인덱스용, 학습 동안 검색이 막힌다)"""
+        with self._lock:
+            ids, matrix = self._arrays()
+            self.build(ids, matrix)
+
+    def rebuilt(self):
+        """메모리에 있는 벡터로 새로 학습한 인덱스. 학습은 락 밖에서 하므로 그동안 이 인덱스로 계속 검색한다"""
+        with self._lock:
+            ids, matrix = self._arrays()
+            synced_until, synced_ids, synced_at = self._synced_until, set(self._synced_ids), self._synced_at
+        index = type(self)(self.dim, nlist=self.nlist, nprobe=self.nprobe, retrain_factor=self.retrain_factor)
+        index.build(ids, matrix)
+        index._synced_until, index._synced_ids, index._synced_at = synced_until, synced_ids, synced_at
+        return index
+
+    def needs_rebuild(self):
+        if self.is_trained:
+            return len(self) > self._trained_size * self.retrain_factor
+        # 학습 기준에 못 미치면 리스트 하나(exact)로 두고, 기준을 넘으면 그때 한 번 학습
+        return self.can_train(len(self))
+
+    def sync(self, full=False):
+        """변경분 반영. full이면 전체를 읽고 학습까지 (증분 동기화 뒤 재학습은 vector_index.refresh_index가 교체로 처리)"""
+        super().sync(full=full)
+        if full:
+            self.rebuild()
+
+    # ------------------------------------------------------------------
+    # 증분 갱신
+
+    def _nearest_list(self, vec):
+        if self._centroids is None:
+            return 0
+        return int(np.argmax(self._centroids @ vec))
+
+    def upsert(self, article_id, vector):
+        vec = self._prepare(vector)
+        if vec is None:
+            self.remove(article_id)
+            return
+        with self._lock:
+            list_no = self._nearest_list(vec)
+            current = self._list_of.get(article_id)
+            if current is not None and current != list_no:
+                self._lists[current].remove(article_id)
+            self._lists[list_no].upsert(article_id, vec)
+            self._list_of[article_id] = list_no
+
+    def remove(self, article_id):
+        with self._lock:
+            list_no = self._list_of.pop(article_id, None)
+            if list_no is not None:
+                self._lists[list_no].remove(article_id)
+
+    def get_vector(self, article_id):
+        with self._lock:
+            list_no = self._list_of.get(article_id)
+            return None if list_no is None else self._lists[list_no].get(article_id)
+
+    # ------------------------------------------------------------------
+    # 검색
+
+    def search(self, vector, k=5, exclude=(), nprobe=None, **options):
+        """가까운 nprobe개 리스트만 탐색해 상위 k개 (article_id, score) 반환"""
+        query = normalize(vector)
+        if query is None or query.shape[0] != self.dim or k <= 0:
+            return []
+
+        with self._lock:
+            if self._centroids is None:
+                probe = [0]
+            else:
+                nprobe = min(nprobe or self.nprobe, len(self._lists))
+                centroid_scores = self._centroids @ query
+                probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+            parts = [self._lists[list_no].scores(query) for list_no in probe if self._lists[list_no].size]
+
+        if not parts:
+            return []
+        ids = np.concatenate([part[0] for part in parts])
+        scores = np.concatenate([part[1] for part in parts])
+        if exclude:
+            scores[np.isin(ids, np.fromiter(exclude, dtype=np.int64))] = -np.inf
+        return top_k(ids, scores, k)
+
+    # ------------------------------------------------------------------
+    # 저장/복원
+
+    def _arrays(self):
+        parts = [store.vectors() for store in self._lists if store.size]
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty((0, self.dim), dtype=np.float32)
+        return (
+            np.concatenate([part[0] for part in parts]),
+            np.concatenate([part[1] for part in parts]),
+        )
+
+    def _extra_state(self):
+        centroids = self._centroids if self._centroids is not None else np.empty((0, self.dim), dtype=np.float32)
+        return {'centroids': centroids, 'trained_size': np.array(self._trained_size)}
+
+    def _restore_extra(self, data):
+        centroids = data['centroids']
+        if centroids.shape[0]:
+            self._centroids = centroids.astype(np.float32)
+            self._lists = [FlatStore(self.dim) for _ in range(centroids.shape[0])]
+        self._trained_size = int(data['trained_size'])
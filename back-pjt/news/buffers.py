@@ -0,0 +1,176 @@
+"""
+요청 경로의 쓰기를 모아서 한 번에 처리하는 프로세스 로컬 버퍼
+
+요청은 버퍼에 넣기만 하고, 백그라운드 스레드가 flush_interval마다(또는 max_items가 차면 바로)
+write 함수로 모인 데이터를 넘긴다. 워커 종료 시(atexit)에도 남은 데이터를 flush 한다.
+write가 실패하면 데이터를 버퍼로 되돌려 다음 flush에서 다시 시도한다.
+"""
+import atexit
+import os
+import threading
+import weakref
+from collections import Counter
+
+from django.db import connections
+
+_buffers = weakref.WeakSet()
+
+
+class FlushBuffer:
+    """버퍼 공통 동작 (백그라운드 flush 스레드, 종료 시 flush). _take/_restore/_size는 하위 클래스 구현"""
+
+    def __init__(self, name, write, flush_interval=5.0, max_items=500):
+        self.name = name
+        self.write = write
+        self.flush_interval = flush_interval
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._worker_pid = None
+        self.stats = {'flushes': 0, 'items': 0, 'failures': 0}
+        _buffers.add(self)
+
+    # --- 하위 클래스 구현 ---
+    def _take(self):
+        """쌓인 데이터를 꺼내고 비운다 (self._lock 안에서 호출)"""
+        raise NotImplementedError
+
+    def _restore(self, batch):
+        """flush 실패한 데이터를 되돌린다 (self._lock 안에서 호출)"""
+        raise NotImplementedError
+
+    def _size(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        with self._lock:
+            return self._size()
+
+    def _ensure_worker(self):
+        # fork된 워커 프로세스에서는 스레드가 따라오지 않으므로 pid가 바뀌면 새로 띄운다
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._start_lock:
+            if self._worker_pid == pid:
+                return
+            thread = threading.Thread(target=self._run, name=f'{self.name}-flush', daemon=True)
+            thread.start()
+            self._worker_pid = pid
+
+    def _added(self, size):
+        """데이터가 추가된 뒤 호출 (self._lock 밖에서)"""
+        self._ensure_worker()
+        if size >= self.max_items:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                # 백그라운드 스레드의 DB 연결은 요청 사이클이 닫아주지 않는다
+                connections.close_all()
+
+    def flush(self):
+        """쌓인 데이터를 write로 넘긴다. 반환값: 처리한 항목 수"""
+        with self._flush_lock:
+            with self._lock:
+                batch = self._take()
+            if not batch:
+                return 0
+            try:
+                self.write(batch)
+            except Exception as e:
+                print(f"{self.name} flush 실패, 다음 주기에 재시도: {e}")
+                with self._lock:
+                    self._restore(batch)
+                self.stats['failures'] += 1
+                return 0
+            self.stats['flushes'] += 1
+            self.stats['items'] += len(batch)
+            return len(batch)
+
+
+class CounterBuffer(FlushBuffer):
+    """키별 증가량을 합산해 두는 버퍼. write에는 {key: 증가량} Counter가 넘어간다"""
+
+    def __init__(self, name, write, **kwargs):
+        super().__init__(name, write, **kwargs)
+        self._pending = Counter()
+
+    def add(self, key, amount=1):
+        with self._lock:
+            self._pending[key] += amount
+            size = len(self._pending)
+        self._added(size)
+
+    def pending(self, key):
+        """아직 flush되지 않은 증가량"""
+        with self._lock:
+            return self._pending.get(key, 0)
+
+    def _take(self):
+        batch, self._pending = self._pending, Counter()
+        return batch
+
+    def _restore(self, batch):
+        self._pending.update(batch)
+
+    def _size(self):
+        return len(self._pending)
+
+
+class QueueBuffer(FlushBuffer):
+    """
+    항목을 순서대로 쌓는 버퍼. write에는 항목 리스트가 넘어간다.
+    max_pending개가 차 있으면 add가 최대 block_timeout초 기다리고(백프레셔),
+    그래도 자리가 없으면 False를 반환하므로 호출한 쪽에서 직접 쓰면 된다.
+    """
+
+    def __init__(self, name, write, max_pending=5000, block_timeout=0.5, **kwargs):
+        super().__init__(name, write, **kwargs)
+        self.max_pending = max_pending
+        self.block_timeout = block_timeout
+        self._items = []
+        self._not_full = threading.Condition(self._lock)
+
+    def add(self, item):
+        with self._not_full:
+            if len(self._items) >= self.max_pending:
+                self._wakeup.set()
+                self._not_full.wait_for(lambda: len(self._items) < self.max_pending, self.block_timeout)
+                if len(self._items) >= self.max_pending:
+                    return False
+            self._items.append(item)
+            size = len(self._items)
+        self._added(size)
+        return True
+
+    def _take(self):
+        batch, self._items = self._items, []
+        self._not_full.notify_all()
+        return batch
+
+    def _restore(self, batch):
+        self._items[:0] = batch
+
+    def _size(self):
+        return len(self._items)
+
+
+def buffer_stats():
+    """버퍼별 flush 통계와 아직 flush되지 않은 항목 수"""
+    return {buffer.name: dict(buffer.stats, pending=len(buffer)) for buffer in list(_buffers)}
+
+
+def flush_all():
+    for buffer in list(_buffers):
+        buffer.flush()
+
+
+atexit.register(flush_all)
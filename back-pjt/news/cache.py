@@ -0,0 +1,130 @@
+"""
+자주 읽는 API 응답 캐시 (settings.CACHES의 default 백엔드)
+
+- 기사 상세: 기사 id + updated_at을 키로 하므로 컨슈머가 기사를 갱신하면 자연히 새 키가 되고,
+  ORM으로 저장/삭제하면 시그널에서 그 키를 지운다(invalidate_article).
+  유저별 값(is_like/is_bookmarked)은 캐시하지 않고, 자주 바뀌는 views/likes는 응답 시 현재 값으로 덮어쓴다.
+- 기사 목록/검색/연관 기사: 기사 세대 번호 + 최신 updated_at을 키에 넣는다.
+  세대 번호는 NewsArticle 저장/삭제 시그널에서 트랜잭션 커밋 뒤에 올리고(bump_articles_generation),
+  최신 updated_at은 시그널이 없는 컨슈머의 raw INSERT를 잡는다.
+- 추천: 유저 취향 벡터의 updated_at을 키에 넣는다.
+- 좋아요 수는 여러 유저가 함께 쓰는 캐시 값에 넣지 않고(without_likes) 응답 때 현재 값을 붙인다(with_current_likes).
+  그래서 좋아요를 눌러도 캐시를 지우지 않는다.
+히트/미스 수는 news.metrics의 cache.<이름>.hit / cache.<이름>.miss 로 집계한다.
+캐시 서버 오류는 미스로 보고 요청은 그대로 처리한다.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+
+from . import metrics
+from .models import NewsArticle
+
+GENERATION_KEY = 'articles:generation'
+MISSING = object()
+
+
+def articles_generation():
+    try:
+        return cache.get_or_set(GENERATION_KEY, 1, timeout=None)
+    except Exception as e:
+        print(f"캐시 조회 실패: {e}")
+        return 0
+
+
+def bump_articles_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # 키가 없으면(만료/재시작) 새로 시작. 이전 세대 키는 TTL로 사라진다
+        cache.add(GENERATION_KEY, 1, timeout=None)
+    except Exception as e:
+        print(f"캐시 세대 갱신 실패: {e}")
+
+
+def latest_article_update():
+    """가장 최근에 바뀐 기사의 updated_at (article_updated_at_idx 사용)"""
+    return NewsArticle.objects.aggregate(latest=Max('updated_at'))['latest']
+
+
+def articles_version():
+    """기사 목록류 캐시 키에 넣는 값"""
+    latest = latest_article_update()
+    return f"{articles_generation()}.{latest.timestamp() if latest else 0}"
+
+
+def make_key(name, *parts, **params):
+    """이름과 파라미터로 캐시 키 생성 (파라미터는 해시해서 길이 제한 회피)"""
+    raw = json.dumps([parts, sorted(params.items())], default=str, ensure_ascii=False)
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f"{name}:{digest}"
+
+
+def article_key(article_id, updated_at):
+    return make_key('article', article_id, updated_at)
+
+
+def invalidate_article(article_id, updated_at):
+    """ORM으로 저장하면 updated_at이 그대로일 수 있으므로(auto_now 아님) 상세 캐시를 직접 지운다"""
+    try:
+        cache.delete(article_key(article_id, updated_at))
+    except Exception as e:
+        print(f"캐시 삭제 실패: {e}")
+
+
+def is_shared():
+    """캐시가 워커 프로세스끼리 공유되는지 (locmem/dummy는 프로세스마다 따로)"""
+    backend = settings.CACHES['default']['BACKEND']
+    return backend not in (
+        'django.core.cache.backends.locmem.LocMemCache',
+        'django.core.cache.backends.dummy.DummyCache',
+    )
+
+
+def without_likes(items):
+    """직렬화한 기사 목록에서 좋아요 수를 뺀다 (캐시 저장용)"""
+    return [{field: value for field, value in item.items() if field != 'likes'} for item in items]
+
+
+def with_current_likes(items):
+    """캐시에서 꺼낸 기사 목록에 현재 좋아요 수(like_count)를 붙인다 (쿼리 한 번)"""
+    likes = dict(NewsArticle.objects.filter(id__in=[item['id'] for item in items]).values_list('id', 'like_count'))
+    return [{**item, 'likes': likes.get(item['id'], 0)} for item in items]
+
+
+def get_or_build(name, key, build, timeout=None):
+    """key가 있으면 캐시 값을, 없으면 build()를 계산해 저장 후 반환 (timeout 기본값은 CACHE_TTL[name])"""
+    try:
+        value = cache.get(key, MISSING)
+    except Exception as e:
+        print(f"캐시 조회 실패: {e}")
+        value = MISSING
+
+    if value is not MISSING:
+        metrics.incr(f'cache.{name}.hit')
+        return value
+
+    metrics.incr(f'cache.{name}.miss')
+    value = build()
+    try:
+        cache.set(key, value, settings.CACHE_TTL[name] if timeout is None else timeout)
+    except Exception as e:
+        print(f"캐시 저장 실패: {e}")
+    return value
+
+
+def cache_stats():
+    """metrics의 캐시 카운터를 이름별 히트/미스/히트율로 묶는다"""
+    stats = {}
+    for metric, value in metrics.snapshot()['counters'].items():
+        prefix, _, rest = metric.partition('.')
+        name, _, kind = rest.rpartition('.')
+        if prefix == 'cache' and kind in ('hit', 'miss'):
+            stats.setdefault(name, {'hit': 0, 'miss': 0})[kind] = value
+    for entry in stats.values():
+        total = entry['hit'] + entry['miss']
+        entry['hit_rate'] = round(entry['hit'] / total, 3) if total else 0.0
+    return stats
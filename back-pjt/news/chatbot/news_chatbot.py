@@ -31,12 +31,13 @@ def message_from_dict(d):
 
 
 
-def get_newsbot_response(messages, title, write_date, content, question):
-    """
-    messages: 이전 대화 메시지 리스트 (SystemMessage, HumanMessage, AIMessage)
-    title, write_date, content: 기사 정보
-    question: 사용자의 질문
-    """
+# 최근 20개 메시지만 유지
+MAX_MESSAGES = 20
+MODEL = "gpt-4o-mini"
+
+
+def build_messages(messages, title, write_date, content, question):
+    """이전 대화에 (첫 대화라면 system 프롬프트와) 질문을 붙인 메시지 리스트"""
     # 첫 대화라면 system 프롬프트 추가
     if not messages:
         prompt = (
@@ -50,11 +51,21 @@ def get_newsbot_response(messages, title, write_date, content, question):
         messages = [SystemMessage(content=prompt)]
     # 질문 추가
     messages.append(HumanMessage(content=question))
-    # LLM 호출
-    llm = ChatOpenAI(api_key=api_key, model="gpt-4o-mini")
-    answer = llm.invoke(messages)
-    # 답변 추가
-    messages.append(AIMessage(content=answer.content))
-    # 최근 20개만 유지
-    messages = messages[-20:]
-    return answer.content, messages
\ No newline at end of file
+    return messages
+
+
+def with_answer(messages, answer):
+    """답변을 붙이고 최근 MAX_MESSAGES개만 남긴다"""
+    messages.append(AIMessage(content=answer))
+    return messages[-MAX_MESSAGES:]
+
+
+async def stream_newsbot_response(messages):
+    """
+    build_messages로 만든 메시지에 대한 답변을 모델이 만드는 대로 조각(str)씩 내보낸다.
+    다 받은 뒤 with_answer(messages, ''.join(조각들))로 대화에 붙인다.
+    """
+    llm = ChatOpenAI(api_key=api_key, model=MODEL, streaming=True)
+    async for chunk in llm.astream(messages):
+        if chunk.content:
+            yield chunk.content
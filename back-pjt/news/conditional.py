@@ -0,0 +1,41 @@
+"""
+조건부 GET (ETag / Last-Modified)
+
+클라이언트가 If-None-Match / If-Modified-Since로 다시 물어보면, 응답을 직렬화하기 전에
+검증값만 비교해서 바뀐 것이 없으면 본문 없는 304를 돌려준다.
+ETag가 있으면 If-Modified-Since보다 ETag 비교가 우선한다 (RFC 9110).
+"""
+import hashlib
+import json
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    raw = json.dumps(parts, default=str, ensure_ascii=False)
+    return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+
+def _timestamp(last_modified):
+    return int(last_modified.timestamp()) if last_modified else None
+
+
+def set_validators(response, etag, last_modified=None, private=False):
+    """응답에 ETag/Last-Modified를 달고, 캐시하더라도 매번 재검증하도록 한다"""
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(_timestamp(last_modified))
+    if private:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+def not_modified(request, etag, last_modified=None, private=False):
+    """조건부 요청이 검증값과 일치하면 304 응답, 아니면 None"""
+    response = get_conditional_response(request, etag=etag, last_modified=_timestamp(last_modified))
+    if response is None:
+        return None
+    return set_validators(response, etag, last_modified, private=private)
@@ -0,0 +1,55 @@
+"""
+대시보드 롤업 전체 재계산용 집계 쿼리 (rebuild_dashboard_rollups)
+
+평소에는 news.rollups가 증분 갱신하고, 여기 쿼리는 유저 한 명의 기록으로 롤업을 다시 만든다.
+키워드는 article_read에 남아 있는 조회 기록 전체(news.rollups와 같은 범위), 날짜별 조회 수는 보관 기간 안의 파티션만 읽는다.
+기사 키워드는 jsonb 배열이므로 jsonb_array_elements_text로 펼쳐서 DB에서 GROUP BY 한다.
+한 기사에 같은 키워드가 여러 번 있어도 한 번만 센다 (news.rollups._bump_keywords와 같은 규칙).
+"""
+from django.db import connection
+from django.db.models import Count
+
+from .models import NewsArticle, ArticleRead
+from .read_partitions import retention_cutoff
+
+READ_KEYWORDS_SQL = """
+    SELECT kw.keyword, COUNT(*) AS cnt
+    FROM news_article a
+    CROSS JOIN LATERAL (
+        SELECT DISTINCT keyword FROM jsonb_array_elements_text(a.keywords) AS e(keyword)
+    ) AS kw
+    WHERE a.id IN (
+        SELECT DISTINCT article_id FROM article_read WHERE user_id = %s
+    )
+    GROUP BY kw.keyword
+"""
+
+
+def liked_category_counts(user_id):
+    """좋아요한 기사의 카테고리별 개수: [(category, count), ...]"""
+    return list(
+        NewsArticle.objects
+        .filter(articlelike__user_id=user_id)
+        .values('category')
+        .annotate(count=Count('id'))
+        .values_list('category', 'count')
+    )
+
+
+def read_keyword_counts(user_id):
+    """읽은 기사(중복 제외)의 키워드별 개수, 기사당 키워드 한 번: [(keyword, count), ...]"""
+    with connection.cursor() as cursor:
+        cursor.execute(READ_KEYWORDS_SQL, [user_id])
+        return cursor.fetchall()
+
+
+def daily_read_counts(user_id):
+    """날짜별로 읽은 서로 다른 기사 수: [(day, count), ...]"""
+    # 조회 기록은 (유저, 기사, 날짜)당 한 행이므로 행 수가 곧 서로 다른 기사 수
+    return list(
+        ArticleRead.objects
+        .filter(user_id=user_id, read_date__gte=retention_cutoff())
+        .values('read_date')
+        .annotate(count=Count('id'))
+        .values_list('read_date', 'count')
+    )
@@ -0,0 +1,48 @@
+"""
+임베딩 바이너리 포맷
+
+v1 (바이너리): 8바이트 헤더 + little-endian float32 원본
+    b'NE' | version(uint8) | reserved(uint8) | dim(uint32 LE) | float32 * dim
+레거시: JSON 리스트 문자열을 utf-8로 인코딩한 값 (b'[0.1, ...]')
+
+읽기는 두 포맷을 모두 지원한다. 데이터 변환은 convert_embeddings 명령어로 한다.
+컨슈머(data-pjt/consumer/preprocess.py)도 같은 포맷으로 쓴다.
+"""
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b'NE'
+VERSION = 1
+HEADER = struct.Struct('<2sBBI')
+FLOAT32_LE = np.dtype('<f4')
+
+
+def encode_embedding(vector):
+    """벡터(list/ndarray)를 v1 바이너리로 변환"""
+    if vector is None:
+        return None
+    array = np.ascontiguousarray(vector, dtype=FLOAT32_LE).ravel()
+    return HEADER.pack(MAGIC, VERSION, 0, array.shape[0]) + array.tobytes()
+
+
+def is_legacy(raw):
+    """JSON 텍스트로 저장된 레거시 임베딩인지 확인"""
+    return raw is not None and bytes(raw[:1]) == b'['
+
+
+def decode_embedding(raw):
+    """
+    DB에 저장된 임베딩(bytes/memoryview)을 float32 배열로 변환.
+    v1은 np.frombuffer로 복사 없이 읽으므로 결과는 읽기 전용이다.
+    """
+    if raw is None:
+        return None
+    if is_legacy(raw):
+        return np.array(json.loads(bytes(raw).decode('utf-8')), dtype=np.float32)
+
+    magic, version, _, dim = HEADER.unpack_from(raw)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"알 수 없는 임베딩 포맷: {magic!r} v{version}")
+    return np.frombuffer(raw, dtype=FLOAT32_LE, count=dim, offset=HEADER.size)
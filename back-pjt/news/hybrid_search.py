@@ -0,0 +1,75 @@
+"""
+하이브리드 검색 (BM25 + 임베딩 kNN, reciprocal-rank fusion)
+
+- BM25: Elasticsearch multi_match 상위 HYBRID_CANDIDATES개
+- kNN: 검색어 임베딩으로 메모리 벡터 인덱스(VECTOR_INDEXES['search']) 상위 HYBRID_CANDIDATES개
+두 순위를 RRF(점수 = Σ 1 / (HYBRID_RRF_K + 순위))로 합친다. 점수 척도가 달라도 순위만 쓰므로 정규화가 필요 없다.
+kNN으로만 찾은 기사는 ES mget으로 검색 결과 필드를 가져온다.
+"""
+from django.conf import settings
+
+from . import metrics
+from .models import NewsArticle
+from .query_embeddings import embed_query
+from .utils import NEWS_ALIAS, SEARCH_SOURCE_FIELDS, article_doc_id, search_articles
+from .vector_index import get_vector_index
+
+
+def rrf_fuse(rankings, k=60):
+    """순위 목록들(각각 id 리스트, 앞이 1위)을 RRF 점수 내림차순 [(id, score)]로 합친다"""
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def bm25_hits(client, query, category=None, size=50):
+    with metrics.timed('search.hybrid.bm25'):
+        result = search_articles(client, query, category=category, size=size)
+    return result['hits']['hits'], result['hits']['total']['value']
+
+
+def knn_ids(query, category=None, size=50):
+    """검색어 임베딩과 가까운 기사 id (카테고리가 있으면 DB에서 걸러낸다)"""
+    vector = embed_query(query)
+    with metrics.timed('search.hybrid.knn'):
+        hits = get_vector_index('search').search(vector, k=size)
+    ids = [article_id for article_id, _ in hits]
+    if category and ids:
+        allowed = set(NewsArticle.objects.filter(id__in=ids, category=category).values_list('id', flat=True))
+        ids = [article_id for article_id in ids if article_id in allowed]
+    return ids
+
+
+def hybrid_search(client, query, category=None, size=10):
+    """
+    반환값: (결과 hit 목록, BM25 전체 개수)
+    hit은 ES 검색 hit 형식이고 _score 대신 RRF 점수가 들어간다.
+    """
+    candidates = max(size, settings.HYBRID_CANDIDATES)
+    hits, total = bm25_hits(client, query, category=category, size=candidates)
+    by_id = {int(hit['_id']): hit for hit in hits}
+    try:
+        vector_ids = knn_ids(query, category=category, size=candidates)
+    except Exception as e:
+        # 임베딩 API 장애 시 BM25 결과만
+        print(f"검색어 임베딩 실패, BM25 결과만 사용: {e}")
+        metrics.incr('search.hybrid.knn_failed')
+        vector_ids = []
+
+    fused = rrf_fuse([list(by_id), vector_ids], k=settings.HYBRID_RRF_K)[:size]
+
+    missing = [doc_id for doc_id, _ in fused if doc_id not in by_id]
+    if missing:
+        docs = client.mget(index=NEWS_ALIAS, ids=[article_doc_id(doc_id) for doc_id in missing], _source=SEARCH_SOURCE_FIELDS)
+        for doc in docs['docs']:
+            if doc.get('found'):
+                by_id[int(doc['_id'])] = doc
+
+    results = []
+    for doc_id, score in fused:
+        hit = by_id.get(doc_id)
+        if hit is not None:
+            results.append(dict(hit, _score=score))
+    return results, total
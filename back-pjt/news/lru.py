@@ -0,0 +1,59 @@
+"""
+워커 프로세스 안의 작은 LRU 캐시 (Django 캐시 왕복도 아까운 아주 잦은 조회용)
+
+ttl(초)이 있으면 그 시간이 지난 항목은 없는 것으로 본다.
+히트/미스는 news.metrics의 cache.<name>.hit / cache.<name>.miss 로 집계한다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from . import metrics
+
+MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, name, maxsize=1000, ttl=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key, MISSING)
+            if item is not MISSING and (item[1] is None or item[1] > now):
+                self._items.move_to_end(key)
+                value = item[0]
+            else:
+                if item is not MISSING:
+                    del self._items[key]
+                value = MISSING
+        if value is MISSING:
+            metrics.incr(f'cache.{self.name}.miss')
+            return default
+        metrics.incr(f'cache.{self.name}.hit')
+        return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._items[key] = (value, expires)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from news.models import NewsArticle, ArticleRead
+from news.read_events import read_buffer, record_read
+
+BENCH_USERNAME = '__bench_article_reads__'
+
+
+class Command(BaseCommand):
+    help = "조회 기록을 바로 INSERT 할 때와 쓰기 지연(flush마다 INSERT ... ON CONFLICT DO NOTHING)할 때의 요청 경로 지연시간/INSERT 횟수 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reads', type=int, default=2000, help="모드별 조회 기록 수")
+        parser.add_argument('--articles', type=int, default=500, help="돌아가며 조회할 기사 수 (같은 날 같은 기사는 한 행으로 합쳐진다)")
+
+    def handle(self, *args, reads, articles, **options):
+        article_list = list(NewsArticle.objects.only('id').order_by('-id')[:articles])
+        if not article_list:
+            raise CommandError("기사가 없습니다.")
+
+        # 모드별 벤치마크용 유저를 만들고 끝나면 삭제 (조회 기록/롤업/취향 벡터는 CASCADE로 같이 지워진다)
+        # 조회 기록은 (유저, 기사, 날짜)당 한 행이라 같은 유저를 쓰면 두 번째 모드는 저장할 것이 없다
+        User = get_user_model()
+        for mode in ('sync', 'write-behind'):
+            username = f'{BENCH_USERNAME}{mode}'
+            User.objects.filter(username=username).delete()
+            user = User.objects.create(username=username)
+            try:
+                self.run_mode(mode, user, article_list, reads)
+            finally:
+                user.delete()
+
+    def run_mode(self, mode, user, article_list, reads):
+        before_rows = ArticleRead.objects.filter(user=user).count()
+        before_flushes = read_buffer.stats['flushes']
+        latencies = np.empty(reads)
+
+        with override_settings(ARTICLE_READ_WRITE_BEHIND=(mode == 'write-behind')):
+            start = time.perf_counter()
+            for i in range(reads):
+                t = time.perf_counter()
+                record_read(user, article_list[i % len(article_list)])
+                latencies[i] = time.perf_counter() - t
+            request_total = time.perf_counter() - start
+
+            t = time.perf_counter()
+            read_buffer.flush()
+            drain = time.perf_counter() - t
+
+        written = ArticleRead.objects.filter(user=user).count() - before_rows
+        # 바로 쓰기는 새 행마다 INSERT 한 번(get_or_create), 쓰기 지연은 flush마다 여러 행 INSERT ... ON CONFLICT 한 번
+        # (flush 하나가 INSERT_BATCH_SIZE행을 넘으면 INSERT가 더 나뉘지만 여기서는 flush 수로 센다)
+        inserts = written if mode == 'sync' else read_buffer.stats['flushes'] - before_flushes
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        self.stdout.write(
+            f"{mode:>12}: 요청 경로 p50 {p50:7.3f} ms, p95 {p95:7.3f} ms, p99 {p99:7.3f} ms, "
+            f"총 {request_total * 1000:8.1f} ms (+ 남은 버퍼 flush {drain * 1000:.1f} ms) | "
+            f"INSERT {inserts}회로 {written}행 저장"
+        )
@@ -0,0 +1,39 @@
+import json
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from news.embeddings import decode_embedding, encode_embedding
+from news.vector_index import EMBEDDING_DIM
+
+
+class Command(BaseCommand):
+    help = "레거시 JSON 임베딩과 float32 바이너리(v1) 포맷의 크기/디코딩 비용 비교 (DB 불필요)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--dim', type=int, default=EMBEDDING_DIM)
+
+    def handle(self, *args, rows, dim, **options):
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(scale=0.05, size=(rows, dim)).astype(np.float32)
+
+        # psycopg2가 bytea를 memoryview로 돌려주는 것과 같은 조건으로 측정
+        legacy = [memoryview(json.dumps(v.tolist()).encode('utf-8')) for v in vectors]
+        binary = [memoryview(encode_embedding(v)) for v in vectors]
+
+        results = {}
+        for name, payloads in (('json', legacy), ('v1', binary)):
+            start = time.perf_counter()
+            for raw in payloads:
+                decode_embedding(raw)
+            elapsed = time.perf_counter() - start
+            results[name] = elapsed
+            size = sum(len(raw) for raw in payloads) / rows
+            self.stdout.write(
+                f"{name:>5}: {size / 1024:8.1f} KB/row, "
+                f"{elapsed / rows * 1e6:10.1f} us/row, 총 {elapsed * 1000:8.1f} ms"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"디코딩 속도 {results['json'] / results['v1']:.0f}배 향상"))
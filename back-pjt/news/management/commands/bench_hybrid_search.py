@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from news.hybrid_search import hybrid_search
+from news.query_embeddings import forget_query
+from news.models import NewsArticle
+from news.utils import get_es_client, search_articles
+
+
+def reciprocal_rank(ids, target):
+    return 1.0 / (ids.index(target) + 1) if target in ids else 0.0
+
+
+class Command(BaseCommand):
+    help = (
+        "BM25와 하이브리드(BM25 + kNN, RRF) 검색의 지연시간/관련도 비교. "
+        "기사의 키워드(또는 제목)를 검색어로 쓰고 그 기사를 정답으로 보는 known-item 평가 (MRR@size, Recall@size)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=100, help="평가할 기사 수 (최근 기사부터)")
+        parser.add_argument('--size', type=int, default=10)
+        parser.add_argument('--source', choices=['keywords', 'title'], default='keywords', help="검색어로 쓸 필드")
+
+    def handle(self, *args, queries, size, source, **options):
+        cases = []
+        for article in NewsArticle.objects.only('id', 'title', 'keywords').order_by('-id')[:queries * 2]:
+            query = ' '.join(article.keywords_as_list[:3]) if source == 'keywords' else article.title
+            if query.strip():
+                cases.append((article.id, query))
+            if len(cases) == queries:
+                break
+        if not cases:
+            raise CommandError("검색어로 쓸 기사가 없습니다.")
+
+        es = get_es_client()
+        modes = {
+            'bm25': lambda query: search_articles(es, query, size=size)['hits']['hits'],
+            # cold는 캐시된 임베딩을 지우고 검색어 임베딩 API부터, cached는 바로 앞 cold가 채운 임베딩 사용
+            'hybrid (cold)': lambda query: hybrid_search(es, query, size=size)[0],
+            'hybrid (cached)': lambda query: hybrid_search(es, query, size=size)[0],
+        }
+        stats = {mode: {'latency': [], 'rr': []} for mode in modes}
+        for target, query in cases:
+            for mode, run in modes.items():
+                if mode == 'hybrid (cold)':
+                    # 이전 실행이 공유 캐시(CACHE_TTL['query_embedding'])에 남긴 임베딩도 지운다 (측정 시간에서 제외)
+                    forget_query(query)
+                start = time.perf_counter()
+                hits = run(query)
+                stats[mode]['latency'].append(time.perf_counter() - start)
+                stats[mode]['rr'].append(reciprocal_rank([int(hit['_id']) for hit in hits], target))
+
+        self.stdout.write(f"검색어 {len(cases)}개 ({source}), 상위 {size}개 기준")
+        for mode, values in stats.items():
+            p50, p95 = np.percentile(values['latency'], [50, 95]) * 1000
+            rr = np.array(values['rr'])
+            self.stdout.write(
+                f"{mode:>16}: p50 {p50:7.1f} ms, p95 {p95:7.1f} ms | "
+                f"MRR@{size} {rr.mean():.3f}, Recall@{size} {(rr > 0).mean():.3f}"
+            )
@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from news.ann import IVFFlatIndex
+from news.embeddings import decode_embedding
+from news.models import NewsArticle
+from news.vector_index import EMBEDDING_DIM, EmbeddingIndex
+
+
+class Command(BaseCommand):
+    help = "IVF-flat 인덱스의 리콜/지연시간을 exact 검색과 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000, help="합성 데이터 벡터 수")
+        parser.add_argument('--dim', type=int, default=EMBEDDING_DIM)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--k', type=int, default=10)
+        parser.add_argument('--nlist', type=int, default=None)
+        parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+        parser.add_argument('--from-db', action='store_true', help="합성 데이터 대신 DB의 기사 임베딩 사용")
+
+    def load_vectors(self, rows, dim, from_db):
+        if from_db:
+            pairs = [
+                (article_id, decode_embedding(raw))
+                for article_id, raw in NewsArticle.objects.exclude(embedding=None)
+                .values_list('id', 'embedding').iterator(chunk_size=2000)
+            ]
+            ids = np.array([article_id for article_id, _ in pairs], dtype=np.int64)
+            return ids, np.stack([vec for _, vec in pairs]).astype(np.float32)
+
+        # 실제 뉴스 임베딩처럼 주제별로 뭉쳐 있는 합성 데이터
+        rng = np.random.default_rng(0)
+        topics = rng.normal(size=(max(rows // 500, 8), dim)).astype(np.float32)
+        labels = rng.integers(0, topics.shape[0], size=rows)
+        vectors = topics[labels] + rng.normal(scale=0.6, size=(rows, dim)).astype(np.float32)
+        return np.arange(1, rows + 1, dtype=np.int64), vectors
+
+    def timed(self, index, queries, k, **options):
+        latencies, results = [], []
+        for query in queries:
+            start = time.perf_counter()
+            results.append(index.search(query, k=k, **options))
+            latencies.append(time.perf_counter() - start)
+        latencies = np.array(latencies) * 1000
+        return results, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+    def handle(self, *args, rows, dim, queries, k, nlist, nprobe, from_db, **options):
+        ids, vectors = self.load_vectors(rows, dim, from_db)
+        rng = np.random.default_rng(1)
+        query_vectors = vectors[rng.choice(len(ids), min(queries, len(ids)), replace=False)]
+        query_vectors = query_vectors + rng.normal(scale=0.1, size=query_vectors.shape).astype(np.float32)
+        self.stdout.write(f"벡터 {len(ids)}개, dim {vectors.shape[1]}, 질의 {len(query_vectors)}개, k={k}")
+
+        exact = EmbeddingIndex(dim=vectors.shape[1])
+        for article_id, vec in zip(ids, vectors):
+            exact.upsert(int(article_id), vec)
+        truth, p50, p99 = self.timed(exact, query_vectors, k)
+        self.stdout.write(f"{'exact':>12}: recall@{k} 1.000, p50 {p50:7.2f} ms, p99 {p99:7.2f} ms")
+
+        start = time.perf_counter()
+        ivf = IVFFlatIndex(dim=vectors.shape[1])
+        ivf.build(ids, vectors, nlist=nlist)
+        self.stdout.write(f"IVF 구축: nlist {len(ivf._lists)}, {time.perf_counter() - start:.1f}s")
+
+        for probe in nprobe:
+            approx, p50, p99 = self.timed(ivf, query_vectors, k, nprobe=probe)
+            recall = np.mean([
+                len({i for i, _ in a} & {i for i, _ in t}) / max(len(t), 1)
+                for a, t in zip(approx, truth)
+            ])
+            self.stdout.write(f"{'nprobe=' + str(probe):>12}: recall@{k} {recall:.3f}, p50 {p50:7.2f} ms, p99 {p99:7.2f} ms")
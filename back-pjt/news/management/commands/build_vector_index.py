@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from news.vector_index import ENGINES, index_path
+
+
+class Command(BaseCommand):
+    help = "DB 전체로 벡터 인덱스를 새로 만들어 VECTOR_INDEX_DIR에 저장"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engine', choices=sorted(ENGINES), action='append',
+                            help="만들 엔진 (여러 번 지정 가능, 기본: 전부)")
+
+    def handle(self, *args, engine, **options):
+        for name in engine or sorted(ENGINES):
+            start = time.perf_counter()
+            index = import_string(ENGINES[name])()
+            index.sync(full=True)
+            path = index_path(name)
+            index.save(path)
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: {len(index)}개 벡터, {time.perf_counter() - start:.1f}s -> {path}"
+            ))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from elasticsearch import helpers
+
+from news.search_cache import bump_search_generation
+from news.utils import NEWS_ALIAS, article_doc_id, get_es_client
+
+
+class Command(BaseCommand):
+    help = "news 인덱스에서 _id가 기사 id가 아닌 문서(예전 URL 기반 문서 등)를 삭제 (한 번만 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="scroll/bulk 삭제 단위")
+        parser.add_argument('--dry-run', action='store_true', help="삭제할 문서 수만 출력")
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        es = get_es_client()
+        if not es.indices.exists(index=NEWS_ALIAS):
+            self.stdout.write("news 인덱스가 없습니다.")
+            return
+
+        # id 필드가 없거나 _id가 id 필드와 다른 문서
+        stale = []
+        scanned = 0
+        for hit in helpers.scan(es, index=NEWS_ALIAS, _source=['id'], size=batch_size):
+            scanned += 1
+            doc_id = hit['_source'].get('id')
+            if doc_id is None or hit['_id'] != article_doc_id(doc_id):
+                stale.append(hit['_id'])
+
+        if dry_run:
+            self.stdout.write(f"(dry-run) 문서 {scanned}개 중 {len(stale)}개 삭제 대상")
+            return
+
+        deleted, errors = helpers.bulk(
+            es,
+            ({'_op_type': 'delete', '_index': NEWS_ALIAS, '_id': doc_id} for doc_id in stale),
+            chunk_size=batch_size,
+            raise_on_error=False,
+        )
+        es.indices.refresh(index=NEWS_ALIAS)
+        bump_search_generation()
+        self.stdout.write(self.style.SUCCESS(
+            f"문서 {scanned}개 중 {deleted}개 삭제 (실패 {len(errors)}개)"
+        ))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from news.embeddings import decode_embedding, encode_embedding, is_legacy
+from news.models import NewsArticle
+
+
+class Command(BaseCommand):
+    help = "레거시 JSON 임베딩을 float32 바이너리 포맷(v1)으로 배치 변환"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help="변환 대상 수만 확인")
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        converted = skipped = failed = 0
+        last_id = 0
+
+        # id 순서로 배치를 잘라 읽어서 한 번에 전체 테이블을 메모리에 올리지 않는다
+        while True:
+            rows = list(
+                NewsArticle.objects
+                .filter(id__gt=last_id)
+                .exclude(embedding=None)
+                .order_by('id')
+                .values_list('id', 'embedding')[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            updates = []
+            for article_id, raw in rows:
+                if not is_legacy(raw):
+                    skipped += 1
+                    continue
+                try:
+                    updates.append(NewsArticle(id=article_id, embedding=encode_embedding(decode_embedding(raw))))
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"변환 실패 {article_id}: {e}")
+
+            # bulk_update는 post_save 시그널을 발생시키지 않아 ES 재색인이 일어나지 않는다
+            if updates and not dry_run:
+                with transaction.atomic():
+                    NewsArticle.objects.bulk_update(updates, ['embedding'])
+            converted += len(updates)
+            self.stdout.write(f"~id {last_id}: 변환 {converted}, 건너뜀 {skipped}, 실패 {failed}")
+
+        action = "변환 대상" if dry_run else "변환 완료"
+        self.stdout.write(self.style.SUCCESS(f"{action} {converted}건 (이미 v1 {skipped}건, 실패 {failed}건)"))
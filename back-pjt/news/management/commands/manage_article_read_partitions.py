@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from news.read_partitions import ensure_partitions, drop_expired, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "article_read 월별 파티션을 미리 만들고 보관 기간이 지난 조회 기록을 삭제 (cron 등으로 매일 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=2, help="이번 달 이후 몇 개월치 파티션을 미리 만들지")
+        parser.add_argument('--dry-run', action='store_true', help="만들/삭제할 대상만 출력")
+
+    def handle(self, *args, months_ahead, dry_run, **options):
+        with transaction.atomic():
+            created = ensure_partitions(months_ahead=months_ahead, dry_run=dry_run)
+            dropped, deleted_rows = drop_expired(dry_run=dry_run)
+
+        prefix = "(dry-run) " if dry_run else ""
+        for name in created:
+            self.stdout.write(f"{prefix}파티션 생성: {name}")
+        for name in dropped:
+            self.stdout.write(f"{prefix}파티션 삭제: {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}보관 기준일 {retention_cutoff().isoformat()} 이전 조회 기록 정리 완료 "
+            f"(파티션 {len(dropped)}개, 그 밖의 행 {deleted_rows}개)"
+        ))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from news.cache import is_shared
+from news.search_cache import expire_query_log, prewarm, search_generation
+
+
+class Command(BaseCommand):
+    help = (
+        "최근 많이 검색된 검색어의 첫 페이지 결과를 검색 캐시에 미리 채움 (cron 등으로 주기 실행, redis/file 캐시 백엔드 필요). "
+        "서빙 워커는 SEARCH_PREWARM_SECONDS마다 스스로 미리 채운다"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=100, help="미리 채울 검색어 수")
+        parser.add_argument('--days', type=int, default=1, help="최근 며칠 동안의 검색어 로그를 볼지")
+
+    def handle(self, *args, top, days, **options):
+        if not is_shared():
+            raise CommandError(
+                f"캐시 백엔드({settings.CACHES['default']['BACKEND']})가 프로세스마다 따로라서 "
+                "이 명령어로 채운 결과는 서빙 워커에 보이지 않습니다. CACHE_BACKEND=redis/file을 쓰거나 "
+                "워커의 백그라운드 미리 채우기(SEARCH_PREWARM_SECONDS)를 사용하세요."
+            )
+        expired = expire_query_log(settings.SEARCH_QUERY_LOG_DAYS)
+        total, built = prewarm(limit=top, days=days)
+        self.stdout.write(self.style.SUCCESS(
+            f"검색 세대 {search_generation()}: 검색어 {total}개 중 {built}개 새로 계산, 나머지는 이미 캐시됨 "
+            f"(보관 기간 지난 검색어 로그 {expired}행 삭제)"
+        ))
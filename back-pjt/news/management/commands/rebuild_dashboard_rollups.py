@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from news.dashboard import liked_category_counts, read_keyword_counts, daily_read_counts
+from news.models import ArticleLike, ArticleRead, UserCategoryStat, UserKeywordStat, UserDailyReadStat
+from news.read_partitions import retention_cutoff
+from news.rollups import KEYWORD_MAX_LENGTH
+
+
+def merge_keywords(rows):
+    """롤업 컬럼 길이로 자른 뒤 같은 키워드가 되면 합친다"""
+    merged = {}
+    for keyword, count in rows:
+        keyword = keyword[:KEYWORD_MAX_LENGTH]
+        merged[keyword] = merged.get(keyword, 0) + count
+    return merged.items()
+
+
+class Command(BaseCommand):
+    help = "좋아요/조회 기록으로 대시보드 롤업(카테고리/키워드/날짜별 조회 수)을 다시 만든다"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, action='append', help="특정 유저만 (여러 번 지정 가능)")
+
+    def handle(self, *args, user_id, **options):
+        if user_id:
+            user_ids = set(user_id)
+        else:
+            user_ids = (
+                set(ArticleLike.objects.values_list('user_id', flat=True).distinct())
+                | set(ArticleRead.objects.values_list('user_id', flat=True).distinct())
+                | set(UserCategoryStat.objects.values_list('user_id', flat=True).distinct())
+                | set(UserDailyReadStat.objects.values_list('user_id', flat=True).distinct())
+            )
+
+        cutoff = retention_cutoff()
+        for done, uid in enumerate(sorted(user_ids), start=1):
+            with transaction.atomic():
+                UserCategoryStat.objects.filter(user_id=uid).delete()
+                UserKeywordStat.objects.filter(user_id=uid).delete()
+                # 보관 기간이 지나 조회 기록이 삭제된 날짜의 집계는 그대로 둔다
+                UserDailyReadStat.objects.filter(user_id=uid, day__gte=cutoff).delete()
+
+                UserCategoryStat.objects.bulk_create([
+                    UserCategoryStat(user_id=uid, category=category, count=count)
+                    for category, count in liked_category_counts(uid)
+                ])
+                UserKeywordStat.objects.bulk_create([
+                    UserKeywordStat(user_id=uid, keyword=keyword, count=count)
+                    for keyword, count in merge_keywords(read_keyword_counts(uid))
+                ])
+                UserDailyReadStat.objects.bulk_create([
+                    UserDailyReadStat(user_id=uid, day=day, count=count)
+                    for day, count in daily_read_counts(uid)
+                ])
+            if done % 100 == 0:
+                self.stdout.write(f"{done}/{len(user_ids)} 완료")
+
+        self.stdout.write(self.style.SUCCESS(f"대시보드 롤업 {len(user_ids)}명 재계산 완료"))
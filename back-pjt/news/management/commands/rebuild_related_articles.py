@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from news.models import RelatedArticle
+from news.vector_index import EmbeddingIndex
+
+
+def neighbours_for_chunk(ids, matrix, start, stop, top_k):
+    """matrix[start:stop] 기사들의 top-k 이웃 계산 (NumPy 행렬곱은 GIL을 풀어 스레드로 병렬 처리됨)"""
+    scores = matrix[start:stop] @ matrix.T
+    rows = np.arange(stop - start)
+    scores[rows, rows + start] = -np.inf  # 자기 자신 제외
+
+    k = min(top_k, matrix.shape[0] - 1)
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    links = []
+    for row, columns in enumerate(top):
+        for column in columns:
+            links.append(RelatedArticle(
+                article_id=int(ids[start + row]),
+                related_id=int(ids[column]),
+                score=float(scores[row, column]),
+            ))
+    return links
+
+
+class Command(BaseCommand):
+    help = "모든 기사의 연관 기사(top-k) 테이블을 청크 단위 병렬 계산으로 다시 만든다"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=getattr(settings, 'RELATED_ARTICLES_TOP_K', 5))
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=4)
+
+    def handle(self, *args, top_k, chunk_size, workers, **options):
+        start_time = time.perf_counter()
+        index = EmbeddingIndex()
+        index.sync(full=True)
+        ids, matrix = index._arrays()
+        total = len(ids)
+        self.stdout.write(f"기사 {total}개 임베딩 로드 ({time.perf_counter() - start_time:.1f}s)")
+
+        chunks = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+        done = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(neighbours_for_chunk, ids, matrix, start, stop, top_k)
+                for start, stop in chunks
+            ]
+            # 계산은 워커 스레드에서, DB 쓰기는 메인 스레드에서 청크마다 교체
+            for (start, stop), future in zip(chunks, futures):
+                links = future.result()
+                with transaction.atomic():
+                    RelatedArticle.objects.filter(article_id__in=ids[start:stop].tolist()).delete()
+                    RelatedArticle.objects.bulk_create(links, batch_size=5000)
+                done += stop - start
+                self.stdout.write(f"{done}/{total} 완료")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"연관 기사 재계산 완료: {total}개 기사, top-{top_k}, {time.perf_counter() - start_time:.1f}s"
+        ))
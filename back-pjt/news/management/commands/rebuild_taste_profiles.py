@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from news.embeddings import decode_embedding, encode_embedding
+from news.models import NewsArticle, ArticleLike, ArticleRead, UserTasteProfile
+
+
+def weighted_sum(embeddings, counts):
+    """{article_id: 개수}에 대해 임베딩 * 개수의 합과 총 개수 (임베딩 없는 기사는 제외)"""
+    total, count = None, 0
+    for article_id, n in counts.items():
+        raw = embeddings.get(article_id)
+        if raw is None:
+            continue
+        vec = decode_embedding(raw) * n
+        total = vec if total is None else total + vec
+        count += n
+    return (encode_embedding(total) if total is not None else None), count
+
+
+class Command(BaseCommand):
+    help = "좋아요/조회 기록으로 유저 취향 벡터(UserTasteProfile)를 다시 계산해 누적 오차를 보정"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, action='append', help="특정 유저만 (여러 번 지정 가능)")
+
+    def handle(self, *args, user_id, **options):
+        if user_id:
+            user_ids = set(user_id)
+        else:
+            user_ids = (
+                set(ArticleLike.objects.values_list('user_id', flat=True).distinct())
+                | set(ArticleRead.objects.values_list('user_id', flat=True).distinct())
+                | set(UserTasteProfile.objects.values_list('user_id', flat=True))
+            )
+
+        for done, uid in enumerate(sorted(user_ids), start=1):
+            liked = set(ArticleLike.objects.filter(user_id=uid).values_list('article_id', flat=True))
+            reads = dict(
+                ArticleRead.objects
+                .filter(user_id=uid)
+                .exclude(article_id__in=liked)
+                .values('article_id')
+                .annotate(n=Count('id'))
+                .values_list('article_id', 'n')
+            )
+            embeddings = dict(
+                NewsArticle.objects
+                .filter(id__in=liked | set(reads))
+                .exclude(embedding=None)
+                .values_list('id', 'embedding')
+            )
+
+            like_sum, like_count = weighted_sum(embeddings, {article_id: 1 for article_id in liked})
+            read_sum, read_count = weighted_sum(embeddings, reads)
+
+            if not like_count and not read_count:
+                UserTasteProfile.objects.filter(user_id=uid).delete()
+                continue
+            UserTasteProfile.objects.update_or_create(user_id=uid, defaults={
+                'like_sum': like_sum, 'like_count': like_count,
+                'read_sum': read_sum, 'read_count': read_count,
+            })
+            if done % 100 == 0:
+                self.stdout.write(f"{done}/{len(user_ids)} 완료")
+
+        self.stdout.write(self.style.SUCCESS(f"유저 취향 벡터 {len(user_ids)}명 재계산 완료"))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from news.models import NewsArticle, ArticleLike, ArticleBookmark
+
+
+def count_subquery(model):
+    """기사별 실제 행 수를 세는 상관 서브쿼리"""
+    rows = (
+        model.objects
+        .filter(article=OuterRef('pk'))
+        .order_by()
+        .values('article')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), Value(0))
+
+
+class Command(BaseCommand):
+    help = "기사의 like_count/bookmark_count를 실제 좋아요/북마크 행 수와 맞춘다 (주기 실행용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="id 범위 단위 (긴 잠금 방지)")
+        parser.add_argument('--dry-run', action='store_true', help="어긋난 기사 수만 확인")
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        fixed = 0
+        last_id = 0
+        max_id = NewsArticle.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+        while last_id < max_id:
+            upper = last_id + batch_size
+            drifted = list(
+                NewsArticle.objects
+                .filter(id__gt=last_id, id__lte=upper)
+                .annotate(actual_likes=count_subquery(ArticleLike), actual_bookmarks=count_subquery(ArticleBookmark))
+                .filter(~Q(like_count=F('actual_likes')) | ~Q(bookmark_count=F('actual_bookmarks')))
+                .values_list('id', flat=True)
+            )
+            if drifted and not dry_run:
+                # 확인 시점과 갱신 시점 사이의 변경도 반영되도록 UPDATE 안에서 다시 센다
+                NewsArticle.objects.filter(id__in=drifted).update(
+                    like_count=count_subquery(ArticleLike),
+                    bookmark_count=count_subquery(ArticleBookmark),
+                )
+            fixed += len(drifted)
+            last_id = upper
+
+        action = "어긋난 기사" if dry_run else "보정한 기사"
+        self.stdout.write(self.style.SUCCESS(f"{action} {fixed}개"))
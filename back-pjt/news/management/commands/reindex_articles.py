@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from news.models import SearchReindexJob
+from news.search_index import create_job, is_active, resumable_job, run_reindex
+
+
+class Command(BaseCommand):
+    help = "모든 기사를 새 버전 인덱스에 bulk API로 병렬 색인한 뒤 news 별칭 교체 (중단/실패한 작업은 --resume으로 이어서 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help="DB에서 읽고 bulk 요청 한 번에 보낼 문서 수")
+        parser.add_argument('--workers', type=int, default=4, help="bulk 요청을 보내는 스레드 수")
+        parser.add_argument('--resume', action='store_true', help="가장 최근 실패/중단된 작업을 last_id 다음부터 이어서 실행")
+
+    def handle(self, *args, chunk_size, workers, resume, **options):
+        latest = SearchReindexJob.objects.first()
+        if latest and is_active(latest):
+            raise CommandError(f"진행 중인 재인덱싱 작업이 있습니다 (작업 {latest.id}).")
+
+        if resume:
+            job = resumable_job()
+            if job is None:
+                raise CommandError("이어서 실행할 작업이 없습니다.")
+            self.stdout.write(f"작업 {job.id}를 기사 id {job.last_id} 다음부터 이어서 실행")
+        else:
+            job = create_job()
+            self.stdout.write(f"작업 {job.id}: 새 인덱스 {job.index_name}에 색인 (끝나면 news 별칭 교체)")
+
+        try:
+            run_reindex(job, chunk_size=chunk_size, workers=workers, progress=self.report)
+        except Exception as e:
+            raise CommandError(f"재인덱싱 실패 (작업 {job.id}, --resume으로 이어서 실행): {e}")
+
+        if job.status == SearchReindexJob.DONE:
+            self.stdout.write(f"news 별칭 교체: {', '.join(job.previous_indices) or '(없음)'} -> {job.index_name}")
+            if job.removed_indices:
+                self.stdout.write(f"예전 버전 인덱스 삭제: {', '.join(job.removed_indices)}")
+            self.stdout.write(self.style.SUCCESS(f"재인덱싱 완료: 작업 {job.id}, {job.indexed}/{job.total}개, news -> {job.index_name}"))
+        else:
+            raise CommandError(
+                f"문서 {job.failed}개 인덱싱 실패 (작업 {job.id}, 기사 id {job.last_id}까지 완료, --resume으로 이어서 실행): {job.error}"
+            )
+
+    def report(self, job, processed, elapsed):
+        rate = processed / elapsed if elapsed else 0.0
+        self.stdout.write(
+            f"{job.indexed}/{job.total} 인덱싱 (이번 실행 {processed}개, 실패 {job.failed}개, "
+            f"{rate:.0f} docs/s, last_id {job.last_id})"
+        )
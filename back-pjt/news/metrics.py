@@ -0,0 +1,46 @@
+"""
+프로세스 단위 운영 지표 (캐시 히트/미스, 소요 시간 등)
+
+값은 워커 프로세스마다 따로 쌓이며 /api/metrics/ 로 현재 워커의 값을 확인한다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_counters = {}
+_timers = {}
+
+
+def incr(name, amount=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def observe(name, seconds):
+    """소요 시간 기록 (횟수/합계/최대)"""
+    with _lock:
+        timer = _timers.setdefault(name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        ms = seconds * 1000
+        timer['count'] += 1
+        timer['total_ms'] += ms
+        timer['max_ms'] = max(timer['max_ms'], ms)
+
+
+@contextmanager
+def timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def snapshot():
+    with _lock:
+        counters = dict(sorted(_counters.items()))
+        timers = {
+            name: dict(timer, avg_ms=round(timer['total_ms'] / timer['count'], 3))
+            for name, timer in sorted(_timers.items())
+        }
+    return {'counters': counters, 'timers': timers}
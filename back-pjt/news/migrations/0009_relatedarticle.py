@@ -0,0 +1,54 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0008_articlebookmark"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedArticle",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "article",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_links",
+                        to="news.newsarticle",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="news.newsarticle",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "news_related_article",
+                "indexes": [
+                    models.Index(
+                        fields=["article", "-score"], name="related_article_score_idx"
+                    )
+                ],
+                "unique_together": {("article", "related")},
+            },
+        ),
+    ]
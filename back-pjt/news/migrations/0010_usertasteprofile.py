@@ -0,0 +1,39 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("news", "0009_relatedarticle"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserTasteProfile",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="taste_profile",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("like_sum", models.BinaryField(null=True)),
+                ("like_count", models.IntegerField(default=0)),
+                ("read_sum", models.BinaryField(null=True)),
+                ("read_count", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "user_taste_profile",
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0010_usertasteprofile"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="newsarticle",
+            index=models.Index(
+                fields=["-write_date", "-id"], name="article_write_date_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newsarticle",
+            index=models.Index(
+                fields=["category", "-write_date", "-id"],
+                name="article_category_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:23
+
+from django.db import migrations, models
+
+
+def set_db_defaults(apps, schema_editor):
+    # 컨슈머는 컬럼을 나열한 raw INSERT를 쓰므로 DB 레벨 기본값이 필요하다
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in ("like_count", "bookmark_count"):
+        schema_editor.execute(
+            f"ALTER TABLE news_article ALTER COLUMN {column} SET DEFAULT 0"
+        )
+
+
+def backfill_counters(apps, schema_editor):
+    schema_editor.execute(
+        """
+        UPDATE news_article SET like_count = c.n
+        FROM (SELECT article_id, COUNT(*) AS n FROM news_articlelike GROUP BY article_id) c
+        WHERE news_article.id = c.article_id
+        """
+    )
+    schema_editor.execute(
+        """
+        UPDATE news_article SET bookmark_count = c.n
+        FROM (SELECT article_id, COUNT(*) AS n FROM article_bookmark GROUP BY article_id) c
+        WHERE news_article.id = c.article_id
+        """
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0011_article_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsarticle",
+            name="bookmark_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="newsarticle",
+            name="like_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="newsarticle",
+            index=models.Index(
+                fields=["-like_count", "-id"], name="article_like_count_idx"
+            ),
+        ),
+        migrations.RunPython(set_db_defaults, migrations.RunPython.noop),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
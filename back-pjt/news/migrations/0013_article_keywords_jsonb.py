@@ -0,0 +1,98 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:05
+
+import ast
+import json
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def parse_keywords(raw):
+    # 컨슈머는 json.dumps로 저장했지만 파이썬 repr 형태로 들어간 행도 있다
+    if not raw or not raw.strip():
+        return []
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            value = parse(raw)
+        except (ValueError, SyntaxError):
+            continue
+        if isinstance(value, (list, tuple)):
+            return [str(k) for k in value]
+    return []
+
+
+def copy_keywords(apps, schema_editor):
+    NewsArticle = apps.get_model("news", "NewsArticle")
+    batch = []
+    for article_id, raw in (
+        NewsArticle.objects.order_by("id")
+        .values_list("id", "keywords")
+        .iterator(chunk_size=BATCH_SIZE)
+    ):
+        batch.append(NewsArticle(id=article_id, keywords_list=parse_keywords(raw)))
+        if len(batch) >= BATCH_SIZE:
+            NewsArticle.objects.bulk_update(batch, ["keywords_list"])
+            batch = []
+    if batch:
+        NewsArticle.objects.bulk_update(batch, ["keywords_list"])
+
+
+def copy_keywords_back(apps, schema_editor):
+    NewsArticle = apps.get_model("news", "NewsArticle")
+    batch = []
+    for article_id, keywords in (
+        NewsArticle.objects.order_by("id")
+        .values_list("id", "keywords_list")
+        .iterator(chunk_size=BATCH_SIZE)
+    ):
+        batch.append(
+            NewsArticle(
+                id=article_id, keywords=json.dumps(keywords, ensure_ascii=False)
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            NewsArticle.objects.bulk_update(batch, ["keywords"])
+            batch = []
+    if batch:
+        NewsArticle.objects.bulk_update(batch, ["keywords"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0012_article_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsarticle",
+            name="keywords_list",
+            field=models.JSONField(default=list),
+        ),
+        migrations.RunPython(copy_keywords, copy_keywords_back),
+        # 되돌릴 때 기존 행이 있어도 텍스트 컬럼을 다시 만들 수 있도록 기본값 지정
+        migrations.AlterField(
+            model_name="newsarticle",
+            name="keywords",
+            field=models.TextField(default="[]"),
+        ),
+        migrations.RemoveField(
+            model_name="newsarticle",
+            name="keywords",
+        ),
+        migrations.RenameField(
+            model_name="newsarticle",
+            old_name="keywords_list",
+            new_name="keywords",
+        ),
+        migrations.AddIndex(
+            model_name="newsarticle",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["keywords"],
+                name="article_keywords_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("news", "0013_article_keywords_jsonb"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserCategoryStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("category", models.CharField(max_length=50)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "user_category_stat",
+            },
+        ),
+        migrations.CreateModel(
+            name="UserDailyReadStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "user_daily_read_stat",
+            },
+        ),
+        migrations.CreateModel(
+            name="UserKeywordStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("keyword", models.CharField(max_length=100)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "user_keyword_stat",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="articleread",
+            index=models.Index(
+                fields=["user", "article", "read_at"],
+                name="article_read_user_article_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="userkeywordstat",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="userdailyreadstat",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="usercategorystat",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userkeywordstat",
+            index=models.Index(
+                fields=["user", "-count"], name="user_keyword_stat_count_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="userkeywordstat",
+            unique_together={("user", "keyword")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="userdailyreadstat",
+            unique_together={("user", "day")},
+        ),
+        migrations.AddIndex(
+            model_name="usercategorystat",
+            index=models.Index(
+                fields=["user", "-count"], name="user_category_stat_count_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="usercategorystat",
+            unique_together={("user", "category")},
+        ),
+    ]
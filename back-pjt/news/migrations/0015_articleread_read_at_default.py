@@ -0,0 +1,19 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:31
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0014_dashboard_rollups"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="articleread",
+            name="read_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,146 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:33
+
+from datetime import date
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+import django.utils.timezone
+
+BATCH_SIZE = 5000
+MONTHS_AHEAD = 2
+
+
+def fill_read_date(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "UPDATE article_read SET read_date = (read_at AT TIME ZONE %s)::date",
+            [settings.TIME_ZONE],
+        )
+        return
+
+    ArticleRead = apps.get_model("news", "ArticleRead")
+    batch = []
+    for read_id, read_at in ArticleRead.objects.values_list("id", "read_at").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        batch.append(ArticleRead(id=read_id, read_date=timezone.localdate(read_at)))
+        if len(batch) >= BATCH_SIZE:
+            ArticleRead.objects.bulk_update(batch, ["read_date"])
+            batch = []
+    if batch:
+        ArticleRead.objects.bulk_update(batch, ["read_date"])
+
+
+def dedupe_reads(apps, schema_editor):
+    # (유저, 기사, 날짜)마다 첫 조회만 남긴다
+    schema_editor.execute("""
+        DELETE FROM article_read WHERE id NOT IN (
+            SELECT MIN(id) FROM article_read GROUP BY user_id, article_id, read_date
+        )
+        """)
+    if schema_editor.connection.vendor == "postgresql":
+        # 이후 ALTER TABLE이 대기 중인 지연 제약 트리거 때문에 실패하지 않도록 바로 검사
+        schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_by_month(apps, schema_editor):
+    """article_read를 read_date 기준 월별 RANGE 파티션 테이블로 바꾼다 (PostgreSQL 전용)"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        # 기존 유니크/외래키 제약과 인덱스 정의를 보관했다가 새 테이블에 같은 이름으로 다시 만든다
+        cursor.execute("""
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = 'article_read'::regclass AND contype IN ('u', 'f')
+            """)
+        constraints = cursor.fetchall()
+        cursor.execute("""
+            SELECT indexname, indexdef FROM pg_indexes
+            WHERE tablename = 'article_read' AND schemaname = current_schema()
+              AND indexname NOT IN (
+                  SELECT conname FROM pg_constraint WHERE conrelid = 'article_read'::regclass
+              )
+            """)
+        indexes = cursor.fetchall()
+        cursor.execute("SELECT MIN(read_date) FROM article_read")
+        (first_day,) = cursor.fetchone()
+
+    today = timezone.localdate()
+    month = add_months(first_day or today, 0)
+    last_month = add_months(today, MONTHS_AHEAD)
+
+    statements = [
+        "ALTER TABLE article_read RENAME TO article_read_old",
+        "CREATE TABLE article_read (LIKE article_read_old) PARTITION BY RANGE (read_date)",
+        # PostgreSQL 16은 파티션 테이블의 IDENTITY 컬럼을 지원하지 않으므로 시퀀스 기본값을 쓴다
+        "CREATE SEQUENCE article_read_partitioned_id_seq OWNED BY article_read.id",
+        "ALTER TABLE article_read ALTER COLUMN id SET DEFAULT nextval('article_read_partitioned_id_seq')",
+        "CREATE TABLE article_read_default PARTITION OF article_read DEFAULT",
+    ]
+    while month <= last_month:
+        next_month = add_months(month, 1)
+        statements.append(
+            f"CREATE TABLE article_read_y{month.year:04d}m{month.month:02d} PARTITION OF article_read "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    statements += [
+        """
+        INSERT INTO article_read (id, user_id, article_id, read_at, read_date)
+        SELECT id, user_id, article_id, read_at, read_date FROM article_read_old
+        """,
+        """
+        SELECT setval('article_read_partitioned_id_seq',
+                      COALESCE((SELECT MAX(id) FROM article_read_old), 0) + 1, false)
+        """,
+        "DROP TABLE article_read_old",
+        # 파티션 테이블의 PK는 파티션 키를 포함해야 한다 (id는 시퀀스로 계속 유일)
+        "ALTER TABLE article_read ADD CONSTRAINT article_read_pkey PRIMARY KEY (id, read_date)",
+    ]
+    statements += [
+        f"ALTER TABLE article_read ADD CONSTRAINT {name} {definition}"
+        for name, definition in constraints
+    ]
+    statements += [definition for _, definition in indexes]
+
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("news", "0015_articleread_read_at_default"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="articleread",
+            name="article_read_user_article_idx",
+        ),
+        migrations.AddField(
+            model_name="articleread",
+            name="read_date",
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(fill_read_date, migrations.RunPython.noop),
+        migrations.RunPython(dedupe_reads, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="articleread",
+            name="read_date",
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+        migrations.AlterUniqueTogether(
+            name="articleread",
+            unique_together={("user", "article", "read_date")},
+        ),
+        migrations.RunPython(partition_by_month, migrations.RunPython.noop),
+    ]
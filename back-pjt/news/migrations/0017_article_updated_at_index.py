@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0016_article_read_partitioning"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="newsarticle",
+            index=models.Index(fields=["updated_at"], name="article_updated_at_idx"),
+        ),
+    ]
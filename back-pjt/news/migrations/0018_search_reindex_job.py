@@ -0,0 +1,53 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:41
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0017_article_updated_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchReindexJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index_name", models.CharField(max_length=100)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "진행 중"),
+                            ("done", "완료"),
+                            ("failed", "실패"),
+                        ],
+                        default="running",
+                        max_length=10,
+                    ),
+                ),
+                ("last_id", models.IntegerField(default=0)),
+                ("total", models.IntegerField(default=0)),
+                ("indexed", models.IntegerField(default=0)),
+                ("failed", models.IntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                ("started_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "search_reindex_job",
+                "ordering": ["-id"],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:48
+
+from django.db import migrations, models
+
+
+def create_generation_row(apps, schema_editor):
+    # 컨슈머는 UPDATE ... WHERE id = 1 만 하므로 행을 미리 만든다
+    SearchGeneration = apps.get_model("news", "SearchGeneration")
+    SearchGeneration.objects.get_or_create(id=1, defaults={"value": 0})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0018_search_reindex_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchGeneration",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "search_generation",
+            },
+        ),
+        migrations.CreateModel(
+            name="SearchQueryStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("query", models.CharField(max_length=200)),
+                ("category", models.CharField(blank=True, max_length=50)),
+                ("sort", models.CharField(blank=True, max_length=10)),
+                ("mode", models.CharField(blank=True, max_length=10)),
+                ("size", models.IntegerField()),
+                ("day", models.DateField()),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "search_query_stat",
+                "indexes": [
+                    models.Index(
+                        fields=["day", "-count"], name="search_query_stat_day_idx"
+                    )
+                ],
+                "unique_together": {
+                    ("query", "category", "sort", "mode", "size", "day")
+                },
+            },
+        ),
+        migrations.RunPython(create_generation_row, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0019_search_cache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="searchreindexjob",
+            name="previous_indices",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name="searchreindexjob",
+            name="removed_indices",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
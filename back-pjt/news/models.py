@@ -1,12 +1,14 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-import json
-import numpy as np
+from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from .embeddings import encode_embedding, decode_embedding
 
 # 유저 모델 생성
 User = get_user_model()
 # Create your models here.
 
+
 class NewsArticle(models.Model):
     id = models.AutoField(primary_key=True)
     title = models.CharField(max_length=200)
@@ -16,38 +18,29 @@ class NewsArticle(models.Model):
     category = models.CharField(max_length=50)
     content = models.TextField()
     url = models.URLField(unique=True)
-    keywords = models.TextField()  # 그대로 TextField 유지
+    keywords = models.JSONField(default=list)  # 키워드 문자열 리스트 (jsonb)
     embedding = models.BinaryField(null=True)
     views = models.IntegerField(default=0)
+    # 좋아요/북마크 수 (toggle_like/toggle_bookmark에서 F() 연산으로 갱신, reconcile_article_counters로 보정)
+    like_count = models.IntegerField(default=0)
+    bookmark_count = models.IntegerField(default=0)
     updated_at = models.DateTimeField()
 
     @property
     def keywords_as_list(self):
-        try:
-            return json.loads(self.keywords)
-        except Exception:
-            return []
+        return self.keywords if isinstance(self.keywords, list) else []
 
     def set_embedding(self, embedding_array):
-        """numpy 배열을 바이너리 형태로 변환하여 저장"""
-        if embedding_array is None:
-            self.embedding = None
-            return
-            
-        if isinstance(embedding_array, np.ndarray):
-            embedding_array = embedding_array.tolist()
-        
-        embedding_json = json.dumps(embedding_array)
-        self.embedding = embedding_json.encode('utf-8')
+        """numpy 배열을 float32 바이너리(news.embeddings v1)로 변환하여 저장"""
+        self.embedding = encode_embedding(embedding_array)
 
     def get_embedding(self):
-        """저장된 바이너리 임베딩을 numpy 배열로 변환"""
+        """저장된 바이너리 임베딩을 numpy 배열로 변환 (레거시 JSON 포맷도 지원)"""
         if self.embedding is None:
             return None
             
         try:
-            embedding_str = self.embedding.tobytes().decode('utf-8')
-            return np.array(json.loads(embedding_str), dtype=np.float32)
+            return decode_embedding(self.embedding)
         except Exception as e:
             print(f"임베딩 변환 실패: {e}")
             return None
@@ -55,7 +48,33 @@ class NewsArticle(models.Model):
     class Meta:
         db_table = "news_article"  # 실제 DB 테이블명 명시
         managed = True     # 마이그레이션에서 관리하도록 변경
+        indexes = [
+            # show_articles 키셋 페이지네이션 (write_date, id) / 카테고리 필터
+            models.Index(fields=['-write_date', '-id'], name='article_write_date_id_idx'),
+            models.Index(fields=['category', '-write_date', '-id'], name='article_category_date_idx'),
+            # 좋아요 많은 순 조회
+            models.Index(fields=['-like_count', '-id'], name='article_like_count_idx'),
+            # 캐시 키용 최신 updated_at 조회, 벡터 인덱스 증분 동기화
+            models.Index(fields=['updated_at'], name='article_updated_at_idx'),
+            # 키워드 포함 검색 (keywords @> '["AI"]')
+            GinIndex(fields=['keywords'], name='article_keywords_gin', opclasses=['jsonb_path_ops']),
+        ]
+
+
+
+# 연관 기사 테이블 구조 (기사별 임베딩 유사도 top-k)
+# 컨슈머가 기사를 넣을 때 채우고, rebuild_related_articles 명령어로 전체 재계산
+class RelatedArticle(models.Model):
+    article = models.ForeignKey(NewsArticle, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(NewsArticle, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
 
+    class Meta:
+        db_table = 'news_related_article'
+        unique_together = ('article', 'related')
+        indexes = [
+            models.Index(fields=['article', '-score'], name='related_article_score_idx'),
+        ]
 
 
 # 좋아요 테이블 구조
@@ -70,13 +89,18 @@ class ArticleLike(models.Model):
 
 
 # 조회 테이블 구조
+# (유저, 기사, 날짜)당 한 행만 저장한다. PostgreSQL에서는 read_date 기준 월별 파티션 테이블이며
+# 파티션 생성/보관 기간이 지난 파티션 삭제는 manage_article_read_partitions 명령어로 한다
 class ArticleRead(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     article = models.ForeignKey(NewsArticle, on_delete=models.CASCADE)
-    read_at = models.DateTimeField(auto_now_add = True)
+    read_at = models.DateTimeField(default=timezone.now)  # 쓰기 지연(news.read_events) 시 요청 시각을 유지하도록 기본값으로
+    read_date = models.DateField(default=timezone.localdate)  # 파티션 키 (read_at의 현재 타임존 날짜)
 
     class Meta:
         db_table = 'article_read'
+        # 파티션 테이블의 유니크 제약은 파티션 키(read_date)를 포함해야 한다
+        unique_together = ('user', 'article', 'read_date')
 
 # 북마크 테이블 구조
 class ArticleBookmark(models.Model):
@@ -87,3 +111,130 @@ class ArticleBookmark(models.Model):
     class Meta:
         unique_together = ('user', 'article')
         db_table = 'article_bookmark'
+
+
+# 유저 취향 벡터 (좋아요/조회 기사 임베딩의 누적합과 개수)
+# ArticleLike/ArticleRead 시그널로 O(dim) 갱신하고, rebuild_taste_profiles 명령어로 보정
+class UserTasteProfile(models.Model):
+    LIKE_WEIGHT = 0.7
+    READ_WEIGHT = 0.3
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='taste_profile')
+    like_sum = models.BinaryField(null=True)
+    like_count = models.IntegerField(default=0)
+    read_sum = models.BinaryField(null=True)  # 좋아요하지 않은 기사의 조회만 누적
+    read_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'user_taste_profile'
+
+    @staticmethod
+    def _mean(raw, count):
+        if raw is None or count <= 0:
+            return None
+        return decode_embedding(raw) / count
+
+    def user_vector(self):
+        """좋아요 평균 0.7 + 조회 평균 0.3 가중 평균 (행동 데이터가 없으면 None)"""
+        like_vec = self._mean(self.like_sum, self.like_count)
+        read_vec = self._mean(self.read_sum, self.read_count)
+
+        if like_vec is not None and read_vec is not None:
+            return (read_vec * self.READ_WEIGHT) + (like_vec * self.LIKE_WEIGHT)
+        return like_vec if like_vec is not None else read_vec
+
+
+# 대시보드 롤업 테이블
+# ArticleLike/ArticleRead 시그널로 증분 갱신하고, rebuild_dashboard_rollups 명령어로 전체 재계산
+# 유저별 좋아요한 기사의 카테고리 수
+class UserCategoryStat(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    category = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'user_category_stat'
+        unique_together = ('user', 'category')
+        indexes = [
+            models.Index(fields=['user', '-count'], name='user_category_stat_count_idx'),
+        ]
+
+
+# 유저별 읽은 기사(기사당 한 번)의 키워드 수
+class UserKeywordStat(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    keyword = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'user_keyword_stat'
+        unique_together = ('user', 'keyword')
+        indexes = [
+            models.Index(fields=['user', '-count'], name='user_keyword_stat_count_idx'),
+        ]
+
+
+# 유저별 날짜별 읽은 기사 수 (같은 날 같은 기사는 한 번)
+class UserDailyReadStat(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'user_daily_read_stat'
+        unique_together = ('user', 'day')
+
+
+
+# Elasticsearch 전체 재인덱싱 작업 (reindex_articles 명령어 / POST api/index/all/)
+# 기사를 id 순서로 인덱싱하므로 last_id까지는 모두 반영된 것이고, 중단되면 그 다음부터 이어서 실행한다
+class SearchReindexJob(models.Model):
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(RUNNING, '진행 중'), (DONE, '완료'), (FAILED, '실패')]
+
+    index_name = models.CharField(max_length=100)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=RUNNING)
+    last_id = models.IntegerField(default=0)  # 이 id까지는 빠짐없이 인덱싱됨
+    total = models.IntegerField(default=0)
+    indexed = models.IntegerField(default=0)  # last_id까지 인덱싱된 문서 수
+    failed = models.IntegerField(default=0)   # 이번 실행에서 실패한 문서 수
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)  # 진행 중 작업이 살아있는지 판단
+    finished_at = models.DateTimeField(null=True, blank=True)
+    previous_indices = models.JSONField(default=list, blank=True)  # 교체 전 news 별칭이 가리키던 인덱스
+    removed_indices = models.JSONField(default=list, blank=True)   # 교체 후 정리한 예전 버전 인덱스
+
+    class Meta:
+        db_table = 'search_reindex_job'
+        ordering = ['-id']
+
+
+# 검색 인덱스 세대 번호 (한 행). 기사가 ES에 들어가거나 빠질 때마다 올리고, 검색 결과 캐시 키에 넣는다
+# ORM 저장은 search_sync flush에서, 컨슈머의 raw INSERT는 컨슈머가 직접 UPDATE로 올린다
+class SearchGeneration(models.Model):
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'search_generation'
+
+
+# 검색어 로그 (날짜별 검색 횟수). 검색 캐시 미리 채우기(prewarm_search_cache)에 사용
+class SearchQueryStat(models.Model):
+    query = models.CharField(max_length=200)  # 정규화한 검색어 (공백 정리, 소문자)
+    category = models.CharField(max_length=50, blank=True)
+    sort = models.CharField(max_length=10, blank=True)
+    mode = models.CharField(max_length=10, blank=True)
+    size = models.IntegerField()
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'search_query_stat'
+        unique_together = ('query', 'category', 'sort', 'mode', 'size', 'day')
+        indexes = [
+            models.Index(fields=['day', '-count'], name='search_query_stat_day_idx'),
+        ]
@@ -0,0 +1,79 @@
+"""
+(write_date, id) 키셋(커서) 페이지네이션
+
+OFFSET 없이 "마지막으로 본 기사보다 오래된 기사"만 인덱스로 읽기 때문에
+몇 번째 페이지든 조회 비용이 같다. 커서는 마지막 기사의 (write_date, id)를 인코딩한 문자열.
+"""
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(article):
+    payload = json.dumps({'d': article.write_date.isoformat(), 'i': article.id})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        write_date = parse_datetime(payload['d'])
+        article_id = int(payload['i'])
+    except Exception as e:
+        raise InvalidCursor(f"잘못된 커서입니다: {e}")
+    if write_date is None:
+        raise InvalidCursor("잘못된 커서입니다.")
+    return write_date, article_id
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE):
+    try:
+        size = int(value) if value else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_page(queryset, cursor=None, size=DEFAULT_PAGE_SIZE):
+    """
+    write_date, id 내림차순으로 size개를 가져온다.
+    반환값: (기사 목록, 다음 페이지 커서 또는 None)
+    """
+    queryset = queryset.order_by('-write_date', '-id')
+    if cursor:
+        write_date, article_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(write_date__lt=write_date) | Q(write_date=write_date, id__lt=article_id)
+        )
+
+    # 다음 페이지 존재 여부 확인을 위해 1개 더 읽는다
+    items = list(queryset[:size + 1])
+    next_cursor = encode_cursor(items[size - 1]) if len(items) > size else None
+    return items[:size], next_cursor
+
+
+def encode_search_cursor(search_after, pit_id=None):
+    """검색 다음 페이지 커서: 마지막 결과의 sort 값 + point-in-time id"""
+    payload = json.dumps({'a': search_after, 'p': pit_id})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_search_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        search_after = payload['a']
+        pit_id = payload.get('p')
+    except Exception as e:
+        raise InvalidCursor(f"잘못된 커서입니다: {e}")
+    if not isinstance(search_after, list):
+        raise InvalidCursor("잘못된 커서입니다.")
+    return search_after, pit_id
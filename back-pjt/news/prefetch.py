@@ -0,0 +1,29 @@
+"""
+기사 시리얼라이저용 프리페치
+
+좋아요 수는 NewsArticle.like_count 컬럼을 그대로 쓰고,
+현재 유저의 좋아요/북마크 여부는 요청당 한 번씩 기사 id 집합으로 조회해 context로 넘긴다.
+목록 크기와 상관없이 쿼리 수가 일정하다.
+"""
+from .models import ArticleLike, ArticleBookmark
+
+
+def article_context(request, articles):
+    """
+    기사 목록 직렬화용 context 생성 (ArticleDetailSerializer의 is_like/is_bookmarked용).
+    현재 유저가 좋아요/북마크한 기사 id 집합을 쿼리 한 번씩으로 조회한다.
+    """
+    context = {'request': request}
+    user = getattr(request, 'user', None)
+    ids = [article.id for article in articles]
+    if user is not None and user.is_authenticated and ids:
+        context['liked_ids'] = set(
+            ArticleLike.objects.filter(user=user, article_id__in=ids).values_list('article_id', flat=True)
+        )
+        context['bookmarked_ids'] = set(
+            ArticleBookmark.objects.filter(user=user, article_id__in=ids).values_list('article_id', flat=True)
+        )
+    else:
+        context['liked_ids'] = set()
+        context['bookmarked_ids'] = set()
+    return context
@@ -0,0 +1,104 @@
+"""
+유저 취향 벡터(UserTasteProfile) 증분 갱신
+
+personalized_recommendation의 기존 계산과 같은 의미를 유지한다.
+- like_sum: 좋아요한 기사 임베딩의 합
+- read_sum: 좋아요하지 않은 기사의 조회 기록마다 임베딩을 더한 합 (조회 기록은 (유저, 기사, 날짜)당 한 행이라 다른 날 다시 보면 다시 더함)
+따라서 좋아요가 생기면 그 기사의 조회분을 read_sum에서 빼고, 좋아요가 취소되면 다시 더한다.
+조회 기록의 범위는 article_read에 남아 있는 행이다. 보관 기간이 지나 지우는 행(read_partitions.drop_expired)은
+remove_expired_reads로 빼므로 증분 갱신과 rebuild_taste_profiles는 항상 같은 행을 센다.
+"""
+import numpy as np
+from django.db import transaction
+
+from .embeddings import decode_embedding, encode_embedding
+from .models import NewsArticle, ArticleLike, ArticleRead, UserTasteProfile
+
+
+def article_vector(article_id):
+    """기사 임베딩만 읽어온다 (임베딩이 없으면 None)"""
+    raw = NewsArticle.objects.filter(pk=article_id).values_list('embedding', flat=True).first()
+    try:
+        return decode_embedding(raw)
+    except Exception as e:
+        print(f"임베딩 변환 실패 {article_id}: {e}")
+        return None
+
+
+def _add(raw, delta):
+    current = decode_embedding(raw) if raw is not None else np.zeros_like(delta)
+    return encode_embedding(current + delta)
+
+
+def _apply_sums(user_id, like_sum=None, like_count=0, read_sum=None, read_count=0):
+    """프로필 누적합/개수에 더한다 (행 잠금으로 동시 갱신 보호)"""
+    with transaction.atomic():
+        profile, _ = UserTasteProfile.objects.select_for_update().get_or_create(user_id=user_id)
+        if like_count:
+            profile.like_sum = _add(profile.like_sum, like_sum)
+            profile.like_count += like_count
+        if read_count:
+            profile.read_sum = _add(profile.read_sum, read_sum)
+            profile.read_count += read_count
+        profile.save()
+
+
+def apply_delta(user_id, vector, like_count=0, read_count=0):
+    """프로필 누적합에 like_count * vector, read_count * vector를 더한다"""
+    if vector is None or (like_count == 0 and read_count == 0):
+        return
+    vector = np.asarray(vector, dtype=np.float32)
+    _apply_sums(user_id, vector * like_count, like_count, vector * read_count, read_count)
+
+
+def _read_count(user_id, article_id):
+    # article_read에 남아 있는 조회 기록 전체 (rebuild_taste_profiles와 같은 범위)
+    return ArticleRead.objects.filter(user_id=user_id, article_id=article_id).count()
+
+
+def _is_liked(user_id, article_id):
+    return ArticleLike.objects.filter(user_id=user_id, article_id=article_id).exists()
+
+
+def record_like(user_id, article_id, vector=None):
+    """좋아요 추가: 좋아요 합에 더하고, 이 기사의 조회분은 조회 합에서 뺀다"""
+    vector = article_vector(article_id) if vector is None else vector
+    reads = _read_count(user_id, article_id)
+    apply_delta(user_id, vector, like_count=1, read_count=-reads)
+
+
+def remove_like(user_id, article_id, vector=None):
+    """좋아요 취소: record_like의 반대"""
+    vector = article_vector(article_id) if vector is None else vector
+    reads = _read_count(user_id, article_id)
+    apply_delta(user_id, vector, like_count=-1, read_count=reads)
+
+
+def record_reads(user_id, article_id, count=1, vector=None):
+    """조회 추가 (count가 음수면 삭제). 좋아요한 기사의 조회는 누적하지 않는다"""
+    if _is_liked(user_id, article_id):
+        return
+    vector = article_vector(article_id) if vector is None else vector
+    apply_delta(user_id, vector, read_count=count)
+
+
+def remove_expired_reads(user_id, counts):
+    """
+    보관 기간이 지나 지울 조회 기록 {기사 id: 행 수}를 조회 합에서 뺀다 (좋아요한 기사는 원래 조회 합에 없다).
+    임베딩이 없는 기사는 처음부터 더해지지 않았으므로 건너뛴다.
+    """
+    liked = set(
+        ArticleLike.objects.filter(user_id=user_id, article_id__in=list(counts)).values_list('article_id', flat=True)
+    )
+    embeddings = NewsArticle.objects.filter(id__in=[a for a in counts if a not in liked]).exclude(embedding=None)
+    read_sum, read_count = None, 0
+    for article_id, raw in embeddings.values_list('id', 'embedding'):
+        try:
+            vector = decode_embedding(raw) * counts[article_id]
+        except Exception as e:
+            print(f"임베딩 변환 실패 {article_id}: {e}")
+            continue
+        read_sum = vector if read_sum is None else read_sum + vector
+        read_count += counts[article_id]
+    if read_count:
+        _apply_sums(user_id, read_sum=-read_sum, read_count=-read_count)
@@ -0,0 +1,72 @@
+"""
+검색어 임베딩 (하이브리드 검색용)
+
+기사 임베딩과 같은 모델(text-embedding-3-small, 컨슈머 preprocess.transform_to_embedding)로 검색어를 변환한다.
+같은 검색어는 다시 API를 부르지 않도록 두 단계로 캐시한다.
+- 워커 프로세스 LRU (QUERY_EMBEDDING_LRU_SIZE개)
+- settings.CACHES (CACHE_TTL['query_embedding'], 워커끼리 공유. news.embeddings 바이너리 포맷으로 저장)
+"""
+import os
+import re
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+from .cache import get_or_build, make_key
+from .embeddings import decode_embedding, encode_embedding
+from .lru import LRUCache
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+_client = None
+_client_lock = threading.Lock()
+_lru = LRUCache('query_embedding_lru', maxsize=settings.QUERY_EMBEDDING_LRU_SIZE)
+
+
+def get_openai_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            from openai import OpenAI
+            _client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    return _client
+
+
+def normalize_query(query):
+    """공백만 다른 검색어는 같은 임베딩을 쓴다"""
+    return re.sub(r'\s+', ' ', query).strip()
+
+
+def request_embedding(text):
+    with metrics.timed('search.query_embedding.request'):
+        response = get_openai_client().embeddings.create(input=text, model=EMBEDDING_MODEL)
+    return encode_embedding(response.data[0].embedding)
+
+
+def embedding_key(text):
+    return make_key('query-embedding', EMBEDDING_MODEL, text)
+
+
+def embed_query(query):
+    """검색어 임베딩(float32 배열) 반환"""
+    text = normalize_query(query)
+    vector = _lru.get(text)
+    if vector is not None:
+        return vector
+
+    key = embedding_key(text)
+    vector = decode_embedding(get_or_build('query_embedding', key, lambda: request_embedding(text)))
+    _lru.set(text, vector)
+    return vector
+
+
+def forget_query(query):
+    """두 단계 캐시에서 검색어 임베딩을 지운다 (다음 embed_query는 API를 다시 부른다)"""
+    text = normalize_query(query)
+    _lru.delete(text)
+    try:
+        cache.delete(embedding_key(text))
+    except Exception as e:
+        print(f"캐시 삭제 실패: {e}")
@@ -0,0 +1,102 @@
+"""
+조회 기록(ArticleRead) 쓰기 지연(write-behind)
+
+조회 기록은 (유저, 기사, 날짜)당 한 행만 저장한다 (같은 날 다시 본 것은 버린다).
+article_detail_view는 조회 기록을 바로 INSERT 하지 않고 버퍼에 넣는다.
+버퍼는 ARTICLE_READ_FLUSH_SIZE개가 차거나 ARTICLE_READ_FLUSH_SECONDS가 지나면 INSERT 한 번으로 저장하고,
+워커 종료 시에도 남은 기록을 저장한다. 버퍼가 가득 차서 자리가 나지 않으면 그 요청만 바로 INSERT 한다.
+한 번에 넣는 INSERT는 post_save 시그널을 보내지 않으므로 취향 벡터/대시보드 롤업은 여기서 직접 갱신한다.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from . import profiles, rollups
+from .buffers import QueueBuffer
+from .models import ArticleRead
+
+# INSERT 한 번에 넣는 행 수 (바인드 파라미터 수 제한)
+INSERT_BATCH_SIZE = 1000
+INSERT_READS_SQL = """
+    INSERT INTO article_read (user_id, article_id, read_at, read_date)
+    VALUES {values}
+    ON CONFLICT DO NOTHING
+    RETURNING user_id, article_id, read_date
+"""
+
+
+def first_reads(reads):
+    """(유저, 기사, 날짜)당 첫 조회만 남긴다"""
+    first = {}
+    for read in reads:
+        first.setdefault((read.user_id, read.article_id, read.read_date), read)
+    return first
+
+
+def insert_reads(reads):
+    """
+    조회 기록을 INSERT ... ON CONFLICT DO NOTHING RETURNING 한 번으로 저장하고 실제로 저장된 것만 돌려준다.
+    이미 저장된 조회(다른 워커가 먼저 저장한 것 포함)는 유니크 제약으로 건너뛴다.
+    """
+    first = first_reads(reads)
+    if not first:
+        return []
+    read_at_field = ArticleRead._meta.get_field('read_at')
+    read_date_field = ArticleRead._meta.get_field('read_date')
+
+    rows = list(first.values())
+    inserted = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            batch = rows[start:start + INSERT_BATCH_SIZE]
+            params = []
+            for read in batch:
+                params.extend([
+                    read.user_id,
+                    read.article_id,
+                    read_at_field.get_db_prep_value(read.read_at, connection),
+                    read_date_field.get_db_prep_value(read.read_date, connection),
+                ])
+            cursor.execute(INSERT_READS_SQL.format(values=', '.join(['(%s, %s, %s, %s)'] * len(batch))), params)
+            inserted.extend(cursor.fetchall())
+    return [first[(user_id, article_id, read_date_field.to_python(read_date))] for user_id, article_id, read_date in inserted]
+
+
+def write_reads(reads):
+    # 취향 벡터/대시보드 롤업에는 실제로 저장된 조회만 반영한다
+    reads = insert_reads(reads)
+    if not reads:
+        return
+
+    try:
+        for (user_id, article_id), count in Counter((r.user_id, r.article_id) for r in reads).items():
+            profiles.record_reads(user_id, article_id, count=count)
+    except Exception as e:
+        print(f"조회 기록 취향 벡터 반영 실패: {e}")
+    try:
+        rollups.record_reads(reads)
+    except Exception as e:
+        print(f"조회 기록 대시보드 롤업 반영 실패: {e}")
+
+
+read_buffer = QueueBuffer(
+    'article-read',
+    write_reads,
+    flush_interval=settings.ARTICLE_READ_FLUSH_SECONDS,
+    max_items=settings.ARTICLE_READ_FLUSH_SIZE,
+    max_pending=settings.ARTICLE_READ_MAX_PENDING,
+    block_timeout=settings.ARTICLE_READ_BLOCK_SECONDS,
+)
+
+
+def record_read(user, article):
+    """조회 기록 남기기 (ARTICLE_READ_WRITE_BEHIND가 꺼져 있거나 버퍼가 가득 차면 바로 INSERT)"""
+    read_at = timezone.now()
+    read_date = timezone.localdate(read_at)
+    if settings.ARTICLE_READ_WRITE_BEHIND:
+        read = ArticleRead(user_id=user.id, article_id=article.id, read_at=read_at, read_date=read_date)
+        if read_buffer.add(read):
+            return
+    ArticleRead.objects.get_or_create(user=user, article=article, read_date=read_date, defaults={'read_at': read_at})
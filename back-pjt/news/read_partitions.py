@@ -0,0 +1,143 @@
+"""
+article_read 월별 파티션 관리와 보관 기간
+
+PostgreSQL에서 article_read는 read_date 기준 RANGE 파티션 테이블이다 (0016 마이그레이션).
+- article_read_yYYYYmMM: 한 달치 파티션, article_read_default: 파티션이 없는 날짜용
+- 보관 기간(ARTICLE_READ_RETENTION_MONTHS)이 지난 달의 파티션은 통째로 삭제한다.
+  날짜별 조회 수는 대시보드 롤업(UserDailyReadStat)에 남아 있으므로 대시보드에는 영향이 없다.
+취향 벡터와 키워드 롤업은 article_read에 남아 있는 행을 범위로 하므로, 행을 지우기 전에 그 몫을 뺀다 (expire_reads).
+다른 DB(로컬 sqlite 등)에서는 파티션 없이 오래된 행만 지운다.
+"""
+import re
+from datetime import date
+from itertools import groupby
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+
+from . import profiles, rollups
+from .models import ArticleRead
+
+PARENT_TABLE = 'article_read'
+DEFAULT_PARTITION = 'article_read_default'
+PARTITION_RE = re.compile(r'^article_read_y(\d{4})m(\d{2})$')
+
+
+def add_months(day, months):
+    """day가 속한 달에서 months만큼 이동한 달의 1일"""
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'article_read_y{month.year:04d}m{month.month:02d}'
+
+
+def retention_cutoff(today=None):
+    """이 날짜 이전의 조회 기록은 보관 기간이 지난 것 (이번 달 포함 ARTICLE_READ_RETENTION_MONTHS개월 보관)"""
+    today = today or timezone.localdate()
+    return add_months(today, 1 - settings.ARTICLE_READ_RETENTION_MONTHS)
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [PARENT_TABLE])
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def monthly_partitions():
+    """{파티션 이름: 그 달의 1일}"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [PARENT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            partitions[name] = date(int(match.group(1)), int(match.group(2)), 1)
+    return partitions
+
+
+def ensure_partitions(months_ahead=2, dry_run=False):
+    """이번 달부터 months_ahead개월 뒤까지 파티션을 만든다. 반환값: 새로 만든 파티션 이름 목록"""
+    if not is_partitioned():
+        return []
+
+    existing = monthly_partitions()
+    this_month = add_months(timezone.localdate(), 0)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(this_month, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        if not dry_run:
+            with connection.cursor() as cursor:
+                # default 파티션에 이미 그 달의 행이 있으면 실패하므로 미리 만들어 두는 것이 중요하다
+                cursor.execute(
+                    f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                    f"FOR VALUES FROM (%s) TO (%s)",
+                    [month, add_months(month, 1)],
+                )
+        created.append(name)
+    return created
+
+
+def expire_reads(cutoff):
+    """cutoff 이전 조회 기록의 몫을 취향 벡터/키워드 롤업에서 뺀다 (날짜별 조회 수 롤업은 남긴다)"""
+    rows = (
+        ArticleRead.objects
+        .filter(read_date__lt=cutoff)
+        .values('user_id', 'article_id')
+        .annotate(n=Count('id'))
+        .order_by('user_id')
+        .values_list('user_id', 'article_id', 'n')
+    )
+    for user_id, user_rows in groupby(rows.iterator(), key=lambda row: row[0]):
+        counts = {article_id: n for _, article_id, n in user_rows}
+        profiles.remove_expired_reads(user_id, counts)
+        rollups.remove_expired_reads(user_id, list(counts), cutoff)
+
+
+def drop_expired(dry_run=False):
+    """
+    보관 기간이 지난 조회 기록 삭제 (호출하는 쪽에서 트랜잭션으로 묶는다).
+    반환값: (삭제한 파티션 이름 목록, 그 밖에 지운 행 수)
+    post_delete 시그널을 보내지 않으므로 지우기 전에 expire_reads로 취향 벡터/키워드 롤업을 맞춘다.
+    """
+    cutoff = retention_cutoff()
+    if not dry_run:
+        expire_reads(cutoff)
+
+    if not is_partitioned():
+        with connection.cursor() as cursor:
+            if dry_run:
+                cursor.execute(f"SELECT COUNT(*) FROM {PARENT_TABLE} WHERE read_date < %s", [cutoff])
+                return [], cursor.fetchone()[0]
+            cursor.execute(f"DELETE FROM {PARENT_TABLE} WHERE read_date < %s", [cutoff])
+            return [], cursor.rowcount
+
+    expired = sorted(name for name, month in monthly_partitions().items() if add_months(month, 1) <= cutoff)
+    with connection.cursor() as cursor:
+        if dry_run:
+            cursor.execute(f"SELECT COUNT(*) FROM {DEFAULT_PARTITION} WHERE read_date < %s", [cutoff])
+            return expired, cursor.fetchone()[0]
+
+        for name in expired:
+            cursor.execute(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+            cursor.execute(f"DROP TABLE {name}")
+        cursor.execute(f"DELETE FROM {DEFAULT_PARTITION} WHERE read_date < %s", [cutoff])
+        return expired, cursor.rowcount
@@ -0,0 +1,92 @@
+"""
+대시보드 롤업 테이블 증분 갱신
+
+user_dashboard가 유저의 전체 좋아요/조회 기록을 매번 집계하지 않도록 미리 세어 둔다.
+- UserCategoryStat: 좋아요한 기사의 카테고리별 개수
+- UserKeywordStat: 읽은 기사(기사당 한 번)의 키워드별 개수
+- UserDailyReadStat: 날짜별로 읽은 서로 다른 기사 수
+기사 카테고리/키워드가 나중에 바뀐 경우는 rebuild_dashboard_rollups 명령어로 보정한다.
+키워드 통계의 범위는 article_read에 남아 있는 조회 기록이다 (보관 기간이 지나 지우는 행은 remove_expired_reads로 뺀다).
+날짜별 조회 수는 조회 기록이 지워진 뒤에도 남긴다.
+"""
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import NewsArticle, ArticleRead, UserCategoryStat, UserKeywordStat, UserDailyReadStat
+
+KEYWORD_MAX_LENGTH = UserKeywordStat._meta.get_field('keyword').max_length
+
+
+def bump(model, delta, **key):
+    """key에 해당하는 롤업 행의 count에 delta를 더한다 (없으면 생성)"""
+    if not delta:
+        return
+    if model.objects.filter(**key).update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=delta, **key)
+    except IntegrityError:
+        # 동시에 다른 요청이 먼저 만든 경우
+        model.objects.filter(**key).update(count=F('count') + delta)
+
+
+def _article_meta(article_id):
+    return NewsArticle.objects.filter(pk=article_id).values_list('category', 'keywords').first()
+
+
+def _bump_keywords(user_id, keywords, delta):
+    # 한 기사에 같은 키워드가 여러 번 있어도 한 번만 센다 (news.dashboard.READ_KEYWORDS_SQL과 같은 규칙)
+    for keyword in set(keywords or []):
+        bump(UserKeywordStat, delta, user_id=user_id, keyword=str(keyword)[:KEYWORD_MAX_LENGTH])
+
+
+def record_like(user_id, article_id, delta=1):
+    """좋아요 추가(delta=1)/취소(delta=-1)를 카테고리 통계에 반영"""
+    meta = _article_meta(article_id)
+    if meta is None:
+        return
+    bump(UserCategoryStat, delta, user_id=user_id, category=meta[0])
+
+
+def record_reads(reads, delta=1):
+    """
+    조회 기록 추가(delta=1)/삭제(delta=-1)를 반영.
+    reads는 이미 저장(또는 삭제)된 ArticleRead 목록 (read_events.insert_reads 한 묶음일 수 있다).
+    조회 기록은 (유저, 기사, 날짜)당 한 행이므로 날짜 통계는 행마다 더하고,
+    키워드 통계는 그 기사의 다른 날 조회가 남아 있지 않을 때만 더한다.
+    """
+    per_day = Counter((read.user_id, read.read_date) for read in reads)
+    for (user_id, day), count in per_day.items():
+        bump(UserDailyReadStat, delta * count, user_id=user_id, day=day)
+
+    batch_dates = defaultdict(set)
+    for read in reads:
+        batch_dates[(read.user_id, read.article_id)].add(read.read_date)
+
+    for (user_id, article_id), days in batch_dates.items():
+        read_before = (
+            ArticleRead.objects
+            .filter(user_id=user_id, article_id=article_id)
+            .exclude(read_date__in=days)
+            .exists()
+        )
+        if read_before:
+            continue
+        meta = _article_meta(article_id)
+        if meta is not None:
+            _bump_keywords(user_id, meta[1], delta)
+
+
+def remove_expired_reads(user_id, article_ids, cutoff):
+    """보관 기간(cutoff 이전)이 지나 지울 조회 기록 중, cutoff 이후 조회가 없는 기사의 키워드를 뺀다"""
+    remaining = set(
+        ArticleRead.objects
+        .filter(user_id=user_id, article_id__in=article_ids, read_date__gte=cutoff)
+        .values_list('article_id', flat=True)
+    )
+    gone = [article_id for article_id in article_ids if article_id not in remaining]
+    for _, keywords in NewsArticle.objects.filter(id__in=gone).values_list('id', 'keywords'):
+        _bump_keywords(user_id, keywords, -1)
@@ -0,0 +1,170 @@
+"""
+검색 결과 캐시
+
+첫 페이지 검색 결과를 (정규화한 검색어, 카테고리, 정렬, 모드, 크기)와 검색 인덱스 세대 번호로 캐시한다.
+세대 번호(SearchGeneration)는 기사가 ES에 들어가거나 빠질 때 올라가므로(search_sync flush, 재인덱싱 별칭 교체,
+컨슈머 INSERT) 그 전 결과는 새 키에 밀려 자연히 버려진다. 세대 번호는 워커마다 SEARCH_GENERATION_CHECK_SECONDS 동안 재사용한다.
+
+검색어는 CounterBuffer로 모아 날짜별 SearchQueryStat에 더하고, 서빙 워커의 백그라운드 스레드가
+SEARCH_PREWARM_SECONDS마다 최근 많이 검색된 검색어의 결과를 현재 세대로 미리 계산해 둔다 (start_prewarm, 첫 검색 요청 때 시작).
+워커가 직접 채우므로 locmem 캐시에서도 그 워커의 요청이 혜택을 본다.
+prewarm_search_cache 명령어(cron 등)는 redis/file처럼 워커끼리 공유하는 캐시 백엔드일 때만 쓸 수 있다.
+- 히트율: cache.search.hit / cache.search.miss
+- 아낀 시간: 히트마다 그 결과를 처음 만들 때 걸린 시간을 search.cache.saved_ms에 더한다
+"""
+import os
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from . import metrics, rollups
+from .buffers import CounterBuffer
+from .cache import get_or_build, make_key
+from .models import SearchGeneration, SearchQueryStat
+from .query_embeddings import normalize_query
+from .search_results import first_page
+
+GENERATION_ID = 1
+QUERY_MAX_LENGTH = SearchQueryStat._meta.get_field('query').max_length
+
+_generation_lock = threading.Lock()
+_generation = {'value': None, 'expires': 0.0}
+
+
+def search_generation():
+    now = time.monotonic()
+    with _generation_lock:
+        if _generation['value'] is not None and _generation['expires'] > now:
+            return _generation['value']
+    value = SearchGeneration.objects.filter(id=GENERATION_ID).values_list('value', flat=True).first() or 0
+    with _generation_lock:
+        _generation['value'] = value
+        _generation['expires'] = now + settings.SEARCH_GENERATION_CHECK_SECONDS
+    return value
+
+
+def bump_search_generation():
+    if not SearchGeneration.objects.filter(id=GENERATION_ID).update(value=F('value') + 1):
+        SearchGeneration.objects.get_or_create(id=GENERATION_ID, defaults={'value': 1})
+    with _generation_lock:
+        _generation['expires'] = 0.0
+
+
+def normalize_search_query(query):
+    return normalize_query(query).lower()[:QUERY_MAX_LENGTH]
+
+
+def search_key(query, category=None, sort_by=None, size=10, hybrid=False):
+    return make_key(
+        'search', search_generation(),
+        q=normalize_search_query(query), category=category or '', sort=sort_by or '', size=size, hybrid=hybrid,
+    )
+
+
+def cached_first_page(query, category=None, sort_by=None, size=10, hybrid=False):
+    """첫 페이지 검색 결과 (캐시에 없으면 검색 후 저장)"""
+    built = []
+
+    def build():
+        start = time.perf_counter()
+        data = first_page(query, category=category, sort_by=sort_by, size=size, hybrid=hybrid)
+        built.append(time.perf_counter() - start)
+        return {'data': data, 'build_ms': built[0] * 1000}
+
+    entry = get_or_build('search', search_key(query, category, sort_by, size, hybrid), build)
+    if built:
+        metrics.observe('search.cache.build', built[0])
+    else:
+        metrics.incr('search.cache.saved_ms', round(entry['build_ms'], 3))
+    return entry['data']
+
+
+def write_query_log(counts):
+    """{(검색어, 카테고리, 정렬, 모드, 크기, 날짜): 횟수}를 SearchQueryStat에 더한다"""
+    for (query, category, sort_by, mode, size, day), count in counts.items():
+        rollups.bump(SearchQueryStat, count, query=query, category=category, sort=sort_by, mode=mode, size=size, day=day)
+
+
+query_log = CounterBuffer(
+    'search-query-log',
+    write_query_log,
+    flush_interval=settings.SEARCH_QUERY_LOG_FLUSH_SECONDS,
+    max_items=settings.SEARCH_QUERY_LOG_FLUSH_SIZE,
+)
+
+
+def log_query(query, category=None, sort_by=None, size=10, hybrid=False):
+    query = normalize_search_query(query)
+    if query:
+        query_log.add((query, category or '', sort_by or '', 'hybrid' if hybrid else '', size, timezone.localdate()))
+
+
+def top_queries(limit=100, days=1):
+    """최근 days일 동안 많이 검색된 (검색어, 카테고리, 정렬, 모드, 크기)"""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    return list(
+        SearchQueryStat.objects
+        .filter(day__gte=since)
+        .values('query', 'category', 'sort', 'mode', 'size')
+        .annotate(total=Sum('count'))
+        .order_by('-total')[:limit]
+    )
+
+
+def prewarm(limit=100, days=1):
+    """많이 검색된 검색어의 첫 페이지 결과를 현재 세대로 미리 캐시. 반환값: (검색어 수, 새로 계산한 수)"""
+    before = metrics.snapshot()['counters'].get('cache.search.miss', 0)
+    queries = top_queries(limit=limit, days=days)
+    for row in queries:
+        try:
+            cached_first_page(
+                row['query'], category=row['category'] or None, sort_by=row['sort'] or None,
+                size=row['size'], hybrid=row['mode'] == 'hybrid',
+            )
+        except Exception as e:
+            print(f"검색 캐시 미리 채우기 실패 ({row['query']}): {e}")
+    built = metrics.snapshot()['counters'].get('cache.search.miss', 0) - before
+    return len(queries), built
+
+
+_prewarm_lock = threading.Lock()
+_prewarm_pid = None
+
+
+def _prewarm_loop():
+    while True:
+        time.sleep(settings.SEARCH_PREWARM_SECONDS)
+        try:
+            with metrics.timed('search.prewarm'):
+                expire_query_log(settings.SEARCH_QUERY_LOG_DAYS)
+                prewarm(limit=settings.SEARCH_PREWARM_TOP, days=settings.SEARCH_PREWARM_DAYS)
+        except Exception as e:
+            print(f"검색 캐시 미리 채우기 실패: {e}")
+        finally:
+            # 백그라운드 스레드의 DB 연결은 요청 사이클이 닫아주지 않는다
+            connections.close_all()
+
+
+def start_prewarm():
+    """
+    이 워커 프로세스에서 검색 캐시 미리 채우기 스레드를 시작 (이미 있으면 무시, SEARCH_PREWARM_SECONDS가 0이면 끔).
+    fork된 워커에는 스레드가 따라오지 않으므로 pid가 바뀌면 새로 띄운다.
+    """
+    global _prewarm_pid
+    pid = os.getpid()
+    if not settings.SEARCH_PREWARM_SECONDS or _prewarm_pid == pid:
+        return
+    with _prewarm_lock:
+        if _prewarm_pid == pid:
+            return
+        threading.Thread(target=_prewarm_loop, name='search-prewarm', daemon=True).start()
+        _prewarm_pid = pid
+
+
+def expire_query_log(keep_days):
+    return SearchQueryStat.objects.filter(day__lt=timezone.localdate() - timedelta(days=keep_days)).delete()[0]
@@ -0,0 +1,269 @@
+"""
+Elasticsearch 전체 재인덱싱 (블루/그린)
+
+검색은 news 별칭을 거친다. 재인덱싱은 새 버전 인덱스(news_<생성 시각>)를 대량 색인용 설정
+(refresh 끔, 레플리카 0)으로 만들어 채우고, 설정을 되돌린 뒤 별칭을 한 번에 옮긴다.
+그동안 검색과 실시간 인덱싱은 이전 인덱스에서 계속되고, 색인 중 바뀐 기사(updated_at)는 교체 직전에 다시 반영한다.
+
+기사는 id 순서로 .iterator(chunk_size)로 흘려보내며(전체를 메모리에 올리지 않음)
+helpers.parallel_bulk로 여러 스레드가 bulk 요청을 나눠 보낸다.
+진행 상황은 청크마다 SearchReindexJob에 저장한다. 문서는 id 순서로 결과가 돌아오므로
+처음 실패한 문서 직전까지를 last_id로 남기고, 실패/중단된 작업은 같은 인덱스에 그 다음 id부터 이어서 실행한다.
+웹 요청에서는 start_background로 백그라운드 스레드에서 실행하고 작업 id만 돌려준다.
+
+색인 중 바뀐 기사
+- ORM 저장/삭제: search_sync가 진행 중인 작업의 인덱스(building_index)에도 같이 보낸다.
+  전체 색인은 create로 보내므로 먼저 들어간 최신 문서를 예전 값으로 덮어쓰지 않는다.
+- 컨슈머 INSERT/UPSERT(raw SQL, updated_at 설정): 교체 직전에 started_at 이후 것을, 교체 직후에 그 사이 것을 다시 보낸다.
+- 전체 색인이 읽은 뒤 삭제된 기사: 교체 직전에 새 인덱스의 id와 DB의 id를 비교해 지운다.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from elasticsearch import helpers
+
+from . import metrics
+from .models import NewsArticle, SearchReindexJob
+from .search_cache import bump_search_generation
+from .utils import (
+    article_doc_id, article_document, get_es_client, new_index_name,
+    create_build_index, finish_build_index, swap_news_alias, prune_news_indices,
+)
+
+DOC_FIELDS = ('id', 'title', 'content', 'writer', 'category', 'write_date', 'keywords', 'url', 'views')
+
+# 진행 중인 작업이 이 시간 동안 갱신되지 않으면 죽은 것으로 본다
+STALE_AFTER = timedelta(minutes=10)
+# 교체 단계(publish)처럼 청크 저장이 없는 구간에서 updated_at을 갱신하는 간격 (초)
+HEARTBEAT_SECONDS = 60
+
+_start_lock = threading.Lock()
+
+
+def article_actions(index_name, articles, chunk_size, op_type='index'):
+    for article in articles.only(*DOC_FIELDS).iterator(chunk_size=chunk_size):
+        yield {
+            '_op_type': op_type,
+            '_index': index_name,
+            '_id': article_doc_id(article.id),
+            '_source': article_document(article),
+        }
+
+
+def create_job():
+    """작업과 빈 새 인덱스를 같이 만든다 (search_sync가 작업을 보고 바로 이 인덱스에 쓸 수 있도록)"""
+    job = SearchReindexJob.objects.create(index_name=new_index_name())
+    create_build_index(get_es_client(), job.index_name)
+    return job
+
+
+def building_index():
+    """진행 중인 재인덱싱 작업의 인덱스 이름 (없으면 None)"""
+    job = SearchReindexJob.objects.filter(status=SearchReindexJob.RUNNING).first()
+    if job and is_active(job):
+        return job.index_name
+    return None
+
+
+class Heartbeat:
+    """
+    오래 걸리는 단계 중간에 호출해 작업의 updated_at을 HEARTBEAT_SECONDS마다 저장한다.
+    그래야 교체 단계가 STALE_AFTER보다 길어져도 다른 요청이 죽은 작업으로 보고 새로 시작하지 않는다.
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.last = time.monotonic()
+
+    def __call__(self, force=False):
+        now = time.monotonic()
+        if force or now - self.last >= HEARTBEAT_SECONDS:
+            self.job.save(update_fields=['updated_at'])
+            self.last = now
+
+
+def is_conflict(info):
+    """create가 이미 있는 문서(search_sync가 먼저 넣은 최신 문서 등)와 부딪힌 경우"""
+    return info.get('status') == 409
+
+
+def run_reindex(job, chunk_size=500, workers=4, progress=None):
+    """
+    job.last_id 다음 기사부터 job.index_name에 인덱싱하고, 다 채우면 news 별칭을 옮긴다.
+    progress(job, processed, elapsed)는 청크마다 호출된다.
+    """
+    es = get_es_client()
+    if not es.indices.exists(index=job.index_name):
+        create_build_index(es, job.index_name)
+
+    job.status = SearchReindexJob.RUNNING
+    job.failed = 0
+    job.error = ''
+    job.finished_at = None
+    job.previous_indices = []
+    job.removed_indices = []
+    job.total = NewsArticle.objects.count()
+    job.save()
+
+    start = time.perf_counter()
+    processed = 0
+    contiguous = True  # 아직 실패 없이 id 순서대로 성공 중인지
+    remaining = NewsArticle.objects.filter(id__gt=job.last_id).order_by('id')
+    try:
+        results = helpers.parallel_bulk(
+            es,
+            article_actions(job.index_name, remaining, chunk_size, op_type='create'),
+            thread_count=workers,
+            chunk_size=chunk_size,
+            raise_on_error=False,
+            raise_on_exception=False,
+        )
+        for ok, item in results:
+            processed += 1
+            info = next(iter(item.values()))
+            ok = ok or is_conflict(info)
+            if ok and contiguous:
+                job.last_id = int(info['_id'])
+                job.indexed += 1
+            elif not ok:
+                contiguous = False
+                job.failed += 1
+                if not job.error:
+                    job.error = str(info.get('error') or info)[:1000]
+
+            if processed % chunk_size == 0:
+                job.save(update_fields=['last_id', 'indexed', 'failed', 'error', 'updated_at'])
+                if progress:
+                    progress(job, processed, time.perf_counter() - start)
+
+        if job.failed:
+            job.status = SearchReindexJob.FAILED
+        else:
+            job.previous_indices, job.removed_indices = publish(es, job, chunk_size)
+            job.status = SearchReindexJob.DONE
+    except Exception as e:
+        job.status = SearchReindexJob.FAILED
+        job.error = str(e)[:1000]
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe('es.reindex', elapsed)
+        metrics.incr('es.reindex.docs', processed)
+        job.finished_at = timezone.now()
+        job.save()
+        if progress:
+            progress(job, processed, elapsed)
+    return job
+
+
+def resend_changed(es, index_name, since, chunk_size, heartbeat=None):
+    """컨슈머가 since 이후 넣거나 바꾼 기사(updated_at)를 index_name에 다시 보낸다"""
+    changed = NewsArticle.objects.filter(updated_at__gte=since).order_by('id')
+    for _ in helpers.streaming_bulk(
+        es, article_actions(index_name, changed, chunk_size), chunk_size=chunk_size
+    ):
+        if heartbeat:
+            heartbeat()
+
+
+def delete_missing(es, index_name, chunk_size, heartbeat=None):
+    """DB에 없는 기사의 문서를 index_name에서 삭제 (refresh된 뒤 호출). 반환값: 삭제한 문서 수"""
+    article_ids = set(NewsArticle.objects.values_list('id', flat=True).iterator(chunk_size=chunk_size * 10))
+    missing = []
+    for hit in helpers.scan(es, index=index_name, _source=False, size=chunk_size):
+        if int(hit['_id']) not in article_ids:
+            missing.append(hit['_id'])
+        if heartbeat:
+            heartbeat()
+    if missing:
+        helpers.bulk(
+            es,
+            ({'_op_type': 'delete', '_index': index_name, '_id': doc_id} for doc_id in missing),
+            chunk_size=chunk_size,
+            raise_on_error=False,
+        )
+        es.indices.refresh(index=index_name)
+    return len(missing)
+
+
+def publish(es, job, chunk_size):
+    """
+    색인 중 바뀐 기사를 다시 반영하고, 설정을 되돌린 뒤 별칭 교체, 오래된 버전 정리.
+    단계마다(긴 단계는 중간에도) 작업의 updated_at을 갱신해 진행 중으로 보이게 한다.
+    반환값: (이전 인덱스 목록, 삭제한 예전 버전 인덱스 목록)
+    """
+    heartbeat = Heartbeat(job)
+    caught_up_at = timezone.now()
+    resend_changed(es, job.index_name, job.started_at, chunk_size, heartbeat)
+    heartbeat(force=True)
+    finish_build_index(es, job.index_name)
+    heartbeat(force=True)
+    delete_missing(es, job.index_name, chunk_size, heartbeat)
+    heartbeat(force=True)
+    previous = swap_news_alias(es, job.index_name)
+    # 다시 보낸 뒤 교체 전까지 컨슈머가 이전 인덱스(별칭)에 쓴 기사
+    resend_changed(es, job.index_name, caught_up_at, chunk_size, heartbeat)
+    heartbeat(force=True)
+    bump_search_generation()
+    removed = prune_news_indices(es, keep=settings.ES_KEEP_OLD_INDICES)
+    return previous, removed
+
+
+def is_active(job):
+    return job.status == SearchReindexJob.RUNNING and job.updated_at > timezone.now() - STALE_AFTER
+
+
+def resumable_job():
+    """가장 최근 작업이 끝나지 않았으면(실패/중단) 그 작업"""
+    job = SearchReindexJob.objects.first()
+    if job and job.status != SearchReindexJob.DONE and not is_active(job):
+        return job
+    return None
+
+
+def start_background(chunk_size=500, workers=4):
+    """
+    백그라운드 스레드에서 재인덱싱 시작. 진행 중인 작업이 있으면 그 작업을 돌려주고,
+    실패/중단된 작업이 있으면 이어서 실행한다. 반환값: (작업, 새로 시작했는지)
+    """
+    with _start_lock:
+        latest = SearchReindexJob.objects.first()
+        if latest and is_active(latest):
+            return latest, False
+
+        job = resumable_job() or create_job()
+        job.status = SearchReindexJob.RUNNING
+        job.save(update_fields=['status', 'updated_at'])
+
+    def run():
+        try:
+            run_reindex(job, chunk_size=chunk_size, workers=workers)
+        except Exception as e:
+            print(f"재인덱싱 중 오류 발생: {e}")
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=run, name=f'reindex-{job.id}', daemon=True).start()
+    return job, True
+
+
+def job_status(job):
+    return {
+        'id': job.id,
+        'index': job.index_name,
+        'status': job.status,
+        'last_id': job.last_id,
+        'total': job.total,
+        'indexed': job.indexed,
+        'failed': job.failed,
+        'error': job.error,
+        'started_at': job.started_at,
+        'updated_at': job.updated_at,
+        'finished_at': job.finished_at,
+        'previous_indices': job.previous_indices,
+        'removed_indices': job.removed_indices,
+    }
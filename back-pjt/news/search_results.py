@@ -0,0 +1,84 @@
+"""
+검색 API 응답 만들기 (search_news, 검색 캐시 미리 채우기에서 같이 사용)
+"""
+from elasticsearch import NotFoundError
+
+from .hybrid_search import hybrid_search
+from .pagination import encode_search_cursor
+from .utils import get_es_client, search_articles, open_search_pit, close_search_pit
+
+
+def search_result_item(hit):
+    source = hit['_source']
+    highlight = hit.get('highlight', {})
+
+    # 하이라이트된 제목과 내용 가져오기
+    title = highlight.get('title', [source['title']])[0]
+    content_preview = highlight.get('content', [source.get('content_preview', '')])[0]
+
+    return {
+        'id': hit['_id'],  # _source의 id 대신 문서의 _id 사용
+        'title': title,
+        'content_preview': content_preview,
+        'category': source['category'],
+        'writer': source['writer'],
+        'write_date': source['write_date'],
+        'views': source['views'],
+        'url': source['url'],
+        'score': hit['_score']
+    }
+
+
+def search_page(query, category=None, sort_by=None, size=10, search_after=None, pit_id=None):
+    """
+    BM25 검색 한 페이지.
+    첫 페이지는 point-in-time 없이 검색한다 (대부분 첫 페이지만 보고, 첫 페이지는 검색 캐시에 그대로 들어간다).
+    다음 페이지를 처음 요청할 때 point-in-time을 열어 커서에 넣으므로 그 뒤 페이지들은 같은 시점의 인덱스를 읽는다.
+    마지막 페이지면 point-in-time을 바로 닫고, 만료됐으면 새로 열어 같은 위치부터 계속한다.
+    """
+    es = get_es_client()
+    params = dict(client=es, query=query, category=category, sort_by=sort_by, size=size, search_after=search_after)
+    pit = None
+    if search_after is None:
+        search_result = search_articles(**params)
+    else:
+        pit = pit_id or open_search_pit(es)
+        try:
+            search_result = search_articles(pit_id=pit, **params)
+        except NotFoundError:
+            pit = open_search_pit(es)
+            search_result = search_articles(pit_id=pit, **params)
+        pit = search_result.get('pit_id', pit)
+
+    hits = search_result['hits']['hits']
+    total = search_result['hits']['total']['value'] if 'total' in search_result['hits'] else None
+
+    next_cursor = None
+    if len(hits) == size:
+        next_cursor = encode_search_cursor(hits[-1]['sort'], pit)
+    elif pit:
+        close_search_pit(es, pit)
+
+    return {
+        'total': total,
+        'size': size,
+        'results': [search_result_item(hit) for hit in hits],
+        'next_cursor': next_cursor,
+    }
+
+
+def hybrid_page(query, category=None, size=10):
+    """하이브리드(BM25 + kNN, RRF) 검색 상위 size개 (다음 페이지 없음)"""
+    hits, total = hybrid_search(get_es_client(), query, category=category, size=size)
+    return {
+        'total': total,
+        'size': size,
+        'results': [search_result_item(hit) for hit in hits],
+        'next_cursor': None,
+    }
+
+
+def first_page(query, category=None, sort_by=None, size=10, hybrid=False):
+    if hybrid:
+        return hybrid_page(query, category=category, size=size)
+    return search_page(query, category=category, sort_by=sort_by, size=size)
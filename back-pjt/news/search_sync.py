@@ -0,0 +1,93 @@
+"""
+기사 저장 → Elasticsearch 반영 쓰기 지연
+
+post_save 시그널은 ES를 바로 호출하지 않고 (작업, 기사 id)를 버퍼에 넣기만 한다.
+- 검색 문서 필드가 바뀌었거나 어떤 필드가 바뀌었는지 모르면(update_fields 없음) 전체 문서 재인덱싱
+- views만 바뀌었으면 views 부분 업데이트
+- like_count/bookmark_count/embedding 등 검색 문서에 없는 필드만 바뀌었으면 생략
+버퍼는 SEARCH_SYNC_FLUSH_SIZE개가 차거나 SEARCH_SYNC_FLUSH_SECONDS가 지나면 같은 기사를 한 번으로 합쳐
+최신 DB 값으로 bulk 요청 한 번에 보낸다. ES에 연결하지 못하면 버퍼로 되돌려 다음 주기에 다시 보낸다.
+재인덱싱 작업이 진행 중이면 재인덱싱/삭제는 새로 만드는 인덱스에도 같이 보낸다 (별칭 교체 후 빠지지 않도록).
+"""
+from django.conf import settings
+from elasticsearch import helpers
+
+from .buffers import QueueBuffer
+from .models import NewsArticle
+from .search_cache import bump_search_generation
+from .search_index import article_actions, building_index
+from .utils import NEWS_ALIAS, article_doc_id, get_es_client
+from .view_counts import sync_views_to_elasticsearch
+
+# 검색 문서(article_document)에 들어가는 필드 중 views를 제외한 것
+DOCUMENT_FIELDS = {'title', 'content', 'writer', 'category', 'write_date', 'keywords', 'url'}
+
+INDEX = 'index'
+VIEWS = 'views'
+DELETE = 'delete'
+
+
+def pending_ops(items):
+    """(작업, 기사 id) 목록을 기사별 마지막 작업으로 합친다 (전체 재인덱싱은 views 업데이트를 포함)"""
+    ops = {}
+    for op, article_id in items:
+        if op == VIEWS and ops.get(article_id) == INDEX:
+            continue
+        ops[article_id] = op
+    return ops
+
+
+def write_search_ops(items):
+    ops = pending_ops(items)
+    index_ids = sorted(article_id for article_id, op in ops.items() if op == INDEX)
+    views_ids = [article_id for article_id, op in ops.items() if op == VIEWS]
+    delete_ids = {article_id for article_id, op in ops.items() if op == DELETE}
+
+    actions = []
+    if index_ids:
+        articles = NewsArticle.objects.filter(id__in=index_ids).order_by('id')
+        actions.extend(article_actions(NEWS_ALIAS, articles, chunk_size=len(index_ids)))
+        # 그 사이 삭제된 기사
+        delete_ids.update(set(index_ids) - {int(action['_id']) for action in actions})
+    actions.extend(
+        {'_op_type': 'delete', '_index': NEWS_ALIAS, '_id': article_doc_id(article_id)}
+        for article_id in sorted(delete_ids)
+    )
+
+    if actions:
+        build_index = building_index()
+        if build_index:
+            actions.extend(dict(action, _index=build_index) for action in list(actions))
+        _, errors = helpers.bulk(get_es_client(), actions, raise_on_error=False)
+        # 이미 없는 문서 삭제(404)는 무시
+        errors = [error for error in errors if error.get('delete', {}).get('status') != 404]
+        if errors:
+            print(f"기사 인덱싱 실패 {len(errors)}건: {errors[0]}")
+        # 검색 결과 캐시 무효화
+        bump_search_generation()
+    if views_ids:
+        sync_views_to_elasticsearch(views_ids)
+
+
+search_sync_buffer = QueueBuffer(
+    'search-sync',
+    write_search_ops,
+    flush_interval=settings.SEARCH_SYNC_FLUSH_SECONDS,
+    max_items=settings.SEARCH_SYNC_FLUSH_SIZE,
+    max_pending=settings.SEARCH_SYNC_MAX_PENDING,
+    block_timeout=settings.SEARCH_SYNC_BLOCK_SECONDS,
+)
+
+
+def queue(op, article_id):
+    """ES 반영 작업을 버퍼에 넣는다 (버퍼가 가득 차면 바로 보낸다)"""
+    item = (op, article_id)
+    if not search_sync_buffer.add(item):
+        write_search_ops([item])
+
+
+def queue_article_save(article, created=False, update_fields=None):
+    if created or update_fields is None or DOCUMENT_FIELDS & set(update_fields):
+        queue(INDEX, article.id)
+    elif 'views' in update_fields:
+        queue(VIEWS, article.id)
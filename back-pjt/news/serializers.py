@@ -1,63 +1,38 @@
 from rest_framework import serializers
+from django.db.models import F
 from .models import NewsArticle, ArticleLike, ArticleBookmark
-import ast
 
 
 # 전제 뉴스 기사 목록 제공
 class ArticleListSerializer(serializers.ModelSerializer):
-    keywords = serializers.SerializerMethodField()
-    likes = serializers.SerializerMethodField()
-
-    def get_keywords(self, obj):
-        # print("DEBUG >>> obj.keywords:", repr(obj.keywords))
-        try:
-            # 문자열일 경우 파싱
-            if isinstance(obj.keywords, str):
-                cleaned = obj.keywords.strip()
-                if cleaned in ("", "[]"):
-                    return []
-                return ast.literal_eval(cleaned)
-            # 이미 리스트일 경우 그대로 반환
-            elif isinstance(obj.keywords, list):
-                return obj.keywords
-        except Exception as e:
-            print("ERROR >>>", e)
-        return []
-
-    def get_likes(self, obj):
-        return ArticleLike.objects.filter(article=obj).count()
-    
+    keywords = serializers.ListField(child=serializers.CharField(), read_only=True)  # jsonb 리스트 그대로
+    likes = serializers.IntegerField(source='like_count', read_only=True)  # 비정규화된 좋아요 수
+
     class Meta:
         model = NewsArticle
         fields = ('id', 'title', 'writer', 'email', 'write_date', 'category', 'content', 'url', 'keywords','likes','views')
 
+# 뉴스 목록(show_articles)용 가벼운 시리얼라이저. 본문 대신 앞부분 미리보기(content_preview)만 제공
+# content_preview는 쿼리셋에서 Substr로 잘라서 annotate 해야 한다
+class ArticlePreviewSerializer(ArticleListSerializer):
+    content_preview = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = NewsArticle
+        fields = ('id', 'title', 'writer', 'email', 'write_date', 'category', 'content_preview', 'url', 'keywords','likes','views')
+
 # 뉴스 기사 하나만 제공
 class ArticleDetailSerializer(serializers.ModelSerializer):
-    keywords = serializers.SerializerMethodField()
-    likes = serializers.SerializerMethodField()
+    keywords = serializers.ListField(child=serializers.CharField(), read_only=True)  # jsonb 리스트 그대로
+    likes = serializers.IntegerField(source='like_count', read_only=True)  # 비정규화된 좋아요 수
     is_like = serializers.SerializerMethodField()
     is_bookmarked = serializers.SerializerMethodField()
 
-    def get_keywords(self, obj):
-        # print("DEBUG >>> obj.keywords:", repr(obj.keywords))
-        try:
-            # 문자열일 경우 파싱
-            if isinstance(obj.keywords, str):
-                cleaned = obj.keywords.strip()
-                if cleaned in ("", "[]"):
-                    return []
-                return ast.literal_eval(cleaned)
-            # 이미 리스트일 경우 그대로 반환
-            elif isinstance(obj.keywords, list):
-                return obj.keywords
-        except Exception as e:
-            print("ERROR >>>", e)
-        return []
-    
-    def get_likes(self, obj):
-        return ArticleLike.objects.filter(article=obj).count()
-    
     def get_is_like(self, obj):
+        liked_ids = self.context.get('liked_ids')
+        if liked_ids is not None:
+            return int(obj.id in liked_ids)
+
         request = self.context.get('request')
         user = request.user if request else None
 
@@ -66,6 +41,10 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
         return 0
 
     def get_is_bookmarked(self, obj):
+        bookmarked_ids = self.context.get('bookmarked_ids')
+        if bookmarked_ids is not None:
+            return obj.id in bookmarked_ids
+
         user = self.context['request'].user
         return ArticleBookmark.objects.filter(user=user, article=obj).exists()
 
@@ -91,6 +70,9 @@ class ArticleLikeSerializer(serializers.ModelSerializer):
             user=user,
             article=article
         )
+        # 새로 생긴 경우에만 좋아요 수 증가 (toggle_like의 트랜잭션 안에서 실행)
+        if created:
+            NewsArticle.objects.filter(pk=article.pk).update(like_count=F('like_count') + 1)
         return like_obj
 
     class Meta:
@@ -113,6 +95,9 @@ class ArticleBookmarkSerializer(serializers.ModelSerializer):
             user=user,
             article=article
         )
+        # 새로 생긴 경우에만 북마크 수 증가 (toggle_bookmark의 트랜잭션 안에서 실행)
+        if created:
+            NewsArticle.objects.filter(pk=article.pk).update(bookmark_count=F('bookmark_count') + 1)
         return bookmark_obj
 
     class Meta:
@@ -1,13 +1,127 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.db.models import QuerySet
 from django.dispatch import receiver
-from .models import NewsArticle
-from .utils import get_es_client, index_article
+from .models import NewsArticle, ArticleLike, ArticleRead
+from . import profiles, rollups, search_sync
+from .cache import bump_articles_generation, invalidate_article
+from .vector_index import apply_vector_change
 
 @receiver(post_save, sender=NewsArticle)
-def index_article_to_elasticsearch(sender, instance, created, **kwargs):
-    """기사가 저장될 때 Elasticsearch에 인덱싱"""
+def index_article_to_elasticsearch(sender, instance, created, update_fields=None, **kwargs):
+    """기사가 저장될 때 바뀐 필드에 따라 Elasticsearch 반영을 버퍼에 넣는다 (search_sync에서 bulk로 전송)"""
     try:
-        es = get_es_client()
-        index_article(es, instance)
+        search_sync.queue_article_save(instance, created=created, update_fields=update_fields)
     except Exception as e:
-        print(f"기사 인덱싱 중 오류 발생: {e}") 
\ No newline at end of file
+        print(f"기사 인덱싱 중 오류 발생: {e}")
+
+
+@receiver(post_delete, sender=NewsArticle)
+def remove_article_from_elasticsearch(sender, instance, **kwargs):
+    """삭제된 기사를 Elasticsearch에서도 삭제"""
+    try:
+        search_sync.queue(search_sync.DELETE, instance.id)
+    except Exception as e:
+        print(f"기사 인덱스 삭제 중 오류 발생: {e}")
+
+
+@receiver(post_save, sender=NewsArticle)
+def update_vector_index(sender, instance, update_fields=None, **kwargs):
+    """기사 임베딩이 바뀌면 메모리 벡터 인덱스에 반영"""
+    if update_fields is not None and 'embedding' not in update_fields:
+        return
+    apply_vector_change(instance.id, instance.get_embedding())
+
+
+@receiver(post_delete, sender=NewsArticle)
+def remove_from_vector_index(sender, instance, **kwargs):
+    """삭제된 기사를 메모리 벡터 인덱스에서 제거"""
+    apply_vector_change(instance.id, None)
+
+
+def deleted_directly(sender, origin):
+    """
+    유저/기사 삭제에 딸려 지워진 것(CASCADE)이 아니라 직접 지운 것인지 확인.
+    CASCADE 중에는 프로필을 건드리지 않는다 (유저 삭제 중 프로필 재생성 방지)
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return origin_model is sender
+
+
+@receiver(post_save, sender=ArticleLike)
+def add_like_to_taste_profile(sender, instance, created, **kwargs):
+    """좋아요가 생기면 유저 취향 벡터 갱신"""
+    if created:
+        profiles.record_like(instance.user_id, instance.article_id)
+
+
+@receiver(post_delete, sender=ArticleLike)
+def remove_like_from_taste_profile(sender, instance, origin=None, **kwargs):
+    """좋아요가 취소되면(toggle_like) 유저 취향 벡터에서 제거"""
+    if not deleted_directly(sender, origin):
+        return
+    profiles.remove_like(instance.user_id, instance.article_id)
+
+
+@receiver(post_save, sender=ArticleRead)
+def add_read_to_taste_profile(sender, instance, created, **kwargs):
+    """조회 기록이 생기면 유저 취향 벡터 갱신"""
+    if created:
+        profiles.record_reads(instance.user_id, instance.article_id)
+
+
+@receiver(post_delete, sender=ArticleRead)
+def remove_read_from_taste_profile(sender, instance, origin=None, **kwargs):
+    """조회 기록이 지워지면 유저 취향 벡터에서 제거"""
+    if not deleted_directly(sender, origin):
+        return
+    profiles.record_reads(instance.user_id, instance.article_id, count=-1)
+
+
+@receiver(post_save, sender=ArticleLike)
+def add_like_to_dashboard_rollups(sender, instance, created, **kwargs):
+    """좋아요가 생기면 유저 카테고리 통계 갱신"""
+    if created:
+        rollups.record_like(instance.user_id, instance.article_id)
+
+
+@receiver(post_delete, sender=ArticleLike)
+def remove_like_from_dashboard_rollups(sender, instance, origin=None, **kwargs):
+    """좋아요가 취소되면 유저 카테고리 통계에서 제거"""
+    if not deleted_directly(sender, origin):
+        return
+    rollups.record_like(instance.user_id, instance.article_id, delta=-1)
+
+
+@receiver(post_save, sender=ArticleRead)
+def add_read_to_dashboard_rollups(sender, instance, created, **kwargs):
+    """조회 기록이 생기면 날짜별 조회/키워드 통계 갱신"""
+    if created:
+        rollups.record_reads([instance])
+
+
+@receiver(post_delete, sender=ArticleRead)
+def remove_read_from_dashboard_rollups(sender, instance, origin=None, **kwargs):
+    """조회 기록이 지워지면 날짜별 조회/키워드 통계에서 제거"""
+    if not deleted_directly(sender, origin):
+        return
+    rollups.record_reads([instance], delta=-1)
+
+
+@receiver(post_save, sender=NewsArticle)
+@receiver(post_delete, sender=NewsArticle)
+def invalidate_article_caches(sender, **kwargs):
+    """
+    기사가 바뀌면 기사 목록/검색/연관 기사 캐시 세대를 올린다 (news.cache).
+    커밋 전에 올리면 다른 요청이 바뀌기 전 값을 새 세대로 다시 캐시할 수 있어 커밋 뒤에 올린다.
+    좋아요 수는 캐시 값에 넣지 않으므로 좋아요 변경은 캐시를 지우지 않는다.
+    """
+    transaction.on_commit(bump_articles_generation)
+
+
+@receiver(post_save, sender=NewsArticle)
+@receiver(post_delete, sender=NewsArticle)
+def invalidate_article_detail_cache(sender, instance, **kwargs):
+    """ORM으로 바뀐 기사의 상세 캐시 삭제 (커밋 뒤)"""
+    article_id, updated_at = instance.id, instance.updated_at
+    transaction.on_commit(lambda: invalidate_article(article_id, updated_at))
@@ -1,3 +1,774 @@
-from django.test import TestCase
+import base64
+import io
+import json
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import profiles, read_events, read_partitions, search_cache, search_index, vector_index, view_counts
+from .ann import IVFFlatIndex
+from .cache import articles_generation
+from .embeddings import HEADER, decode_embedding, encode_embedding, is_legacy
+from .hybrid_search import hybrid_search, rrf_fuse
+from .models import (
+    ArticleLike, ArticleRead, NewsArticle, SearchQueryStat, SearchReindexJob, UserCategoryStat, UserDailyReadStat,
+    UserKeywordStat, UserTasteProfile,
+)
+from .pagination import InvalidCursor, decode_search_cursor, encode_search_cursor
+from .search_results import search_page
+from .search_sync import DELETE, INDEX, VIEWS, pending_ops
+from .vector_index import EmbeddingIndex
+
+
+class EmbeddingFormatTests(SimpleTestCase):
+    def test_round_trip(self):
+        vector = np.random.default_rng(0).normal(size=1536).astype(np.float32)
+        raw = encode_embedding(vector)
+        self.assertEqual(len(raw), HEADER.size + 1536 * 4)
+        self.assertFalse(is_legacy(raw))
+        np.testing.assert_array_equal(decode_embedding(raw), vector)
+
+    def test_round_trip_from_memoryview(self):
+        # DB(psycopg2)는 BinaryField를 memoryview로 돌려준다
+        raw = memoryview(encode_embedding([0.5, -1.25, 3.0]))
+        np.testing.assert_array_equal(decode_embedding(raw), np.array([0.5, -1.25, 3.0], dtype=np.float32))
+
+    def test_legacy_json(self):
+        raw = json.dumps([0.1, 0.2, 0.3]).encode('utf-8')
+        self.assertTrue(is_legacy(raw))
+        decoded = decode_embedding(raw)
+        self.assertEqual(decoded.dtype, np.float32)
+        np.testing.assert_allclose(decoded, [0.1, 0.2, 0.3], rtol=1e-6)
+
+    def test_none(self):
+        self.assertIsNone(encode_embedding(None))
+        self.assertIsNone(decode_embedding(None))
+
+    def test_unknown_format(self):
+        raw = HEADER.pack(b'XX', 1, 0, 1) + b'\x00' * 4
+        with self.assertRaises(ValueError):
+            decode_embedding(raw)
+
+
+class PendingOpsTests(SimpleTestCase):
+    def test_last_op_per_article_wins(self):
+        ops = pending_ops([(INDEX, 1), (DELETE, 1), (VIEWS, 2), (INDEX, 2)])
+        self.assertEqual(ops, {1: DELETE, 2: INDEX})
+
+    def test_index_covers_later_views(self):
+        # 전체 재인덱싱은 최신 views를 포함하므로 뒤따르는 views 업데이트는 필요 없다
+        self.assertEqual(pending_ops([(INDEX, 1), (VIEWS, 1), (VIEWS, 1)]), {1: INDEX})
+
+    def test_empty(self):
+        self.assertEqual(pending_ops([]), {})
+
+
+class SearchCursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        cursor = encode_search_cursor([1.5, 42], 'pit-id')
+        self.assertEqual(decode_search_cursor(cursor), ([1.5, 42], 'pit-id'))
+
+    def test_without_pit(self):
+        self.assertEqual(decode_search_cursor(encode_search_cursor(['2025-05-01T00:00:00', 7])), (['2025-05-01T00:00:00', 7], None))
+
+    def test_bad_input(self):
+        def b64(payload):
+            return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+        bad_cursors = [
+            'zz',                           # base64 아님
+            '커서',                          # ascii 아님
+            b64('not json'),
+            b64('[1, 2]'),                  # 객체가 아님
+            b64('{"p": "pit-id"}'),         # search_after 없음
+            b64('{"a": "1", "p": null}'),   # search_after가 리스트가 아님
+        ]
+        for cursor in bad_cursors:
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                decode_search_cursor(cursor)
+
+
+def search_hit(article_id, score=1.0, sort=None):
+    return {
+        '_id': str(article_id), '_score': score, 'sort': sort or [score, article_id],
+        '_source': {
+            'title': f'기사 {article_id}', 'category': '경제', 'writer': '기자',
+            'write_date': '2025-05-01T00:00:00', 'views': 0, 'url': f'http://example.com/{article_id}',
+        },
+    }
+
+
+class SearchPageTests(SimpleTestCase):
+    def setUp(self):
+        self.es = mock.Mock()
+        self.es.open_point_in_time.return_value = {'id': 'pit-1'}
+        patcher = mock.patch('news.search_results.get_es_client', return_value=self.es)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def respond(self, *hits, pit_id=None):
+        response = {'hits': {'hits': list(hits), 'total': {'value': 3}}}
+        if pit_id:
+            response['pit_id'] = pit_id
+        self.es.search.return_value = response
+
+    def test_first_page_opens_no_pit(self):
+        self.respond(search_hit(3, 2.0), search_hit(2, 1.0))
+        page = search_page('금리', size=2)
+        self.es.open_point_in_time.assert_not_called()
+        self.assertEqual(decode_search_cursor(page['next_cursor']), ([1.0, 2], None))
+        self.assertNotIn('pit', self.es.search.call_args.kwargs['body'])
+
+    def test_next_page_opens_pit_and_continues_after_first_page(self):
+        self.respond(search_hit(1, 0.5, sort=[0.5, 1, 7]), search_hit(4, 0.4, sort=[0.4, 4, 8]), pit_id='pit-2')
+        page = search_page('금리', size=2, search_after=[1.0, 2])
+        self.es.open_point_in_time.assert_called_once()
+        body = self.es.search.call_args.kwargs['body']
+        self.assertEqual(body['pit']['id'], 'pit-1')
+        self.assertEqual(body['sort'][-1], {'_shard_doc': 'asc'})
+        self.assertEqual(body['search_after'], [1.0, 2, 2 ** 63 - 1])
+        # 이어지는 페이지는 ES가 돌려준 point-in-time id를 쓴다
+        self.assertEqual(decode_search_cursor(page['next_cursor']), ([0.4, 4, 8], 'pit-2'))
+
+    def test_last_page_closes_pit(self):
+        self.respond(search_hit(5, 0.3, sort=[0.3, 5, 9]))
+        page = search_page('금리', size=2, search_after=[0.4, 4, 8], pit_id='pit-2')
+        self.es.open_point_in_time.assert_not_called()
+        self.assertEqual(self.es.search.call_args.kwargs['body']['search_after'], [0.4, 4, 8])
+        self.assertIsNone(page['next_cursor'])
+        self.es.close_point_in_time.assert_called_once_with(id='pit-2')
+
+    def test_last_first_page_closes_nothing(self):
+        self.respond(search_hit(3, 2.0))
+        self.assertIsNone(search_page('금리', size=2)['next_cursor'])
+        self.es.close_point_in_time.assert_not_called()
+
+
+class RRFFuseTests(SimpleTestCase):
+    def test_scores(self):
+        fused = dict(rrf_fuse([[1, 2, 3], [3, 1]], k=60))
+        self.assertAlmostEqual(fused[1], 1 / 61 + 1 / 62)
+        self.assertAlmostEqual(fused[2], 1 / 62)
+        self.assertAlmostEqual(fused[3], 1 / 63 + 1 / 61)
+
+    def test_order(self):
+        # 두 순위에 모두 있는 문서가 한쪽에서만 1위인 문서보다 앞선다
+        self.assertEqual([doc_id for doc_id, _ in rrf_fuse([[1, 2, 3], [3, 1]], k=60)], [1, 3, 2])
+
+    def test_ties_break_by_id(self):
+        self.assertEqual([doc_id for doc_id, _ in rrf_fuse([[5], [4]], k=60)], [4, 5])
+
+    def test_empty_ranking(self):
+        # kNN 실패 시 BM25 순위만 남는다
+        self.assertEqual([doc_id for doc_id, _ in rrf_fuse([[7, 3, 9], []])], [7, 3, 9])
+        self.assertEqual(rrf_fuse([[], []]), [])
+
+
+class HybridSearchTests(SimpleTestCase):
+    def setUp(self):
+        self.es = mock.Mock()
+        # BM25 순위 1, 2, 3
+        self.es.search.return_value = {
+            'hits': {'hits': [search_hit(1, 9.0), search_hit(2, 5.0), search_hit(3, 1.0)], 'total': {'value': 30}},
+        }
+        self.es.mget.return_value = {'docs': [dict(search_hit(4), found=True)]}
+        self.index = mock.Mock()
+        # kNN 순위 3, 4
+        self.index.search.return_value = [(3, 0.9), (4, 0.8)]
+        for patcher in (
+            mock.patch('news.hybrid_search.embed_query', return_value=np.zeros(8, dtype=np.float32)),
+            mock.patch('news.hybrid_search.get_vector_index', return_value=self.index),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @override_settings(HYBRID_CANDIDATES=50, HYBRID_RRF_K=60)
+    def test_fuses_bm25_and_knn(self):
+        results, total = hybrid_search(self.es, '금리', size=3)
+        self.assertEqual(total, 30)
+        # 두 순위에 모두 있는 3이 1위, 나머지는 순위가 같으면 id순
+        self.assertEqual([hit['_id'] for hit in results], ['3', '1', '2'])
+        self.assertAlmostEqual(results[0]['_score'], 1 / 63 + 1 / 61)
+        self.assertEqual(self.es.search.call_args.kwargs['body']['size'], 50)
+        self.index.search.assert_called_once_with(mock.ANY, k=50)
+        self.es.mget.assert_not_called()
+
+    def test_fetches_knn_only_hits(self):
+        results, _ = hybrid_search(self.es, '금리', size=10)
+        # BM25 2위(2)와 kNN 2위(4)는 점수가 같아 id순
+        self.assertEqual([hit['_id'] for hit in results], ['3', '1', '2', '4'])
+        self.assertEqual(self.es.mget.call_args.kwargs['ids'], ['4'])
+        self.assertEqual(results[3]['_source']['title'], '기사 4')
+
+    def test_bm25_only_when_embedding_fails(self):
+        with mock.patch('news.hybrid_search.embed_query', side_effect=RuntimeError('api down')), \
+                mock.patch('builtins.print'):
+            results, total = hybrid_search(self.es, '금리', size=10)
+        self.assertEqual([hit['_id'] for hit in results], ['1', '2', '3'])
+        self.assertEqual(total, 30)
+
+
+class ArticleTestCase(TestCase):
+    """기사/유저를 만드는 테스트 공통 (기사 저장 시 ES 반영 버퍼는 쓰지 않고, 캐시는 테스트마다 비운다)"""
+
+    def setUp(self):
+        patcher = mock.patch('news.search_sync.queue_article_save')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+        self.user = get_user_model().objects.create_user('reader', 'reader@example.com', 'pw')
+
+    def create_article(self, i, vector=None, **fields):
+        article = NewsArticle(**{
+            'title': f'기사 {i}', 'writer': '기자', 'write_date': timezone.now(), 'category': '경제',
+            'content': '본문', 'url': f'http://example.com/{i}', 'keywords': ['경제'], 'updated_at': timezone.now(),
+            **fields,
+        })
+        if vector is not None:
+            article.set_embedding(vector)
+        article.save()
+        return article
+
+
+class TasteProfileTests(ArticleTestCase):
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(0)
+        self.vectors = [rng.normal(size=8).astype(np.float32) for _ in range(4)]
+        self.articles = [self.create_article(i, vector) for i, vector in enumerate(self.vectors)]
+
+    def profile(self):
+        p = UserTasteProfile.objects.get(user=self.user)
+        read_sum = decode_embedding(p.read_sum) if p.read_sum is not None else np.zeros(8, dtype=np.float32)
+        like_sum = decode_embedding(p.like_sum) if p.like_sum is not None else np.zeros(8, dtype=np.float32)
+        return p.like_count, p.read_count, like_sum, read_sum
+
+    def assert_matches_rebuild(self):
+        like_count, read_count, like_sum, read_sum = self.profile()
+        call_command('rebuild_taste_profiles', stdout=io.StringIO())
+        rebuilt = self.profile()
+        self.assertEqual((like_count, read_count), rebuilt[:2])
+        np.testing.assert_allclose(like_sum, rebuilt[2], atol=1e-4)
+        np.testing.assert_allclose(read_sum, rebuilt[3], atol=1e-4)
+
+    def read(self, article, day):
+        return ArticleRead(user_id=self.user.id, article_id=article.id, read_at=timezone.now(), read_date=day)
+
+    def test_apply_delta(self):
+        profiles.apply_delta(self.user.id, self.vectors[0], like_count=1)
+        profiles.apply_delta(self.user.id, self.vectors[1], read_count=2)
+        like_count, read_count, like_sum, read_sum = self.profile()
+        self.assertEqual((like_count, read_count), (1, 2))
+        np.testing.assert_allclose(like_sum, self.vectors[0], atol=1e-6)
+        np.testing.assert_allclose(read_sum, self.vectors[1] * 2, atol=1e-6)
+
+        profiles.apply_delta(self.user.id, self.vectors[1], read_count=-2)
+        _, read_count, _, read_sum = self.profile()
+        self.assertEqual(read_count, 0)
+        np.testing.assert_allclose(read_sum, 0, atol=1e-6)
+
+    def test_apply_delta_without_vector(self):
+        profiles.apply_delta(self.user.id, None, like_count=1)
+        self.assertFalse(UserTasteProfile.objects.filter(user=self.user).exists())
+
+    def test_like_updates_profile(self):
+        today = timezone.localdate()
+        a0, a1 = self.articles[:2]
+        ArticleRead.objects.create(user=self.user, article=a0, read_date=today - timedelta(days=1))
+        ArticleRead.objects.create(user=self.user, article=a0, read_date=today)
+        ArticleRead.objects.create(user=self.user, article=a1, read_date=today)
+        like_count, read_count, _, read_sum = self.profile()
+        self.assertEqual((like_count, read_count), (0, 3))
+        np.testing.assert_allclose(read_sum, self.vectors[0] * 2 + self.vectors[1], atol=1e-5)
+
+        # 좋아요 API -> 시그널: 좋아요 합으로 옮기고 그 기사의 조회분은 조회 합에서 뺀다
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.post(f'/api/articles/{a0.id}/like/').status_code, 201)
+        like_count, read_count, like_sum, read_sum = self.profile()
+        self.assertEqual((like_count, read_count), (1, 1))
+        np.testing.assert_allclose(like_sum, self.vectors[0], atol=1e-5)
+        np.testing.assert_allclose(read_sum, self.vectors[1], atol=1e-5)
+
+        # 좋아요 취소는 되돌린다
+        self.assertEqual(client.post(f'/api/articles/{a0.id}/like/').status_code, 204)
+        like_count, read_count, like_sum, read_sum = self.profile()
+        self.assertEqual((like_count, read_count), (0, 3))
+        np.testing.assert_allclose(like_sum, 0, atol=1e-5)
+        np.testing.assert_allclose(read_sum, self.vectors[0] * 2 + self.vectors[1], atol=1e-5)
+
+    def test_incremental_matches_rebuild(self):
+        today = timezone.localdate()
+        old = read_partitions.retention_cutoff() - timedelta(days=1)
+        a0, a1, a2, a3 = self.articles
+
+        # 시그널 경로(바로 INSERT)와 쓰기 지연 경로(중복 포함)
+        ArticleRead.objects.create(user=self.user, article=a0, read_date=old)
+        read_events.write_reads([self.read(a0, today), self.read(a1, old), self.read(a1, old), self.read(a2, today)])
+        read_events.write_reads([self.read(a0, today), self.read(a3, today)])
+        self.assertEqual(ArticleRead.objects.filter(user=self.user).count(), 5)
+        self.assert_matches_rebuild()
+
+        # 보관 기간 이전 조회가 있는 기사의 좋아요/취소
+        like = ArticleLike.objects.create(user=self.user, article=a0)
+        self.assert_matches_rebuild()
+        like.delete()
+        self.assert_matches_rebuild()
+
+        # 보관 기간이 지난 조회 기록 삭제
+        read_partitions.drop_expired()
+        self.assertEqual(ArticleRead.objects.filter(user=self.user).count(), 3)
+        self.assert_matches_rebuild()
+
+
+class ArticleCacheTests(ArticleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.articles = [self.create_article(i) for i in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def likes(self, response):
+        return {item['id']: item['likes'] for item in response.data['results']}
+
+    def test_like_keeps_cached_list(self):
+        article = self.articles[0]
+        self.assertEqual(self.likes(self.client.get('/api/articles/'))[article.id], 0)
+        generation = articles_generation()
+
+        self.assertEqual(self.client.post(f'/api/articles/{article.id}/like/').status_code, 201)
+        self.assertEqual(articles_generation(), generation)
+        self.assertEqual(self.likes(self.client.get('/api/articles/'))[article.id], 1)
+
+    def test_like_changes_list_etag(self):
+        etag = self.client.get('/api/articles/')['ETag']
+        self.assertEqual(self.client.get('/api/articles/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.post(f'/api/articles/{self.articles[0].id}/like/')
+        self.assertEqual(self.client.get('/api/articles/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_article_save_bumps_generation_after_commit(self):
+        generation = articles_generation()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.articles[0].save()
+            self.assertEqual(articles_generation(), generation)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(articles_generation(), generation + 1)
+
+
+class ArticleDetailConditionalTests(ArticleTestCase):
+    def setUp(self):
+        super().setUp()
+        # 조회수/조회 기록 버퍼는 쓰지 않는다 (백그라운드 flush 스레드)
+        for patcher in [
+            mock.patch('news.views.record_view', side_effect=lambda article: article.views),
+            mock.patch('news.views.record_read'),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.article = self.create_article(0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/articles/{self.article.id}/'
+
+    def test_unchanged_etag_returns_304(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_other_articles_do_not_change_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        other = self.create_article(1)
+        self.client.post(f'/api/articles/{other.id}/like/')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_like_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.post(f'{self.url}like/')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['article']['likes'], response.data['article']['is_like']), (1, 1))
+
+
+class ViewCountTests(ArticleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.counter = view_counts.view_counter
+        for patcher in (
+            mock.patch.object(self.counter, '_ensure_worker'),  # flush 스레드 대신 테스트에서 직접 flush
+            mock.patch('news.view_counts.sync_views_to_elasticsearch'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.sync = view_counts.sync_views_to_elasticsearch
+        self.article = self.create_article(1, views=3)
+
+    def test_buffered_then_flushed(self):
+        self.assertEqual(view_counts.record_view(self.article), 4)
+        self.assertEqual(view_counts.record_view(self.article), 5)
+        # 요청 경로에서는 DB/ES를 건드리지 않는다
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views, 3)
+        self.assertEqual(self.counter.pending(self.article.id), 2)
+        self.sync.assert_not_called()
+
+        self.assertEqual(self.counter.flush(), 1)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views, 5)
+        self.assertEqual(self.counter.pending(self.article.id), 0)
+        self.sync.assert_called_once_with([self.article.id])
+
+    def test_failed_flush_is_retried(self):
+        view_counts.record_view(self.article)
+        with mock.patch.object(self.counter, 'write', side_effect=RuntimeError('db down')), mock.patch('builtins.print'):
+            self.assertEqual(self.counter.flush(), 0)
+        self.assertEqual(self.counter.pending(self.article.id), 1)
+
+        self.counter.flush()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views, 4)
+
+
+class ReadEventTests(ArticleTestCase):
+    """article_read (PostgreSQL에서는 read_date 기준 파티션 테이블)에 같은 날 같은 기사 조회는 한 행만"""
+
+    def setUp(self):
+        super().setUp()
+        self.article = self.create_article(0, np.ones(8, dtype=np.float32))
+        self.today = timezone.localdate()
+
+    def read(self, day):
+        return ArticleRead(user_id=self.user.id, article_id=self.article.id, read_at=timezone.now(), read_date=day)
+
+    def counts(self):
+        profile = UserTasteProfile.objects.get(user=self.user)
+        daily = UserDailyReadStat.objects.get(user=self.user, day=self.today)
+        return ArticleRead.objects.filter(user=self.user).count(), profile.read_count, daily.count
+
+    def test_duplicate_read_same_day_is_noop(self):
+        self.assertEqual(len(read_events.insert_reads([self.read(self.today), self.read(self.today)])), 1)
+        # 이미 저장된 조회는 ON CONFLICT DO NOTHING으로 건너뛰고 돌려주지 않는다
+        self.assertEqual(read_events.insert_reads([self.read(self.today)]), [])
+        self.assertEqual(ArticleRead.objects.filter(user=self.user).count(), 1)
+
+    def test_duplicate_read_through_write_reads(self):
+        read_events.write_reads([self.read(self.today), self.read(self.today)])
+        read_events.write_reads([self.read(self.today)])
+        self.assertEqual(self.counts(), (1, 1, 1))
+
+    @override_settings(ARTICLE_READ_WRITE_BEHIND=False)
+    def test_duplicate_read_on_direct_path(self):
+        read_events.record_read(self.user, self.article)
+        read_events.record_read(self.user, self.article)
+        self.assertEqual(self.counts(), (1, 1, 1))
+
+    def test_read_on_another_day_is_kept(self):
+        read_events.write_reads([self.read(self.today), self.read(self.today - timedelta(days=1))])
+        self.assertEqual(ArticleRead.objects.filter(user=self.user).count(), 2)
+
+
+class DashboardRollupTests(ArticleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.articles = [
+            self.create_article(0, category='경제', keywords=['금리', '금리', '환율']),
+            self.create_article(1, category='정치', keywords=['국회', '금리']),
+            self.create_article(2, category='경제', keywords=[]),
+        ]
+
+    def stats(self):
+        return (
+            dict(UserCategoryStat.objects.filter(user=self.user, count__gt=0).values_list('category', 'count')),
+            dict(UserKeywordStat.objects.filter(user=self.user, count__gt=0).values_list('keyword', 'count')),
+            dict(UserDailyReadStat.objects.filter(user=self.user, count__gt=0).values_list('day', 'count')),
+        )
+
+    def read(self, article, day):
+        return ArticleRead(user_id=self.user.id, article_id=article.id, read_at=timezone.now(), read_date=day)
+
+    def test_keyword_counts_once_per_article(self):
+        today = timezone.localdate()
+        read_events.write_reads([self.read(self.articles[0], today), self.read(self.articles[1], today)])
+        # 같은 기사를 다른 날 다시 읽어도 키워드는 그대로
+        read_events.write_reads([self.read(self.articles[0], today - timedelta(days=1))])
+        self.assertEqual(self.stats()[1], {'금리': 2, '환율': 1, '국회': 1})
+
+    @skipUnless(connection.vendor == 'postgresql', "키워드 재계산(jsonb_array_elements_text)은 PostgreSQL 전용")
+    def test_incremental_matches_rebuild(self):
+        today = timezone.localdate()
+        a0, a1, a2 = self.articles
+        ArticleRead.objects.create(user=self.user, article=a0, read_date=today - timedelta(days=2))
+        read_events.write_reads([self.read(a0, today), self.read(a1, today), self.read(a2, today), self.read(a1, today)])
+        ArticleLike.objects.create(user=self.user, article=a0)
+        ArticleLike.objects.create(user=self.user, article=a1).delete()
+        ArticleLike.objects.create(user=self.user, article=a2)
+
+        incremental = self.stats()
+        call_command('rebuild_dashboard_rollups', stdout=io.StringIO())
+        self.assertEqual(incremental, self.stats())
+
+
+def clustered_vectors(n, dim=32, clusters=40, seed=0):
+    """군집이 있는 임베딩 흉내 (군집 중심 + 잡음)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return (centers[rng.integers(clusters, size=n)] + rng.normal(scale=0.3, size=(n, dim))).astype(np.float32)
+
+
+class VectorIndexRecallTests(SimpleTestCase):
+    def setUp(self):
+        self.vectors = clustered_vectors(3000)
+        self.ids = np.arange(1, len(self.vectors) + 1)
+        self.exact = EmbeddingIndex(dim=32)
+        for article_id, vector in zip(self.ids, self.vectors):
+            self.exact.upsert(int(article_id), vector)
+        self.ivf = IVFFlatIndex(dim=32)
+        self.ivf.build(self.ids, self.vectors)
+        self.queries = clustered_vectors(50, seed=1)
+
+    def recall(self, k=10, **options):
+        found = 0
+        for query in self.queries:
+            expected = {article_id for article_id, _ in self.exact.search(query, k=k)}
+            found += len(expected & {article_id for article_id, _ in self.ivf.search(query, k=k, **options)})
+        return found / (k * len(self.queries))
+
+    def test_all_lists_match_exact(self):
+        self.assertTrue(self.ivf.is_trained)
+        self.assertEqual(self.recall(nprobe=len(self.ivf._lists)), 1.0)
+
+    def test_default_nprobe_recall(self):
+        self.assertGreaterEqual(self.recall(nprobe=8), 0.9)
+
+    def test_exclude(self):
+        query = self.vectors[0]
+        self.assertEqual(self.ivf.search(query, k=1)[0][0], 1)
+        self.assertNotIn(1, [article_id for article_id, _ in self.ivf.search(query, k=5, exclude={1})])
+
+    def test_untrained_below_threshold_is_exact(self):
+        ivf = IVFFlatIndex(dim=32)
+        ivf.build(self.ids[:50], self.vectors[:50])
+        self.assertFalse(ivf.is_trained)
+        self.assertFalse(ivf.needs_rebuild())
+        exact = EmbeddingIndex(dim=32)
+        for article_id, vector in zip(self.ids[:50], self.vectors[:50]):
+            exact.upsert(int(article_id), vector)
+        for query in self.queries[:5]:
+            hits, expected = ivf.search(query, k=5), exact.search(query, k=5)
+            self.assertEqual([article_id for article_id, _ in hits], [article_id for article_id, _ in expected])
+            np.testing.assert_allclose([score for _, score in hits], [score for _, score in expected], atol=1e-6)
+
+        # 학습 기준을 넘으면 그때 재학습
+        for article_id, vector in zip(self.ids[50:100], self.vectors[50:100]):
+            ivf.upsert(int(article_id), vector)
+        self.assertTrue(ivf.needs_rebuild())
+        self.assertTrue(ivf.rebuilt().is_trained)
+
+
+class VectorIndexSyncTests(ArticleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.vectors = clustered_vectors(4, dim=8)
+        self.updated_at = timezone.now()
+        self.articles = [
+            self.create_article(i, vector, updated_at=self.updated_at) for i, vector in enumerate(self.vectors[:3])
+        ]
+
+    def test_incremental_sync(self):
+        index = EmbeddingIndex(dim=8)
+        index.sync(full=True)
+        self.assertEqual(len(index), 3)
+
+        # 마지막으로 읽은 시각과 같은 updated_at으로 나중에 들어온 기사도 읽는다
+        late = self.create_article(3, self.vectors[3], updated_at=self.updated_at)
+        # 바뀐 임베딩 (시그널 없이 컨슈머처럼 UPDATE)
+        changed = self.articles[0]
+        changed.set_embedding(self.vectors[3])
+        NewsArticle.objects.filter(pk=changed.pk).update(embedding=changed.embedding, updated_at=self.updated_at + timedelta(seconds=1))
+
+        with mock.patch.object(index, 'upsert', wraps=index.upsert) as upsert:
+            index.sync()
+        # 이미 읽은 기사는 다시 읽지 않는다
+        self.assertEqual(sorted(call.args[0] for call in upsert.call_args_list), sorted([late.id, changed.id]))
+        self.assertEqual(len(index), 4)
+        np.testing.assert_allclose(index.get_vector(changed.id), vector_index.normalize(self.vectors[3]), atol=1e-6)
+
+        with mock.patch.object(index, 'upsert', wraps=index.upsert) as upsert:
+            index.sync()
+        upsert.assert_not_called()
+
+    def test_refresh_swaps_rebuilt_index(self):
+        index = IVFFlatIndex(dim=8)
+        index.sync(full=True)
+        self.assertFalse(index.is_trained)
+        NewsArticle.objects.bulk_create([
+            NewsArticle(
+                title=f'추가 {i}', writer='기자', write_date=timezone.now(), category='경제', content='본문',
+                url=f'http://example.com/extra/{i}', keywords=[], updated_at=self.updated_at + timedelta(seconds=1),
+                embedding=encode_embedding(vector),
+            )
+            for i, vector in enumerate(clustered_vectors(100, dim=8, seed=2))
+        ])
+        removed = self.articles[1].id
+        original_rebuilt = IVFFlatIndex.rebuilt
+
+        def rebuilt_with_change(old):
+            new_index = original_rebuilt(old)
+            # 재구축하는 동안 시그널로 들어온 변경
+            vector_index.apply_vector_change(removed, None)
+            return new_index
+
+        with mock.patch.dict(vector_index._indexes, {'ivf': index}, clear=True), \
+                mock.patch.object(IVFFlatIndex, 'rebuilt', rebuilt_with_change):
+            vector_index.refresh_index('ivf')
+            refreshed = vector_index._indexes['ivf']
+
+        self.assertIsNot(refreshed, index)
+        self.assertTrue(refreshed.is_trained)
+        self.assertEqual(len(refreshed), 102)
+        self.assertNotIn(removed, refreshed)
+        self.assertEqual(vector_index._pending, {})
+
+    def test_stale_index_refreshes_in_background(self):
+        index = EmbeddingIndex(dim=8)
+        index.sync(full=True)
+        index._synced_at = 0.0
+        with mock.patch.dict(vector_index._indexes, {'exact': index}, clear=True), \
+                mock.patch('news.vector_index.refresh_in_background') as refresh, \
+                mock.patch.object(index, 'sync') as sync:
+            bound = vector_index.get_vector_index('related')
+        # 요청은 현재 인덱스로 바로 답하고 동기화는 백그라운드로
+        self.assertIs(bound.index, index)
+        refresh.assert_called_once_with('exact')
+        sync.assert_not_called()
+
+
+class SearchPrewarmTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        SearchQueryStat.objects.create(query='금리', category='', sort='', mode='', size=10, day=timezone.localdate(), count=5)
+
+    def test_prewarm_fills_cache_for_requests(self):
+        page = {'total': 0, 'size': 10, 'results': [], 'next_cursor': None}
+        with mock.patch('news.search_cache.first_page', return_value=page) as first_page:
+            self.assertEqual(search_cache.prewarm(), (1, 1))
+            # 같은 프로세스의 요청은 미리 채운 결과를 그대로 쓴다
+            self.assertEqual(search_cache.cached_first_page('금리', size=10), page)
+        first_page.assert_called_once()
+
+    def test_starts_one_thread_per_process(self):
+        with mock.patch.object(search_cache, '_prewarm_pid', None), \
+                mock.patch('news.search_cache.threading.Thread') as thread:
+            search_cache.start_prewarm()
+            search_cache.start_prewarm()
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+    @override_settings(SEARCH_PREWARM_SECONDS=0)
+    def test_disabled(self):
+        with mock.patch.object(search_cache, '_prewarm_pid', None), \
+                mock.patch('news.search_cache.threading.Thread') as thread:
+            search_cache.start_prewarm()
+        thread.assert_not_called()
+
+    def test_command_requires_shared_cache(self):
+        with self.assertRaises(CommandError):
+            call_command('prewarm_search_cache', stdout=io.StringIO())
+
+
+class SearchReindexPublishTests(TestCase):
+    def setUp(self):
+        self.job = SearchReindexJob.objects.create(index_name='news_test')
+        # 색인이 끝난 직후, 마지막 청크 저장 이후로 오래 걸린 상태
+        SearchReindexJob.objects.filter(id=self.job.id).update(updated_at=timezone.now() - search_index.STALE_AFTER)
+        self.job.refresh_from_db()
+
+    def test_publish_keeps_job_alive(self):
+        job = self.job
+
+        def slow_scan(*args, **kwargs):
+            # 교체 단계 도중 다른 요청이 보는 작업 상태
+            yield {'_id': '1'}
+            self.assertTrue(search_index.is_active(SearchReindexJob.objects.get(id=job.id)))
+
+        with mock.patch.object(search_index, 'HEARTBEAT_SECONDS', 0), \
+                mock.patch('news.search_index.helpers.streaming_bulk', return_value=[]), \
+                mock.patch('news.search_index.helpers.scan', side_effect=slow_scan), \
+                mock.patch('news.search_index.helpers.bulk'), \
+                mock.patch('news.search_index.finish_build_index'), \
+                mock.patch('news.search_index.swap_news_alias', return_value=['news_old']), \
+                mock.patch('news.search_index.prune_news_indices', return_value=[]), \
+                mock.patch('news.search_index.bump_search_generation'):
+            self.assertFalse(search_index.is_active(job))
+            self.assertEqual(search_index.publish(mock.Mock(), job, 10), (['news_old'], []))
+        self.assertTrue(search_index.is_active(SearchReindexJob.objects.get(id=job.id)))
+
+    def test_run_reindex_stores_swapped_indices(self):
+        with mock.patch('news.search_index.get_es_client'), \
+                mock.patch('news.search_index.helpers.parallel_bulk', return_value=[]), \
+                mock.patch('news.search_index.publish', return_value=(['news_old'], ['news_older'])):
+            search_index.run_reindex(self.job)
+        job = SearchReindexJob.objects.get(id=self.job.id)
+        self.assertEqual(job.status, SearchReindexJob.DONE)
+        self.assertEqual(job.previous_indices, ['news_old'])
+        self.assertEqual(job.removed_indices, ['news_older'])
+        self.assertEqual(search_index.job_status(job)['previous_indices'], ['news_old'])
+
+
+class ChatbotStreamTests(ArticleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.article = self.create_article(1)
+        self.url = f'/api/articles/{self.article.id}/chatbot/stream/'
+        self.auth = {'Authorization': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+
+    async def ask(self, headers=None):
+        return await self.async_client.post(
+            self.url, {'question': '요약해줘'}, content_type='application/json', headers=headers or {},
+        )
+
+    async def read(self, response):
+        return b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+    async def test_requires_jwt(self):
+        self.assertEqual((await self.ask()).status_code, 401)
+        self.assertEqual((await self.ask({'Authorization': 'Bearer invalid'})).status_code, 401)
+
+    async def test_streams_tokens_then_history(self):
+        async def answer(messages):
+            for token in ('금리가', ' 올랐습니다'):
+                yield token
+
+        with mock.patch('news.views.stream_newsbot_response', answer):
+            response = await self.ask(self.auth)
+            body = await self.read(response)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        events = body.split('\n\n')
+        self.assertEqual(events[:2], ['data: {"token": "금리가"}', 'data: {"token": " 올랐습니다"}'])
+        self.assertTrue(events[2].startswith('event: done\ndata: '))
+        history = json.loads(events[2].split('data: ', 1)[1])['history']
+        self.assertEqual([m['type'] for m in history], ['human', 'ai'])
+        self.assertEqual(history[-1]['content'], '금리가 올랐습니다')
+        self.assertEqual(events[3:], [''])
+
+    async def test_error_event(self):
+        async def answer(messages):
+            yield '금리가'
+            raise RuntimeError('timeout')
+
+        with mock.patch('news.views.stream_newsbot_response', answer), mock.patch('builtins.print'):
+            body = await self.read(await self.ask(self.auth))
+        self.assertEqual(body.split('\n\n')[1:], ['event: error\ndata: {"message": "답변을 가져오지 못했습니다."}', ''])
@@ -5,11 +5,12 @@ from . import views
 # api/
 urlpatterns = [
     path('articles/', views.show_articles),
+    path('articles/top-liked/', views.top_liked_articles),
 
     path('articles/<int:id_pk>/', views.article_detail_view),
     path('articles/<int:id_pk>/like/', views.toggle_like),
     path('articles/<int:id_pk>/bookmark/', views.toggle_bookmark),
-    path('articles/<int:id_pk>/chatbot/', views.ask_chatbot),
+    path('articles/<int:id_pk>/chatbot/stream/', views.ask_chatbot_stream),
     path('articles/<int:id_pk>/chatbot/reset/', views.reset_chatbot),
 
 
@@ -18,5 +19,7 @@ urlpatterns = [
     path('<int:user_id>/dashboard/', views.user_dashboard),
     path('articles/recommend/', views.personalized_recommendation),
     path('search/', views.search_news),
+    path('search/autocomplete/', views.autocomplete_view),
     path('index/all/', views.index_all_articles),
+    path('metrics/', views.metrics_view),
 ]
@@ -1,24 +1,122 @@
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, NotFoundError
 from django.conf import settings
-import json
+from django.utils import timezone
 import os
+import threading
+import time
+
+from . import metrics
+
+_es_lock = threading.Lock()
+_es_client = None
+_es_pid = None
+
+
+def build_es_client():
+    """설정값으로 Elasticsearch 클라이언트 생성 (노드당 커넥션 풀 크기/타임아웃/재시도/스니핑)"""
+    return Elasticsearch(
+        settings.ES_HOSTS,
+        connections_per_node=settings.ES_CONNECTIONS_PER_NODE,
+        request_timeout=settings.ES_REQUEST_TIMEOUT,
+        max_retries=settings.ES_MAX_RETRIES,
+        retry_on_timeout=settings.ES_RETRY_ON_TIMEOUT,
+        sniff_on_start=settings.ES_SNIFF,
+        sniff_on_node_failure=settings.ES_SNIFF,
+        min_delay_between_sniffing=settings.ES_SNIFF_INTERVAL,
+    )
+
 
 def get_es_client():
-    """Elasticsearch 클라이언트 인스턴스를 반환"""
-    es_host = os.getenv('ES_HOST', 'elasticsearch')
-    es_port = os.getenv('ES_PORT', '9200')
-    return Elasticsearch([f'http://{es_host}:{es_port}'])
+    """
+    프로세스에서 같이 쓰는 Elasticsearch 클라이언트를 반환.
+    처음 부를 때 한 번만 만들고 이후에는 커넥션 풀을 재사용한다.
+    fork된 워커는 부모의 소켓을 같이 쓰지 않도록 새로 만든다.
+    """
+    global _es_client, _es_pid
+    pid = os.getpid()
+    if _es_client is not None and _es_pid == pid:
+        return _es_client
 
-def create_news_index(client):
-    """뉴스 기사를 위한 인덱스 생성"""
-    index_body = {
+    with _es_lock:
+        if _es_client is None or _es_pid != pid:
+            start = time.perf_counter()
+            _es_client = build_es_client()
+            _es_pid = pid
+            metrics.observe('es.client.setup', time.perf_counter() - start)
+            metrics.incr('es.client.created')
+    return _es_client
+
+
+def es_pool_stats():
+    """현재 클라이언트의 노드별 커넥션 풀 상태 (새로 연 커넥션 수 / 보낸 요청 수)"""
+    if _es_client is None or _es_pid != os.getpid():
+        return {}
+    stats = {}
+    for node in _es_client.transport.node_pool.all():
+        pool = getattr(node, 'pool', None)
+        if pool is None:
+            continue
+        stats[str(node.base_url)] = {
+            'connections_opened': pool.num_connections,
+            'requests': pool.num_requests,
+            'max_connections': pool.pool.maxsize if pool.pool else None,
+        }
+    return stats
+
+# 검색/인덱싱은 모두 news 별칭을 거친다. 실제 인덱스는 news_<생성 시각> 이름으로 버전을 나누고,
+# 재인덱싱은 새 버전 인덱스를 다 채운 뒤 별칭을 한 번에 옮긴다 (그동안 검색은 이전 인덱스에서)
+NEWS_ALIAS = "news"
+
+CONTENT_PREVIEW_LENGTH = 150
+
+# 검색 결과에 필요한 필드만 _source로 받는다 (본문 content 제외)
+SEARCH_SOURCE_FIELDS = ["id", "title", "category", "writer", "write_date", "views", "url", "content_preview"]
+
+# point-in-time 검색의 _shard_doc 정렬 값 최댓값 (long)
+SHARD_DOC_MAX = 2 ** 63 - 1
+
+AUTOCOMPLETE_FIELD = {
+    "type": "text",
+    "analyzer": "korean_autocomplete",
+    "search_analyzer": "korean_autocomplete_search"
+}
+
+
+def news_index_body():
+    """뉴스 기사 인덱스 설정/매핑"""
+    return {
         "settings": {
             "analysis": {
+                "tokenizer": {
+                    # 복합어를 원형과 분해한 형태 모두 남긴다 (인공지능 → 인공지능, 인공, 지능)
+                    "nori_mixed": {
+                        "type": "nori_tokenizer",
+                        "decompound_mode": "mixed"
+                    }
+                },
+                "filter": {
+                    "autocomplete_edge": {
+                        "type": "edge_ngram",
+                        "min_gram": 1,
+                        "max_gram": 15
+                    }
+                },
                 "analyzer": {
                     "korean": {
                         "type": "custom",
                         "tokenizer": "nori_tokenizer",
                         "filter": ["nori_readingform", "lowercase"]
+                    },
+                    # 자동완성: 색인할 때만 형태소마다 앞부분 n-gram을 만들고, 검색어는 형태소 분석만
+                    "korean_autocomplete": {
+                        "type": "custom",
+                        "tokenizer": "nori_mixed",
+                        "filter": ["nori_readingform", "lowercase", "autocomplete_edge"]
+                    },
+                    "korean_autocomplete_search": {
+                        "type": "custom",
+                        "tokenizer": "nori_mixed",
+                        "filter": ["nori_readingform", "lowercase"]
                     }
                 }
             }
@@ -30,7 +128,8 @@ def create_news_index(client):
                     "type": "text",
                     "analyzer": "korean",
                     "fields": {
-                        "keyword": {"type": "keyword"}
+                        "keyword": {"type": "keyword"},
+                        "autocomplete": AUTOCOMPLETE_FIELD
                     }
                 },
                 "content": {
@@ -40,24 +139,102 @@ def create_news_index(client):
                 "writer": {"type": "keyword"},
                 "category": {"type": "keyword"},
                 "write_date": {"type": "date"},
-                "keywords": {"type": "keyword"},
+                "keywords": {
+                    "type": "keyword",
+                    "fields": {
+                        "autocomplete": AUTOCOMPLETE_FIELD
+                    }
+                },
                 "url": {"type": "keyword"},
-                "views": {"type": "integer"}
+                "views": {"type": "integer"},
+                # 검색 결과 미리보기 (하이라이트가 없을 때). 검색하지 않고 _source로만 돌려준다
+                "content_preview": {"type": "text", "index": False}
             }
         }
     }
-    
-    if not client.indices.exists(index="news"):
-        client.indices.create(index="news", body=index_body)
 
-def index_article(client, article):
-    """기사를 Elasticsearch에 인덱싱"""
-    try:
-        keywords = json.loads(article.keywords) if isinstance(article.keywords, str) else article.keywords
-    except:
-        keywords = []
-        
-    doc = {
+
+def new_index_name():
+    return f"{NEWS_ALIAS}_{timezone.now():%Y%m%d%H%M%S}"
+
+
+def aliased_indices(client):
+    """news 별칭이 가리키는 인덱스 이름 목록 (별칭이 아닌 예전 news 인덱스면 그 이름)"""
+    if client.indices.exists_alias(name=NEWS_ALIAS):
+        return sorted(client.indices.get_alias(name=NEWS_ALIAS).keys())
+    if client.indices.exists(index=NEWS_ALIAS):
+        return [NEWS_ALIAS]
+    return []
+
+
+def create_news_index(client):
+    """news 별칭/인덱스가 없으면 버전 인덱스를 만들어 별칭을 건다"""
+    if not client.indices.exists(index=NEWS_ALIAS):
+        index_name = new_index_name()
+        client.indices.create(index=index_name, body=news_index_body())
+        client.indices.put_alias(index=index_name, name=NEWS_ALIAS)
+
+
+def create_build_index(client, index_name):
+    """대량 색인용 설정으로 새 버전 인덱스 생성 (refresh 끔, 레플리카 0)"""
+    body = news_index_body()
+    body["settings"]["index"] = {"refresh_interval": "-1", "number_of_replicas": 0}
+    client.indices.create(index=index_name, body=body)
+
+
+def finish_build_index(client, index_name):
+    """색인이 끝난 인덱스의 refresh/레플리카 설정을 되돌리고 검색 가능하게 refresh"""
+    client.indices.put_settings(
+        index=index_name,
+        settings={"index": {"refresh_interval": None, "number_of_replicas": settings.ES_INDEX_REPLICAS}},
+    )
+    client.indices.refresh(index=index_name)
+    client.cluster.health(index=index_name, wait_for_status="yellow", timeout="60s")
+
+
+def swap_news_alias(client, index_name):
+    """news 별칭을 index_name으로 한 번에(원자적으로) 옮긴다. 반환값: 이전 인덱스 목록"""
+    previous = [name for name in aliased_indices(client) if name != index_name]
+    actions = [{"add": {"index": index_name, "alias": NEWS_ALIAS}}]
+    for name in previous:
+        if name == NEWS_ALIAS:
+            # 별칭 도입 전 만든 news 인덱스는 별칭과 이름이 같으므로 같은 요청에서 지운다
+            actions.append({"remove_index": {"index": name}})
+        else:
+            actions.append({"remove": {"index": name, "alias": NEWS_ALIAS}})
+    client.indices.update_aliases(actions=actions)
+    return previous
+
+
+def prune_news_indices(client, keep=1):
+    """별칭이 가리키지 않는 예전 버전 인덱스를 최근 keep개만 남기고 삭제. 반환값: 삭제한 인덱스 목록"""
+    current = set(aliased_indices(client))
+    old = sorted(
+        (name for name in client.indices.get(index=f"{NEWS_ALIAS}_*") if name not in current),
+        reverse=True,
+    )
+    removed = old[keep:]
+    for name in removed:
+        client.indices.delete(index=name)
+    return removed
+
+def article_doc_id(article_id):
+    """기사 문서의 _id. 컨슈머(rss_combined_consumer)와 같이 항상 기사 id를 쓴다"""
+    return str(article_id)
+
+
+def content_preview(content):
+    content = content or ''
+    if len(content) <= CONTENT_PREVIEW_LENGTH:
+        return content
+    return content[:CONTENT_PREVIEW_LENGTH] + "..."
+
+
+def article_document(article):
+    """기사를 Elasticsearch 문서로 변환"""
+    keywords = article.keywords or []
+
+    return {
         'id': article.id,
         'title': article.title,
         'content': article.content,
@@ -66,34 +243,47 @@ def index_article(client, article):
         'write_date': article.write_date,
         'keywords': keywords,
         'url': article.url,
-        'views': article.views
+        'views': article.views,
+        'content_preview': content_preview(article.content),
     }
-    
-    client.index(index="news", id=article.id, body=doc)
 
-def clean_url_based_documents(client):
-    """URL을 ID로 사용하는 문서들을 삭제"""
+
+def index_article(client, article):
+    """기사를 Elasticsearch에 인덱싱 (문서 _id = 기사 id)"""
+    if article.id is None:
+        raise ValueError("저장되지 않은 기사는 인덱싱할 수 없습니다.")
+    client.index(index=NEWS_ALIAS, id=article_doc_id(article.id), body=article_document(article))
+
+def search_sort(sort_by):
+    """정렬 기준 + search_after 동점 처리용 id"""
+    if sort_by == "date":
+        return [{"write_date": "desc"}, {"id": "desc"}]
+    if sort_by == "views":
+        return [{"views": "desc"}, {"id": "desc"}]
+    return [{"_score": "desc"}, {"id": "desc"}]
+
+
+def open_search_pit(client):
+    """다음 페이지들을 같은 시점의 인덱스에서 읽기 위한 point-in-time (두 번째 페이지를 처음 요청할 때 연다)"""
+    return client.open_point_in_time(index=NEWS_ALIAS, keep_alive=settings.SEARCH_PIT_KEEP_ALIVE)['id']
+
+
+def close_search_pit(client, pit_id):
+    """마지막 페이지까지 읽은 point-in-time은 만료를 기다리지 않고 바로 닫는다 (이미 만료/닫힘이면 무시)"""
     try:
-        client.delete_by_query(
-            index="news",
-            body={
-                "query": {
-                    "bool": {
-                        "must_not": [
-                            {"exists": {"field": "id"}}
-                        ]
-                    }
-                }
-            }
-        )
+        client.close_point_in_time(id=pit_id)
+    except NotFoundError:
+        pass
     except Exception as e:
-        print(f"URL 기반 문서 삭제 중 오류 발생: {e}")
+        print(f"point-in-time 닫기 실패: {e}")
 
-def search_articles(client, query, category=None, sort_by=None, page=1, size=10):
-    """기사 검색 실행"""
-    # 검색 전 URL 기반 문서 정리
-    clean_url_based_documents(client)
-    
+
+def search_articles(client, query, category=None, sort_by=None, size=10, search_after=None, pit_id=None):
+    """
+    기사 검색 실행 (_search 한 번).
+    search_after(이전 페이지 마지막 결과의 sort 값)로 다음 페이지를 읽으므로 몇 번째 페이지든 비용이 같다.
+    pit_id가 있으면 그 시점의 인덱스에서 검색한다.
+    """
     must_conditions = [
         {
             "multi_match": {
@@ -113,8 +303,9 @@ def search_articles(client, query, category=None, sort_by=None, page=1, size=10)
                 "must": must_conditions
             }
         },
-        "from": (page - 1) * size,
         "size": size,
+        "sort": search_sort(sort_by),
+        "_source": SEARCH_SOURCE_FIELDS,
         "highlight": {
             "fields": {
                 "title": {},
@@ -122,10 +313,41 @@ def search_articles(client, query, category=None, sort_by=None, page=1, size=10)
             }
         }
     }
-    
-    if sort_by == "date":
-        body["sort"] = [{"write_date": "desc"}]
-    elif sort_by == "views":
-        body["sort"] = [{"views": "desc"}]
-    
-    return client.search(index="news", body=body) 
\ No newline at end of file
+
+    if search_after:
+        # 전체 개수는 첫 페이지에서만 센다
+        body["search_after"] = search_after
+        body["track_total_hits"] = False
+
+    if pit_id:
+        body["pit"] = {"id": pit_id, "keep_alive": settings.SEARCH_PIT_KEEP_ALIVE}
+        # point-in-time 검색에 붙는 _shard_doc 동점 처리를 명시해 sort 값 개수를 고정한다
+        body["sort"] = body["sort"] + [{"_shard_doc": "asc"}]
+        if search_after and len(search_after) < len(body["sort"]):
+            # point-in-time 없이 읽은 첫 페이지의 커서. 정렬 값(id 포함)이 같은 문서는 이미 읽었으므로 _shard_doc은 최댓값
+            body["search_after"] = search_after + [SHARD_DOC_MAX]
+        return client.search(body=body)
+    return client.search(index=NEWS_ALIAS, body=body)
+
+
+def autocomplete_articles(client, prefix, size=5):
+    """제목/키워드 앞부분 일치 기사 [(id, 제목)] (본문/하이라이트 없이 _id, title만 받는다)"""
+    body = {
+        "size": size,
+        "track_total_hits": False,
+        "_source": ["title"],
+        "query": {
+            "multi_match": {
+                "query": prefix,
+                "fields": ["title.autocomplete^2", "keywords.autocomplete"],
+                "type": "most_fields",
+                "operator": "and"
+            }
+        }
+    }
+    result = client.options(request_timeout=settings.AUTOCOMPLETE_TIMEOUT).search(
+        index=NEWS_ALIAS,
+        body=body,
+        filter_path=["hits.hits._id", "hits.hits._source.title"],
+    )
+    return [(int(hit['_id']), hit['_source']['title']) for hit in result.get('hits', {}).get('hits', [])]
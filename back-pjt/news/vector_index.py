@@ -0,0 +1,438 @@
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from .embeddings import decode_embedding
+from .models import NewsArticle
+
+EMBEDDING_DIM = 1536
+
+
+def normalize(vector):
+    """벡터를 float32 단위 벡터로 변환 (영벡터는 None)"""
+    vec = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vec)
+    if not np.isfinite(norm) or norm == 0:
+        return None
+    return vec / norm
+
+
+def top_k(ids, scores, k):
+    """점수 배열에서 argpartition으로 상위 k개 (id, score) 추출"""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [(int(ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+
+class FlatStore:
+    """
+    정규화된 float32 행렬 + id 배열. 용량을 2배씩 늘려 추가는 O(dim),
+    삭제는 마지막 행을 빈자리로 옮겨 행렬을 항상 연속으로 유지한다.
+    (락은 상위 인덱스가 관리)
+    """
+
+    def __init__(self, dim):
+        self.dim = dim
+        self.matrix = np.empty((0, dim), dtype=np.float32)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.positions = {}  # article id -> 행 번호
+        self.size = 0
+
+    def _grow(self, needed):
+        capacity = self.matrix.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 64)
+        matrix = np.empty((new_capacity, self.dim), dtype=np.float32)
+        ids = np.empty(new_capacity, dtype=np.int64)
+        matrix[:self.size] = self.matrix[:self.size]
+        ids[:self.size] = self.ids[:self.size]
+        self.matrix, self.ids = matrix, ids
+
+    def upsert(self, article_id, vec):
+        pos = self.positions.get(article_id)
+        if pos is None:
+            self._grow(self.size + 1)
+            pos = self.size
+            self.size += 1
+            self.positions[article_id] = pos
+            self.ids[pos] = article_id
+        self.matrix[pos] = vec
+
+    def remove(self, article_id):
+        pos = self.positions.pop(article_id, None)
+        if pos is None:
+            return False
+        last = self.size - 1
+        if pos != last:
+            moved_id = int(self.ids[last])
+            self.matrix[pos] = self.matrix[last]
+            self.ids[pos] = moved_id
+            self.positions[moved_id] = pos
+        self.size = last
+        return True
+
+    def get(self, article_id):
+        pos = self.positions.get(article_id)
+        return None if pos is None else self.matrix[pos].copy()
+
+    def scores(self, query):
+        """(ids 복사본, 코사인 점수) 반환"""
+        return self.ids[:self.size].copy(), self.matrix[:self.size] @ query
+
+    def vectors(self):
+        return self.ids[:self.size], self.matrix[:self.size]
+
+
+class VectorIndex:
+    """
+    벡터 인덱스 공통 부분: DB 동기화와 디스크 저장/복원.
+    엔진(exact, ivf)은 upsert/remove/get_vector/search/_arrays를 구현한다.
+    """
+
+    engine = None
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._synced_until = None  # DB에서 마지막으로 읽어온 updated_at
+        self._synced_ids = set()  # updated_at이 _synced_until과 같아 이미 읽은 기사 id
+        self._synced_at = 0.0
+
+    def upsert(self, article_id, vector):
+        raise NotImplementedError
+
+    def remove(self, article_id):
+        raise NotImplementedError
+
+    def get_vector(self, article_id):
+        raise NotImplementedError
+
+    def search(self, vector, k=5, exclude=(), **options):
+        raise NotImplementedError
+
+    def _arrays(self):
+        """저장용 (ids, 정규화 벡터 행렬)"""
+        raise NotImplementedError
+
+    def _prepare(self, vector):
+        vec = normalize(vector) if vector is not None else None
+        if vec is None or vec.shape[0] != self.dim:
+            return None
+        return vec
+
+    # ------------------------------------------------------------------
+    # DB 동기화
+
+    def _rows(self, full):
+        queryset = NewsArticle.objects.exclude(embedding=None)
+        if not full and self._synced_until is not None:
+            # 마지막으로 읽은 시각과 같은 updated_at으로 나중에 들어온 기사도 읽도록 >= (이미 읽은 id는 sync에서 건너뜀)
+            queryset = queryset.filter(updated_at__gte=self._synced_until)
+        return queryset.values_list('id', 'embedding', 'updated_at').iterator(chunk_size=2000)
+
+    def sync(self, full=False):
+        """
+        DB와 동기화. 컨슈머는 ORM을 거치지 않고 기사를 넣으므로
+        updated_at 기준으로 새로 바뀐 기사만 읽어 반영한다.
+        """
+        latest, latest_ids = self._synced_until, set() if full else set(self._synced_ids)
+        for article_id, raw, updated_at in self._rows(full):
+            if not full and updated_at == self._synced_until and article_id in self._synced_ids:
+                continue
+            try:
+                self.upsert(article_id, decode_embedding(raw))
+            except Exception as e:
+                print(f"인덱스 임베딩 변환 실패 {article_id}: {e}")
+                continue
+            if latest is None or updated_at > latest:
+                latest, latest_ids = updated_at, set()
+            if updated_at == latest:
+                latest_ids.add(article_id)
+
+        self._synced_until, self._synced_ids = latest, latest_ids
+        self._synced_at = time.monotonic()
+
+    def is_stale(self):
+        interval = getattr(settings, 'VECTOR_INDEX_REFRESH_SECONDS', 60)
+        return time.monotonic() - self._synced_at >= interval
+
+    def needs_rebuild(self):
+        """변경분을 반영한 뒤 새로 구축(rebuilt)해야 하는지. exact 엔진은 증분 갱신만 한다"""
+        return False
+
+    def rebuilt(self):
+        """메모리의 벡터로 새로 구축한 인덱스 (기존 인덱스는 그대로 두어 그동안 검색에 쓴다)"""
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # 디스크 저장/복원
+
+    def _extra_state(self):
+        return {}
+
+    def _restore_extra(self, data):
+        pass
+
+    def save(self, path):
+        """인덱스를 .npz 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            ids, matrix = self._arrays()
+            state = {
+                'ids': ids,
+                'matrix': matrix,
+                'synced_until': np.array(self._synced_until.isoformat() if self._synced_until else ''),
+                **self._extra_state(),
+            }
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **state)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """save()로 저장한 파일에서 인덱스 복원. 이후 sync()는 변경분만 읽는다"""
+        with np.load(path) as data:
+            index = cls(dim=data['matrix'].shape[1], **kwargs)
+            index._restore_extra(data)
+            for article_id, vec in zip(data['ids'], data['matrix']):
+                index.upsert(int(article_id), vec)
+            synced_until = str(data['synced_until'])
+        index._synced_until = datetime.fromisoformat(synced_until) if synced_until else None
+        return index
+
+
+class EmbeddingIndex(VectorIndex):
+    """
+    exact 엔진. 기사 임베딩 전체를 정규화된 float32 행렬 하나로 유지하고
+    top-k는 행렬-벡터 곱 1번 + argpartition으로 계산한다.
+    """
+
+    engine = 'exact'
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        super().__init__(dim)
+        self._store = FlatStore(dim)
+
+    def __len__(self):
+        return self._store.size
+
+    def __contains__(self, article_id):
+        return article_id in self._store.positions
+
+    def upsert(self, article_id, vector):
+        """기사 벡터 추가 또는 교체. 벡터가 없으면 인덱스에서 제거"""
+        vec = self._prepare(vector)
+        if vec is None:
+            self.remove(article_id)
+            return
+        with self._lock:
+            self._store.upsert(article_id, vec)
+
+    def remove(self, article_id):
+        with self._lock:
+            self._store.remove(article_id)
+
+    def get_vector(self, article_id):
+        """인덱스에 저장된 정규화 벡터 복사본 반환"""
+        with self._lock:
+            return self._store.get(article_id)
+
+    def search(self, vector, k=5, exclude=(), **options):
+        """코사인 유사도 상위 k개의 (article_id, score) 목록 반환"""
+        query = normalize(vector)
+        if query is None or query.shape[0] != self.dim or k <= 0:
+            return []
+
+        with self._lock:
+            if self._store.size == 0:
+                return []
+            ids, scores = self._store.scores(query)
+            excluded = [self._store.positions[i] for i in exclude if i in self._store.positions]
+
+        if excluded:
+            scores[excluded] = -np.inf
+        return top_k(ids, scores, k)
+
+    def _arrays(self):
+        ids, matrix = self._store.vectors()
+        return ids.copy(), matrix.copy()
+
+
+# ======================================================================
+# 엔드포인트별 인덱스 선택
+#
+# settings.VECTOR_INDEXES = {
+#     'related':   {'ENGINE': 'exact'},
+#     'recommend': {'ENGINE': 'ivf', 'OPTIONS': {'nprobe': 8}},
+# }
+# 같은 엔진은 프로세스에서 하나만 만들어 공유하고, OPTIONS(리콜 조절값)는 검색 시 넘긴다.
+
+ENGINES = {
+    'exact': 'news.vector_index.EmbeddingIndex',
+    'ivf': 'news.ann.IVFFlatIndex',
+}
+
+_indexes = {}
+# _indexes/_pending을 읽고 바꿀 때만 잠깐 잡는다 (구축/동기화는 이 락 밖에서)
+_index_lock = threading.Lock()
+# 엔진별 첫 구축 (같은 엔진을 처음 요청한 요청들만 기다린다)
+_build_locks = defaultdict(threading.Lock)
+# 구축/재구축 중인 엔진 -> 그동안 시그널로 들어온 변경 [(article_id, vector)], 교체 직전에 새 인덱스에 다시 반영
+_pending = {}
+# 백그라운드 동기화 중인 엔진
+_refreshing = set()
+
+
+class BoundIndex:
+    """엔진 인스턴스 + 엔드포인트별 검색 옵션"""
+
+    def __init__(self, index, options):
+        self.index = index
+        self.options = options
+
+    def __len__(self):
+        return len(self.index)
+
+    def get_vector(self, article_id):
+        return self.index.get_vector(article_id)
+
+    def search(self, vector, k=5, exclude=()):
+        return self.index.search(vector, k=k, exclude=exclude, **self.options)
+
+
+def endpoint_config(endpoint):
+    configs = getattr(settings, 'VECTOR_INDEXES', {})
+    return configs.get(endpoint) or configs.get('default') or {'ENGINE': 'exact'}
+
+
+def index_path(engine):
+    return Path(getattr(settings, 'VECTOR_INDEX_DIR', 'vector_index')) / f'{engine}.npz'
+
+
+def build_engine(engine, full_sync=True):
+    """엔진 생성. 저장된 파일이 있으면 복원 후 변경분만, 없으면 DB 전체를 읽는다"""
+    cls = import_string(ENGINES[engine])
+    path = index_path(engine)
+    if path.exists():
+        try:
+            index = cls.load(path)
+            index.sync()
+            if index.needs_rebuild():
+                index = index.rebuilt()
+            return index
+        except Exception as e:
+            print(f"벡터 인덱스 파일 로드 실패 {path}: {e}")
+    index = cls()
+    index.sync(full=full_sync)
+    return index
+
+
+def _install(engine, index):
+    """구축 중 들어온 변경을 반영하고 인덱스를 교체 (검색은 교체 전까지 이전 인덱스를 쓴다)"""
+    with _index_lock:
+        for article_id, vector in _pending.pop(engine, []):
+            index.upsert(article_id, vector)
+        _indexes[engine] = index
+
+
+def refresh_index(engine):
+    """
+    변경분 동기화. 재구축이 필요하면(IVF 재학습) 새 인덱스를 따로 만든 뒤 통째로 교체한다.
+    요청 경로에서는 refresh_in_background로 백그라운드 스레드에서 실행한다.
+    """
+    with _index_lock:
+        index = _indexes.get(engine)
+    if index is None:
+        return
+    index.sync()
+    if not index.needs_rebuild():
+        return
+    with _index_lock:
+        _pending[engine] = []
+    try:
+        _install(engine, index.rebuilt())
+    except Exception:
+        with _index_lock:
+            _pending.pop(engine, None)
+        raise
+
+
+
+def refresh_in_background(engine):
+    """엔진별로 한 번에 하나만 백그라운드 동기화 (이미 진행 중이면 건너뜀)"""
+    with _index_lock:
+        if engine in _refreshing:
+            return
+        _refreshing.add(engine)
+
+    def run():
+        try:
+            refresh_index(engine)
+        except Exception as e:
+            print(f"벡터 인덱스 동기화 실패 ({engine}): {e}")
+        finally:
+            with _index_lock:
+                _refreshing.discard(engine)
+            # 백그라운드 스레드의 DB 연결은 요청 사이클이 닫아주지 않는다
+            connections.close_all()
+
+    threading.Thread(target=run, name=f'vector-index-{engine}-refresh', daemon=True).start()
+
+
+def get_vector_index(endpoint='default'):
+    """
+    엔드포인트 설정(VECTOR_INDEXES)에 맞는 프로세스 단위 인덱스 반환.
+    처음 한 번은 구축을 기다리고, 이후 VECTOR_INDEX_REFRESH_SECONDS가 지나면 현재 인덱스로 답하면서 백그라운드에서 동기화한다.
+    """
+    config = endpoint_config(endpoint)
+    engine = config.get('ENGINE', 'exact')
+
+    with _index_lock:
+        index = _indexes.get(engine)
+        build_lock = _build_locks[engine]
+    if index is None:
+        with build_lock:
+            with _index_lock:
+                index = _indexes.get(engine)
+                if index is None:
+                    _pending[engine] = []
+            if index is None:
+                try:
+                    index = build_engine(engine)
+                except Exception:
+                    with _index_lock:
+                        _pending.pop(engine, None)
+                    raise
+                _install(engine, index)
+    elif index.is_stale():
+        refresh_in_background(engine)
+    return BoundIndex(index, config.get('OPTIONS', {}))
+
+
+def apply_vector_change(article_id, vector):
+    """
+    ORM으로 바뀐 기사 임베딩을 메모리에 올라온 인덱스에 반영 (vector가 None이면 제거). 시그널에서 사용.
+    구축/재구축 중인 엔진은 교체할 새 인덱스에도 반영되도록 기록해 둔다.
+    """
+    with _index_lock:
+        indexes = list(_indexes.values())
+        for changes in _pending.values():
+            changes.append((article_id, vector))
+    for index in indexes:
+        if vector is None:
+            index.remove(article_id)
+        else:
+            index.upsert(article_id, vector)
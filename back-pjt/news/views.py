@@ -1,45 +1,137 @@
 from django.shortcuts import render
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
-from .models import NewsArticle, ArticleLike, ArticleRead, ArticleBookmark
-from .serializers import ArticleListSerializer, ArticleDetailSerializer, ArticleLikeSerializer, DashboardSerializer, ArticleBookmarkSerializer
-from django.db.models import F, Count
-from django.db.models.functions import TruncDate
+from .models import (
+    NewsArticle, ArticleLike, ArticleBookmark, RelatedArticle, UserTasteProfile,
+    UserCategoryStat, UserKeywordStat, UserDailyReadStat, SearchReindexJob,
+)
+from .serializers import ArticleListSerializer, ArticlePreviewSerializer, ArticleDetailSerializer, ArticleLikeSerializer, DashboardSerializer, ArticleBookmarkSerializer
+from django.db.models import F
+from django.db.models.functions import Substr
 from django.db.models.expressions import RawSQL
-from django.db import connection
+from django.db import connection, transaction
+from django.conf import settings
 from django.utils import timezone
-from datetime import timedelta
-from collections import Counter
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-import json, ast
-from .utils import get_es_client, create_news_index, index_article, search_articles
-from .chatbot.news_chatbot import get_newsbot_response, message_to_dict, message_from_dict
+from django.utils.dateparse import parse_date
+from django.utils.cache import patch_cache_control
+from datetime import datetime, timedelta
+from .vector_index import get_vector_index
+from .pagination import keyset_page, parse_page_size, InvalidCursor, decode_search_cursor
+from .prefetch import article_context
+from .cache import get_or_build, make_key, article_key, articles_version, cache_stats, without_likes, with_current_likes
+from .conditional import make_etag, not_modified, set_validators
+from .buffers import buffer_stats
+from . import metrics
+from .view_counts import record_view
+from .read_events import record_read
+from .utils import get_es_client, es_pool_stats, autocomplete_articles
+from .query_embeddings import normalize_query
+from .lru import LRUCache
+from .search_index import start_background, job_status
+from .search_results import search_page
+from .search_cache import cached_first_page, log_query, start_prewarm
+from .chatbot.news_chatbot import (
+    build_messages, with_answer, stream_newsbot_response, message_to_dict, message_from_dict,
+)
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+import json
+import time
 from django.contrib.auth import get_user_model
 
 
+CONTENT_PREVIEW_LENGTH = 200
+
+
+def parse_date_bound(value, end=False):
+    """YYYY-MM-DD를 write_date 비교용 datetime으로 변환 (end면 다음날 0시, 미포함 경계)"""
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(value)
+    if end:
+        day += timedelta(days=1)
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
 #모든 뉴스 리스트 보기. 권한 불필요
+# ?cursor=다음 페이지 커서&size=20&category=경제&start=2025-05-01&end=2025-05-31
 @api_view(['GET'])
 def show_articles(request):
+    size = parse_page_size(request.GET.get('size'))
+    try:
+        start = parse_date_bound(request.GET.get('start'))
+        end = parse_date_bound(request.GET.get('end'), end=True)
+    except ValueError:
+        return Response({"error": "날짜는 YYYY-MM-DD 형식이어야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    category = request.GET.get('category')
+    cursor = request.GET.get('cursor')
+
+    def build_page():
+        # 본문/임베딩은 읽지 않고 본문 앞부분만 DB에서 잘라온다
+        queryset = (
+            NewsArticle.objects
+            .defer('content', 'embedding')
+            .annotate(content_preview=Substr('content', 1, CONTENT_PREVIEW_LENGTH))
+        )
+        if category:
+            queryset = queryset.filter(category=category)
+        if start:
+            queryset = queryset.filter(write_date__gte=start)
+        if end:
+            queryset = queryset.filter(write_date__lt=end)
+
+        articles, next_cursor = keyset_page(queryset, cursor, size)
+        serializer = ArticlePreviewSerializer(articles, many= True)
+        return {
+            'results': without_likes(serializer.data),
+            'next_cursor': next_cursor,
+        }
+
+    version = articles_version()
+    key = make_key('articles', version, category=category, start=start, end=end, cursor=cursor, size=size)
 
-    queryset = NewsArticle.objects.all().order_by('-write_date')
-    serializer = ArticleListSerializer(queryset, many= True)
+    try:
+        page = get_or_build('articles', key, build_page)
+    except InvalidCursor as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    page = {**page, 'results': with_current_likes(page['results'])}
 
-    return Response(serializer.data)
+    # 목록(기사 세대/최신 updated_at과 파라미터)과 좋아요 수가 그대로면 본문 없이 304
+    # 좋아요 수 등은 updated_at을 바꾸지 않으므로 Last-Modified 없이 ETag로만 검증한다
+    etag = make_etag(key, [(item['id'], item['likes']) for item in page['results']])
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
 
+    return set_validators(Response(page), etag)
+
+
+# 좋아요 많은 순 기사 목록. 권한 불필요 (like_count 인덱스 사용)
+@api_view(['GET'])
+def top_liked_articles(request):
+    size = parse_page_size(request.GET.get('size'), default=10)
+
+    def build_list():
+        articles = (
+            NewsArticle.objects
+            .defer('content', 'embedding')
+            .annotate(content_preview=Substr('content', 1, CONTENT_PREVIEW_LENGTH))
+            .order_by('-like_count', '-id')[:size]
+        )
+        return without_likes(ArticlePreviewSerializer(articles, many=True).data)
+
+    # 캐시된 순위에 현재 좋아요 수를 붙여 다시 정렬 (새로 순위에 드는 기사는 캐시가 만료되면 반영)
+    articles = with_current_likes(get_or_build('articles', make_key('top-liked', articles_version(), size=size), build_list))
+    articles.sort(key=lambda item: (-item['likes'], -item['id']))
+    return Response(articles)
 
-def transform_embedding(embedding_binary):
-    """임베딩 바이너리 데이터를 numpy 배열로 변환"""
-    try:
-        if embedding_binary is None:
-            return None
-        embedding_str = embedding_binary.tobytes().decode('utf-8')
-        return np.array(json.loads(embedding_str), dtype=np.float32)
-    except Exception as e:
-        print(f"임베딩 변환 실패: {e}")
-        return None
 
 # =====================================================================================
 
@@ -54,58 +146,97 @@ def article_detail_view(request, id_pk):
             status=status.HTTP_401_UNAUTHORIZED
         )
 
-    # 기사 존재 파악
+    # 기사 존재 파악 (캐시 키와 자주 바뀌는 값만 읽는다)
     try:
-        article = NewsArticle.objects.get(pk=id_pk)
+        article = NewsArticle.objects.only('id', 'updated_at', 'views', 'like_count').get(pk=id_pk)
     except NewsArticle.DoesNotExist:
         return Response(
             {"error": "해당 기사가 존재하지 않습니다."},
             status=status.HTTP_404_NOT_FOUND
         )
 
-    #조건 만족시 조회수 증가
-    article.views = F('views') + 1
-    article.save(update_fields = ['views'])
-    article.refresh_from_db()
+    #조건 만족시 조회수 증가 (버퍼에 모았다가 주기적으로 한 번에 반영, 응답에는 대략적인 현재 조회수)
+    article.views = record_view(article)
+
+    #조회 테이블에 기록 남기기 (버퍼에 모았다가 INSERT ... ON CONFLICT DO NOTHING 한 번)
+    record_read(request.user, article)
+
+    context = article_context(request, [article])
+    is_like = int(article.id in context['liked_ids'])
+    is_bookmarked = article.id in context['bookmarked_ids']
+
+    # 기사/좋아요 수/유저의 좋아요·북마크 여부가 그대로면 직렬화 없이 304
+    # 이 기사의 상태만 비교한다 (조회수, 다른 기사가 바뀌어 달라지는 연관 기사는 비교하지 않음)
+    etag = make_etag(article.id, article.updated_at, article.like_count, is_like, is_bookmarked)
+    # 좋아요/북마크는 updated_at을 바꾸지 않으므로 Last-Modified 없이 ETag로만 검증한다
+    cached = not_modified(request, etag, private=True)
+    if cached is not None:
+        return cached
+
+    # 기사 본문/연관 기사는 캐시 (기사 updated_at이 바뀌면 새 키)
+    article_data = dict(get_or_build(
+        'article',
+        article_key(article.id, article.updated_at),
+        lambda: build_article_payload(article.id),
+    ))
+    related_article = get_or_build(
+        'related',
+        make_key('related', article.id, articles_version()),
+        lambda: without_likes(ArticleListSerializer(related_articles(article), many=True).data),
+    )
+    related_article = with_current_likes(related_article)
+
+    # 유저별 값과 자주 바뀌는 값은 캐시하지 않고 현재 값으로
+    article_data.update({
+        'likes': article.like_count,
+        'is_like': is_like,
+        'views': article.views,
+        'is_bookmarked': is_bookmarked,
+    })
 
-    #조회 테이블에 기록 남기기
-    ArticleRead.objects.create(user=request.user, article=article)
+    # 응답 데이터 구성
+    response_data = {
+        'article': article_data,
+        'related_articles': related_article
+    }
 
-    #연관 기사 추출
-    related_article = []
-    base_vec = article.get_embedding()
-    if base_vec is not None:
+    return set_validators(Response(response_data), etag, private=True)
+
+
+def build_article_payload(article_id):
+    """기사 상세 직렬화 결과 (유저별 값 제외, 캐시용)"""
+    article = NewsArticle.objects.defer('embedding').get(pk=article_id)
+    return ArticleDetailSerializer(article, context={'liked_ids': set(), 'bookmarked_ids': set()}).data
+
+
+def related_articles(article):
+    """연관 기사 추출 (미리 계산된 연관 기사 테이블 조회)"""
+    top_k = settings.RELATED_ARTICLES_TOP_K
+    related_ids = list(
+        RelatedArticle.objects
+        .filter(article_id=article.id)
+        .order_by('-score')
+        .values_list('related_id', flat=True)[:top_k]
+    )
+    articles_by_id = NewsArticle.objects.defer('embedding').in_bulk(related_ids)
+    top_articles = [articles_by_id[article_id] for article_id in related_ids if article_id in articles_by_id]
+
+    # 아직 테이블에 없는 기사(재계산 전)는 메모리 벡터 인덱스로 계산
+    if not top_articles:
         try:
-            base_vec = base_vec.reshape(1, -1)
-            candidates = NewsArticle.objects.exclude(id=id_pk).exclude(embedding=None)
-
-            similarities = []
-            for other in candidates:
-                try:
-                    vec = other.get_embedding()
-                    if vec is not None:
-                        vec = vec.reshape(1, -1)
-                        sim = cosine_similarity(base_vec, vec)[0][0]
-                        similarities.append((sim, other))
-                except Exception as e:
-                    print(f"후보 기사 임베딩 변환 실패 {other.id}: {e}")
-                    continue
-
-            similarities.sort(reverse=True, key=lambda x: x[0])
-            top_articles = [a for _, a in similarities[:5]]
-            related_article = ArticleListSerializer(top_articles, many=True, context={'request': request}).data
+            index = get_vector_index('related')
+            base_vec = index.get_vector(article.id)
+            if base_vec is None:
+                base_vec = NewsArticle.objects.only('embedding').get(pk=article.id).get_embedding()
+            if base_vec is not None:
+                hits = index.search(base_vec, k=top_k, exclude={article.id})
+                articles_by_id = NewsArticle.objects.defer('embedding').in_bulk([article_id for article_id, _ in hits])
+                top_articles = [articles_by_id[article_id] for article_id, _ in hits if article_id in articles_by_id]
 
         except Exception as e:
             print(f'유사도 계산 실패: {e}')
 
-    # 응답 데이터 구성
-    serializer = ArticleDetailSerializer(article, context={'request': request})
-    response_data = {
-        'article': serializer.data,
-        'related_articles': related_article
-    }
-
-    return Response(response_data)
+    return top_articles
 
 
 # 좋아용 누르기 기능. 권한 필요
@@ -115,84 +246,149 @@ def toggle_like(request, id_pk):
     user = request.user
 
     try:
-        article = NewsArticle.objects.get(pk = id_pk)
+        article = NewsArticle.objects.defer('embedding').get(pk = id_pk)
     except NewsArticle.DoesNotExist:
         return Response({'error':'해당 기사가 사라졌어요!'}, status = 404)
     
-    # 좋아요가 이미 존재하는지 확인
-    existing_like = ArticleLike.objects.filter(user=user, article=article).first()
-
-    if existing_like:
-        existing_like.delete()
-        return Response(status = 204)
-    else:
-        serializer = ArticleLikeSerializer(data = {'article_id':article.id}, context = {'request':request})
-
-        # 유효성 검사
-        if serializer.is_valid():
-            serializer.save()
-            return Response(status = 201)
+    # 좋아요 행과 기사의 좋아요 수(like_count)를 같은 트랜잭션에서 갱신
+    with transaction.atomic():
+        # 좋아요가 이미 존재하는지 확인
+        existing_like = ArticleLike.objects.filter(user=user, article=article).first()
+
+        if existing_like:
+            deleted, _ = existing_like.delete()
+            if deleted:
+                NewsArticle.objects.filter(pk=article.pk).update(like_count=F('like_count') - 1)
+            return Response(status = 204)
         else:
-            return Response(status = 400)
+            serializer = ArticleLikeSerializer(data = {'article_id':article.id}, context = {'request':request})
+
+            # 유효성 검사
+            if serializer.is_valid():
+                serializer.save()
+                return Response(status = 201)
+            else:
+                return Response(status = 400)
 
 # 북마크 누르기 기능. 권한 필요
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def toggle_bookmark(request, id_pk):
     user = request.user
-    article = NewsArticle.objects.get(pk = id_pk)
+    article = NewsArticle.objects.defer('embedding').get(pk = id_pk)
     
-    # 북마크를 이미 했는지 확인
-    existing_bookmark = ArticleBookmark.objects.filter(user=user, article=article).first()
-
-    if existing_bookmark:
-        existing_bookmark.delete()
-        return Response(status = 204)
-    else:
-        serializer = ArticleBookmarkSerializer(data = {'article_id':article.id}, context = {'request':request})
-
-        # 유효성 검사
-        if serializer.is_valid():
-            serializer.save()
-            return Response(status = 201)
+    # 북마크 행과 기사의 북마크 수(bookmark_count)를 같은 트랜잭션에서 갱신
+    with transaction.atomic():
+        # 북마크를 이미 했는지 확인
+        existing_bookmark = ArticleBookmark.objects.filter(user=user, article=article).first()
+
+        if existing_bookmark:
+            deleted, _ = existing_bookmark.delete()
+            if deleted:
+                NewsArticle.objects.filter(pk=article.pk).update(bookmark_count=F('bookmark_count') - 1)
+            return Response(status = 204)
         else:
-            return Response(serializer.errors, status = 400)
+            serializer = ArticleBookmarkSerializer(data = {'article_id':article.id}, context = {'request':request})
 
+            # 유효성 검사
+            if serializer.is_valid():
+                serializer.save()
+                return Response(status = 201)
+            else:
+                return Response(serializer.errors, status = 400)
 
-# 뉴비 챗봇 사용
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def ask_chatbot(request, id_pk):
-    user = request.user
-    article = NewsArticle.objects.get(pk = id_pk)
-    question = request.data.get('question')
 
+def sse_event(data, event=None):
+    """Server-Sent Events 한 건"""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n" if event else f"data: {payload}\n\n"
 
+
+def start_chat(request, id_pk):
+    """
+    스트리밍 전에 DB/세션이 필요한 부분 (동기). JWT 인증, 기사 조회, 이전 대화 불러오기.
+    반환값: (에러 응답 또는 None, 세션 키, 질문을 붙인 메시지)
+    """
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed as e:
+        return JsonResponse({"detail": str(e.detail)}, status=401), None, None
+    if authenticated is None:
+        return JsonResponse({"detail": "자격 인증데이터(authentication credentials)가 제공되지 않았습니다."}, status=401), None, None
+    user = authenticated[0]
+
+    article = NewsArticle.objects.filter(pk=id_pk).only('id', 'title', 'write_date', 'content').first()
+    if article is None:
+        return JsonResponse({"message": "기사를 찾을 수 없습니다."}, status=404), None, None
+    try:
+        question = json.loads(request.body or b'{}').get('question')
+    except (ValueError, AttributeError):
+        question = None
     if not question:
-        return Response({"message": "질문을 입력해주세요."}, status = 400)
+        return JsonResponse({"message": "질문을 입력해주세요."}, status=400), None, None
 
-    # 세션에 이전 메시지 불러오기
     session_key = f"chat_history_{user.id}_{article.id}"
-    messages = [message_from_dict(d) for d in request.session.get(session_key, [])]
-
-    # 답변 작성
-    answer, updated_messages = get_newsbot_response(
-        messages,
+    history = request.session.get(session_key, [])
+    # 첫 요청이라도 응답에 세션 쿠키가 실리도록 미리 저장 표시 (실제 대화는 스트리밍이 끝난 뒤 저장)
+    request.session[session_key] = history
+    messages = build_messages(
+        [message_from_dict(d) for d in history],
         article.title,
         str(article.write_date),
         article.content,
-        question
+        question,
     )
+    return None, session_key, messages
 
-    # 세션에 메시지 저장(직렬화 없이)
-    request.session[session_key] = [message_to_dict(m) for m in updated_messages]
-    request.session.modified = True  # 변경 감지.
 
+def save_chat(session, session_key, messages):
+    # 스트리밍 응답은 SessionMiddleware가 먼저 저장하고 지나가므로 여기서 직접 저장
+    session[session_key] = [message_to_dict(m) for m in messages]
+    session.save()
 
-    return Response({
-        "history": [message_to_dict(m) for m in updated_messages if message_to_dict(m)["type"] != "system"]
-    })
 
+# 뉴비 챗봇 스트리밍 (ASGI 전용, uvicorn 프로세스에서만 이 경로를 받는다)
+# 답변 조각마다 data: {"token": ...}, 끝나면 event: done으로 전체 대화, 실패하면 event: error
+# DRF 뷰는 동기 뷰라 비동기 뷰는 Django 뷰로 두고 JWT 인증을 직접 한다
+async def ask_chatbot_stream(request, id_pk):
+    if request.method != 'POST':
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+
+    error, session_key, messages = await sync_to_async(start_chat)(request, id_pk)
+    if error is not None:
+        return error
+
+    async def events():
+        start = time.perf_counter()
+        tokens = []
+        try:
+            async for token in stream_newsbot_response(messages):
+                if not tokens:
+                    metrics.observe('chatbot.first_token', time.perf_counter() - start)
+                tokens.append(token)
+                yield sse_event({"token": token})
+            metrics.observe('chatbot.stream', time.perf_counter() - start)
+
+            updated_messages = with_answer(messages, ''.join(tokens))
+            await sync_to_async(save_chat)(request.session, session_key, updated_messages)
+        except Exception as e:
+            print(f"챗봇 답변 스트리밍 중 오류 발생: {e}")
+            metrics.incr('chatbot.stream.error')
+            yield sse_event({"message": "답변을 가져오지 못했습니다."}, event='error')
+            return
+        yield sse_event({
+            "history": [message_to_dict(m) for m in updated_messages if message_to_dict(m)["type"] != "system"]
+        }, event='done')
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginx 등 프록시가 모아서 보내지 않도록
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# JWT로 인증하므로 CSRF 검사 제외 (DRF 뷰와 동일). Django 4.2의 csrf_exempt는 비동기 뷰를 감싸지 못해 속성으로 지정
+ask_chatbot_stream.csrf_exempt = True
 
 
 # 뉴비 챗봇 초기화
@@ -227,7 +423,7 @@ def user_info(request):
 def user_bookmark_list(request):
     user = request.user
     # 북마크 목록 가져오기
-    bookmarks = ArticleBookmark.objects.filter(user=user).select_related('article')
+    bookmarks = ArticleBookmark.objects.filter(user=user).select_related('article').defer('article__embedding')
     articles = [bookmark.article for bookmark in bookmarks]
     
     # 유저 정보와 북마크 목록을 함께 직렬화
@@ -235,7 +431,7 @@ def user_bookmark_list(request):
         "user": {
             "username": user.username,
         },
-        "bookmarks": ArticleDetailSerializer(articles, many=True, context={'request': request}).data
+        "bookmarks": ArticleDetailSerializer(articles, many=True, context=article_context(request, articles)).data
     }
     
     return Response(response_data)
@@ -248,13 +444,14 @@ def user_bookmark_list(request):
 def user_dashboard(request, user_id):
     user = request.user
 
+    # 롤업 테이블(news.rollups)에서 유저 기준으로 바로 읽는다. 기록이 많아도 비용이 같다
+
     # 1. 많이 본 카테고리(좋아요 기반)
     top_categories = (
-        NewsArticle.objects
-        .filter(articlelike__user=user)
-        .values('category')
-        .annotate(count = Count('id'))
-        .order_by('-count')[:5]
+        UserCategoryStat.objects
+        .filter(user=user, count__gt=0)
+        .order_by('-count', 'category')
+        .values('category', 'count')[:5]
     )
 
     top_categories_list = [
@@ -265,30 +462,12 @@ def user_dashboard(request, user_id):
     #-----------------------------------------------------
 
     #2. 주요 키워드(조회수 기반)
-    read_articles_id = (
-        ArticleRead.objects
-        .filter(user=request.user)
-        .values_list('article_id', flat = True)
-        .distinct()
+    keywords_5 = list(
+        UserKeywordStat.objects
+        .filter(user=user, count__gt=0)
+        .order_by('-count', 'keyword')
+        .values_list('keyword', 'count')[:5]
     )
-
-    read_articles = NewsArticle.objects.filter(id__in=read_articles_id)
-
-    all_keywords = []
-    for article in read_articles:
-        try:
-            if isinstance(article.keywords, str):
-                keywords = ast.literal_eval(article.keywords)
-            else:
-                keywords = article.keywords  # 혹시나 리스트일 수도 있음
-            all_keywords += keywords
-        except Exception as e:
-            print(f"❌ 파싱 실패: {article.id}", e)
-            continue
-
-
-    #상위 5개 뽑기
-    keywords_5 = Counter(all_keywords).most_common(5)
     # 정규화 과정. 최대 조회수를 기준으로 나누기
     max_count = keywords_5[0][1] if keywords_5 else 1
 
@@ -296,17 +475,13 @@ def user_dashboard(request, user_id):
 
     #---------------------------------------------------------
 
-    # 3. 주간 읽은 기사(조회수 기반)
+    # 3. 주간 읽은 기사(조회수 기반, 날짜별 서로 다른 기사 수)
     last_7_days = timezone.now().date() - timedelta(days=6)
     daily_reads = (
-        ArticleRead.objects
-        .filter(user=user, read_at__date__gte=last_7_days)
-        .annotate(day=TruncDate('read_at'))
-        .values('day', 'article') # 유저 + 날짜 + 기사 단위로 유니크하게
-        .distinct()
-        .values('day')   # 날짜 기준만 남기고
-        .annotate(count = Count('article'))  # 그 날짜에 유니크한 기사 수 세기
+        UserDailyReadStat.objects
+        .filter(user=user, day__gte=last_7_days, count__gt=0)
         .order_by('day')
+        .values('day', 'count')
     )
 
     weekly_read_count_list = [
@@ -317,7 +492,7 @@ def user_dashboard(request, user_id):
     #---------------------------------------------------------
 
     # 4. 좋아요 누른 기사들
-    liked_articles = NewsArticle.objects.filter(articlelike__user = user)
+    liked_articles = NewsArticle.objects.filter(articlelike__user = user).defer('embedding')
 
 
     serializer = DashboardSerializer({
@@ -333,133 +508,75 @@ def user_dashboard(request, user_id):
 
 #=====================================================================================
 # 개인 맞춤 알고리즘
-# 좋아요 0.7 + 조회수 0.3 비율 기반
+# 좋아요 0.7 + 조회수 0.3 비율 기반 (UserTasteProfile)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def personalized_recommendation(request):
     user = request.user
 
-    # 1. 사용자 행동 기사 ID 가져오기
-    like_articles = NewsArticle.objects.filter(articlelike__user=user).exclude(embedding=None)
-    read_articles = (
-        NewsArticle.objects.filter(articleread__user=user)
-        .exclude(id__in=like_articles.values_list('id', flat=True))
-        .exclude(embedding=None)
-    )
-
-    # 2. 임베딩 벡터 평균 계산
-    like_vectors = []
-    read_vectors = []
-
-    # 좋아요한 기사들의 임베딩
-    for article in like_articles:
-        vec = article.get_embedding()
-        if vec is not None:
-            like_vectors.append(vec)
-
-    # 읽은 기사들의 임베딩
-    for article in read_articles:
-        vec = article.get_embedding()
-        if vec is not None:
-            read_vectors.append(vec)
-
-    # 3. 가중 평균 계산
-    if like_vectors:
-        like_vec = np.mean(like_vectors, axis=0)
-    else:
-        like_vec = None
-
-    if read_vectors:
-        read_vec = np.mean(read_vectors, axis=0)
-    else:
-        read_vec = None
-
-    if read_vec is not None and like_vec is not None:
-        user_vec = (read_vec * 0.3) + (like_vec * 0.7)
-    elif like_vec is not None:
-        user_vec = like_vec
-    elif read_vec is not None:
-        user_vec = read_vec
-    else:
+    # 1. 저장된 유저 취향 벡터 (좋아요/조회 시그널로 미리 누적해 둔 값)
+    profile = UserTasteProfile.objects.filter(user=user).first()
+    user_vec = profile.user_vector() if profile else None
+    if user_vec is None:
         return Response({"message": "추천할 행동 데이터가 부족합니다"}, status=400)
 
-    # 4. 모든 기사와 유사도 계산
-    candidates = NewsArticle.objects.exclude(
-        id__in=like_articles.values_list('id', flat=True)
-    ).exclude(embedding=None)
+    def build_recommendation():
+        # 2. 벡터 인덱스에서 후보 추출. 좋아요한 기사를 빼고도 10개가 남도록 좋아요 수만큼 더 뽑는다
+        hits = get_vector_index('recommend').search(user_vec, k=10 + profile.like_count)
+        candidate_ids = [article_id for article_id, _ in hits]
 
-    similarities = []
-    for article in candidates:
-        article_vec = article.get_embedding()
-        if article_vec is not None:
-            sim = cosine_similarity(user_vec.reshape(1, -1), article_vec.reshape(1, -1))[0][0]
-            similarities.append((sim, article))
+        # 3. 후보 중 좋아요한 기사 제외 (유저 기록 전체가 아니라 후보 id만 확인)
+        liked_ids = set(
+            ArticleLike.objects
+            .filter(user=user, article_id__in=candidate_ids)
+            .values_list('article_id', flat=True)
+        )
+        top_ids = [article_id for article_id in candidate_ids if article_id not in liked_ids][:10]
+        articles_by_id = NewsArticle.objects.defer('embedding').in_bulk(top_ids)
+        recommended_articles = [articles_by_id[article_id] for article_id in top_ids if article_id in articles_by_id]
 
-    # 상위 10개 추천
-    similarities.sort(reverse=True, key=lambda x: x[0])
-    recommended_articles = [article for _, article in similarities[:10]]
+        return without_likes(ArticleListSerializer(recommended_articles, many=True, context={'request': request}).data)
 
-    serializer = ArticleListSerializer(recommended_articles, many=True, context={'request': request})
-    return Response(serializer.data)
+    # 취향 벡터가 바뀌거나(좋아요/조회) 기사가 바뀌면 새 키
+    key = make_key('recommend', user.id, profile.updated_at, articles_version())
+    return Response(with_current_likes(get_or_build('recommend', key, build_recommendation)))
 
 @api_view(['GET'])
 def search_news(request):
-    """뉴스 검색 API"""
+    """
+    뉴스 검색 API (cursor: 이전 응답의 next_cursor로 다음 페이지)
+    mode=hybrid면 BM25와 임베딩 kNN 결과를 RRF로 합친 상위 size개 (관련도순만, 다음 페이지 없음)
+    """
     query = request.GET.get('q', '')
     category = request.GET.get('category', None)
     sort_by = request.GET.get('sort', None)
-    page = int(request.GET.get('page', 1))
-    size = int(request.GET.get('size', 10))
+    size = parse_page_size(request.GET.get('size'), default=10)
+    cursor = request.GET.get('cursor')
+    hybrid = request.GET.get('mode') == 'hybrid' and not sort_by and not cursor
 
-    if not query:
+    if not query.strip():
         return Response(
             {"error": "검색어를 입력해주세요."},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    try:
-        es = get_es_client()
-        search_result = search_articles(
-            client=es,
-            query=query,
-            category=category,
-            sort_by=sort_by,
-            page=page,
-            size=size
-        )
+    search_after, pit_id = None, None
+    if cursor:
+        try:
+            search_after, pit_id = decode_search_cursor(cursor)
+        except InvalidCursor as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        hits = search_result['hits']['hits']
-        total = search_result['hits']['total']['value']
-
-        results = []
-        for hit in hits:
-
-            source = hit['_source']
-            highlight = hit.get('highlight', {})
-            
-            # 하이라이트된 제목과 내용 가져오기
-            title = highlight.get('title', [source['title']])[0]
-            content_preview = highlight.get('content', [source['content'][:150] + "..."])[0]
-            
-            results.append({
-                'id': hit['_id'],  # _source의 id 대신 문서의 _id 사용
-                'title': title,
-                'content_preview': content_preview,
-                'category': source['category'],
-                'writer': source['writer'],
-                'write_date': source['write_date'],
-                'views': source['views'],
-                'url': source['url'],
-                'score': hit['_score']
-            })
-
-        return Response({
-            'total': total,
-            'page': page,
-            'size': size,
-            'results': results
-        })
+    try:
+        # 다음 페이지(point-in-time 커서)는 요청마다 달라서 point-in-time 없는 첫 페이지만 캐시하고 검색어 로그에 남긴다
+        if cursor:
+            return Response(search_page(
+                query, category=category, sort_by=sort_by, size=size, search_after=search_after, pit_id=pit_id,
+            ))
+        log_query(query, category=category, sort_by=sort_by, size=size, hybrid=hybrid)
+        start_prewarm()
+        return Response(cached_first_page(query, category=category, sort_by=sort_by, size=size, hybrid=hybrid))
 
     except Exception as e:
         print(f"검색 중 오류 발생: {e}")
@@ -468,26 +585,68 @@ def search_news(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-@api_view(['POST'])
-def index_all_articles(request):
-    """모든 기사를 Elasticsearch에 인덱싱"""
+autocomplete_cache = LRUCache('autocomplete', maxsize=settings.AUTOCOMPLETE_LRU_SIZE, ttl=settings.AUTOCOMPLETE_LRU_SECONDS)
 
-    try:
 
-        es = get_es_client()
-        create_news_index(es)
+@api_view(['GET'])
+def autocomplete_view(request):
+    """검색어 자동완성 (제목/키워드 앞부분 일치). 응답: {"suggestions": [{"id", "title"}]}"""
+    prefix = normalize_query(request.GET.get('q', '')).lower()
+    size = min(parse_page_size(request.GET.get('size'), default=5), 10)
+    if not prefix:
+        return Response({"suggestions": []})
+
+    key = (prefix, size)
+    suggestions = autocomplete_cache.get(key)
+    if suggestions is None:
+        try:
+            with metrics.timed('search.autocomplete'):
+                suggestions = [
+                    {'id': article_id, 'title': title}
+                    for article_id, title in autocomplete_articles(get_es_client(), prefix, size=size)
+                ]
+        except Exception as e:
+            print(f"자동완성 중 오류 발생: {e}")
+            return Response({"suggestions": []}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        autocomplete_cache.set(key, suggestions)
 
-        articles = NewsArticle.objects.all()
+    response = Response({"suggestions": suggestions})
+    patch_cache_control(response, public=True, max_age=settings.AUTOCOMPLETE_LRU_SECONDS)
+    return response
 
-        for article in articles:
-            index_article(es, article)
 
-            
-        return Response({"message": f"{articles.count()}개의 기사가 인덱싱되었습니다."})
-    
+# Elasticsearch 전체 재인덱싱을 백그라운드 작업으로 시작(POST) / 최근 작업 상태 조회(GET). 관리자만
+# 큰 작업은 reindex_articles 명령어 사용
+@api_view(['GET', 'POST'])
+@permission_classes([IsAdminUser])
+def index_all_articles(request):
+    if request.method == 'GET':
+        job = SearchReindexJob.objects.first()
+        if job is None:
+            return Response({"error": "재인덱싱 작업이 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job_status(job))
+
+    try:
+        job, started = start_background()
     except Exception as e:
         print(f"인덱싱 중 오류 발생: {e}")
         return Response(
             {"error": "인덱싱 중 오류가 발생했습니다."},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+    message = "재인덱싱을 시작했습니다." if started else "이미 진행 중인 재인덱싱 작업이 있습니다."
+    return Response({"message": message, **job_status(job)}, status=status.HTTP_202_ACCEPTED)
+
+
+# 현재 워커 프로세스의 운영 지표 (캐시 히트/미스, 버퍼 flush 등). 관리자만
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    return Response({
+        'cache': cache_stats(),
+        'buffers': buffer_stats(),
+        'elasticsearch': es_pool_stats(),
+        **metrics.snapshot(),
+    })
+
@@ -1,7 +1,7 @@
 from openai import OpenAI
 from dotenv import load_dotenv
 import os
-import json
+import struct
 
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -68,6 +68,18 @@ def transform_extract_keywords(text):
     return [k.strip() for k in keywords.split(",")]
 
 
+# 임베딩 바이너리 포맷 v1 (back-pjt/news/embeddings.py와 동일)
+# b'NE' | version(uint8) | reserved(uint8) | dim(uint32 LE) | little-endian float32 * dim
+EMBEDDING_HEADER = struct.Struct('<2sBBI')
+EMBEDDING_VERSION = 1
+
+
+def encode_embedding(embedding) -> bytes:
+    """임베딩 벡터를 v1 바이너리(헤더 + float32)로 변환"""
+    dim = len(embedding)
+    return EMBEDDING_HEADER.pack(b'NE', EMBEDDING_VERSION, 0, dim) + struct.pack(f'<{dim}f', *embedding)
+
+
 def transform_to_embedding(text: str) -> bytes:
     """
     뉴스 본문을 1536차원 임베딩 벡터로 변환하고 바이너리로 반환
@@ -79,7 +91,7 @@ def transform_to_embedding(text: str) -> bytes:
         embedding = response.data[0].embedding
         print("[임베딩 성공] 벡터 크기:", len(embedding))
         # 리스트를 바이너리로 변환
-        binary_data = json.dumps(embedding).encode('utf-8')
+        binary_data = encode_embedding(embedding)
         print("[변환 완료] 바이너리 크기:", len(binary_data))
         return binary_data
     except Exception as e:
@@ -0,0 +1,118 @@
+"""
+연관 기사 테이블(news_related_article) 증분 갱신
+
+컨슈머 프로세스 안에 기사 임베딩 행렬을 유지하다가 새 기사가 들어오면
+1) 새 기사의 top-k 이웃을 저장하고
+2) 새 기사와 가장 가까운 기존 기사들의 이웃 목록에 새 기사를 끼워 넣은 뒤 top-k만 남긴다.
+전체 재계산은 백엔드의 `python manage.py rebuild_related_articles`로 한다.
+"""
+import json
+import os
+
+import numpy as np
+from psycopg2.extras import execute_values
+
+from preprocess import EMBEDDING_HEADER
+
+TOP_K = int(os.getenv("RELATED_ARTICLES_TOP_K", 5))
+# 이웃 목록을 패치할 기존 기사 후보 수 (새 기사와 가장 가까운 기사들)
+PATCH_CANDIDATES = int(os.getenv("RELATED_PATCH_CANDIDATES", 50))
+
+
+def decode_embedding(raw):
+    """바이너리 v1 / 레거시 JSON 임베딩을 float32 배열로 변환"""
+    if raw is None:
+        return None
+    raw = bytes(raw)
+    if raw[:1] == b'[':
+        return np.array(json.loads(raw.decode('utf-8')), dtype=np.float32)
+    _, _, _, dim = EMBEDDING_HEADER.unpack_from(raw)
+    return np.frombuffer(raw, dtype='<f4', count=dim, offset=EMBEDDING_HEADER.size)
+
+
+def normalize(vec):
+    norm = np.linalg.norm(vec)
+    return None if not norm else (vec / norm).astype(np.float32)
+
+
+class RelatedArticleUpdater:
+    """기사 임베딩 행렬을 메모리에 유지하면서 연관 기사 테이블을 갱신"""
+
+    def __init__(self):
+        self.ids = []
+        self.vectors = []
+        self.positions = {}
+        self.max_id = 0
+        self._matrix = None
+
+    def _upsert(self, article_id, vec):
+        pos = self.positions.get(article_id)
+        if pos is None:
+            self.positions[article_id] = len(self.ids)
+            self.ids.append(article_id)
+            self.vectors.append(vec)
+        else:
+            self.vectors[pos] = vec
+        self.max_id = max(self.max_id, article_id)
+        self._matrix = None
+
+    def refresh(self, cursor):
+        """마지막으로 읽은 id 이후에 추가된 기사 임베딩을 읽어온다"""
+        cursor.execute(
+            "SELECT id, embedding FROM news_article WHERE embedding IS NOT NULL AND id > %s ORDER BY id",
+            (self.max_id,)
+        )
+        for article_id, raw in cursor.fetchall():
+            try:
+                vec = normalize(decode_embedding(raw))
+            except Exception as e:
+                print(f"[⚠️ 임베딩 로드 실패] {article_id}: {e}")
+                continue
+            if vec is not None:
+                self._upsert(article_id, vec)
+
+    @property
+    def matrix(self):
+        if self._matrix is None:
+            self._matrix = np.vstack(self.vectors) if self.vectors else np.empty((0, 0), dtype=np.float32)
+        return self._matrix
+
+    def update(self, cursor, article_id, embedding):
+        """새로 저장된 기사의 연관 기사와 기존 기사들의 연관 기사 목록을 갱신"""
+        self.refresh(cursor)
+        vec = normalize(decode_embedding(embedding)) if embedding is not None else None
+        if vec is None:
+            return
+        self._upsert(article_id, vec)
+
+        ids = np.array(self.ids, dtype=np.int64)
+        scores = self.matrix @ vec
+        scores[self.positions[article_id]] = -np.inf
+        count = min(max(TOP_K, PATCH_CANDIDATES), len(ids) - 1)
+        if count <= 0:
+            return
+        nearest = np.argpartition(-scores, count - 1)[:count]
+        nearest = nearest[np.argsort(-scores[nearest])]
+
+        # 1) 새 기사의 top-k 이웃 교체
+        own = [(article_id, int(ids[i]), float(scores[i])) for i in nearest[:TOP_K]]
+        cursor.execute("DELETE FROM news_related_article WHERE article_id = %s", (article_id,))
+
+        # 2) 가까운 기존 기사들의 이웃 목록에 새 기사 추가
+        patched = [(int(ids[i]), article_id, float(scores[i])) for i in nearest]
+        execute_values(cursor, """
+            INSERT INTO news_related_article (article_id, related_id, score)
+            VALUES %s
+            ON CONFLICT (article_id, related_id) DO UPDATE SET score = EXCLUDED.score
+        """, own + patched)
+
+        # 3) 패치한 기사들은 점수 상위 k개만 남긴다
+        cursor.execute("""
+            DELETE FROM news_related_article r
+            USING (
+                SELECT id, row_number() OVER (PARTITION BY article_id ORDER BY score DESC) AS rank
+                FROM news_related_article
+                WHERE article_id = ANY(%s)
+            ) ranked
+            WHERE r.id = ranked.id AND ranked.rank > %s
+        """, ([pair[0] for pair in patched], TOP_K))
@@ -8,6 +8,7 @@ import json
 import os
 from elasticsearch import Elasticsearch
 import psycopg2
+from psycopg2.extras import Json
 from datetime import datetime
 from preprocess import (
     transform_extract_keywords,
@@ -16,6 +17,7 @@ from preprocess import (
     splitfront,
     splitback
 )
+from related_articles import RelatedArticleUpdater
 from dotenv import load_dotenv
 from hdfs import InsecureClient
 import time
@@ -23,6 +25,9 @@ import time
 # 환경 변수 로드
 load_dotenv()
 
+# 연관 기사 계산용 임베딩 행렬 (워커 프로세스 안에서 유지)
+related_updater = RelatedArticleUpdater()
+
 def create_kafka_source():
     kafka_servers = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
     kafka_topic = os.getenv("KAFKA_TOPIC", "article")
@@ -50,11 +55,21 @@ def get_db_connection():
     )
     return pg_conn
 
+_es_client = None
+
 def get_es_connection():
-    """Elasticsearch 연결을 생성하고 반환하는 함수"""
-    es_host = os.getenv("ES_HOST", "localhost")
-    es_port = os.getenv("ES_PORT", "9200")
-    return Elasticsearch(f"http://{es_host}:{es_port}")
+    """Elasticsearch 클라이언트를 반환하는 함수 (처음 한 번만 만들고 커넥션 풀을 재사용)"""
+    global _es_client
+    if _es_client is None:
+        es_host = os.getenv("ES_HOST", "localhost")
+        es_port = os.getenv("ES_PORT", "9200")
+        _es_client = Elasticsearch(
+            f"http://{es_host}:{es_port}",
+            request_timeout=float(os.getenv("ES_REQUEST_TIMEOUT", 10)),
+            max_retries=int(os.getenv("ES_MAX_RETRIES", 2)),
+            retry_on_timeout=True
+        )
+    return _es_client
 
 def get_hdfs_client():
     """HDFS 클라이언트를 생성하고 반환하는 함수"""
@@ -181,7 +196,7 @@ def process_and_save(article_json):
                 category,
                 article["content"],
                 article["url"],
-                json.dumps(keywords, ensure_ascii=False),
+                Json(keywords),  # keywords 컬럼은 jsonb
                 embedding,
                 0,
                 current_time
@@ -189,6 +204,14 @@ def process_and_save(article_json):
             article_id = pg_cursor.fetchone()[0]
             pg_conn.commit()
 
+            # 연관 기사 테이블 갱신 (실패해도 기사 저장은 유지)
+            try:
+                related_updater.update(pg_cursor, article_id, embedding)
+                pg_conn.commit()
+            except Exception as e:
+                print(f"[⚠️ 연관 기사 갱신 실패] {e}")
+                pg_conn.rollback()
+
             # Elasticsearch에 저장
             es_doc = {
                 "id": article_id,
@@ -199,7 +222,9 @@ def process_and_save(article_json):
                 "write_date": article["write_date"] + "+00:00",
                 "keywords": keywords,
                 "url": article["url"],
-                "views": 0
+                "views": 0,
+                # 검색 결과 미리보기 (백엔드 news.utils.content_preview와 같은 규칙)
+                "content_preview": article["content"][:150] + ("..." if len(article["content"]) > 150 else "")
             }
 
             es.update(
@@ -211,6 +236,14 @@ def process_and_save(article_json):
                 }
             )
 
+            # 백엔드 검색 결과 캐시 무효화 (search_generation 세대 번호 증가)
+            try:
+                pg_cursor.execute("UPDATE search_generation SET value = value + 1 WHERE id = 1")
+                pg_conn.commit()
+            except Exception as e:
+                print(f"[⚠️ 검색 세대 번호 갱신 실패] {e}")
+                pg_conn.rollback()
+
             # HDFS에 저장 (이미 파싱된 article과 keywords 사용)
             hdfs_success = save_to_hdfs(article, keywords, hdfs_client)
 
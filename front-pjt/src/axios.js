@@ -14,6 +14,23 @@ api.interceptors.request.use(async (config) => {
   return config;
 });
 
+// 액세스 토큰 갱신 (실패하면 로그아웃 후 로그인 페이지로). axios를 쓰지 않는 요청(챗봇 스트리밍)도 사용
+export const refreshAccessToken = async () => {
+  try {
+    const res = await axios.post('http://localhost:8000/api/token/refresh/', {
+      refresh: localStorage.getItem('refreshToken'),
+    });
+    const newAccess = res.data.access;
+    localStorage.setItem('accessToken', newAccess);
+    return newAccess;
+  } catch (refreshError) {
+    localStorage.removeItem('accessToken');
+    localStorage.removeItem('refreshToken');
+    window.location.href = '/login';
+    throw refreshError;
+  }
+};
+
 // 응답 인터셉터 - 토큰 만료 시 자동 갱신
 api.interceptors.response.use(
   (response) => response,
@@ -22,24 +39,9 @@ api.interceptors.response.use(
 
     if (error.response && error.response.status === 401 && !originalRequest._retry) {
       originalRequest._retry = true;
-      const refreshToken = localStorage.getItem('refreshToken');
-
-      try {
-        const res = await axios.post('http://localhost:8000/api/auth/token/refresh/', {
-          refresh: refreshToken,
-        });
-
-        const newAccess = res.data.access;
-        localStorage.setItem('accessToken', newAccess);
-        originalRequest.headers.Authorization = `Bearer ${newAccess}`;
-
-        return api(originalRequest); // 재요청
-      } catch (refreshError) {
-        localStorage.removeItem('accessToken');
-        localStorage.removeItem('refreshToken');
-        window.location.href = '/login';
-        return Promise.reject(refreshError);
-      }
+      const newAccess = await refreshAccessToken();
+      originalRequest.headers.Authorization = `Bearer ${newAccess}`;
+      return api(originalRequest); // 재요청
     }
 
     return Promise.reject(error);
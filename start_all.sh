@@ -16,7 +16,7 @@ until [ "$(docker inspect -f '{{.State.Health.Status}}' postgres)" == "healthy"
 done
 echo "   - Postgres 준비 완료!"
 
-docker-compose up -d back
+docker-compose up -d back back-stream
 
 echo "2. HDFS 시작..."
 docker-compose up -d namenode datanode